@@ -3,38 +3,772 @@
 # En esta práctica se resolverá el problema de los caminos mínimos entre todos los nodos de un grafo.
 # Y la multiplicación de matrices.
 import copy
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from typing import Optional, List
 
+try:
+    from src.alg_s4 import (
+        GrafoCSR,
+        dijkstra_multi,
+        a_json,
+        de_json,
+        escribe_cabecera,
+        huella_arcos,
+        lee_cabecera,
+    )
+except ImportError:  # Ejecutado como script (python src/alg_s10.py): src no es un paquete
+    from alg_s4 import (
+        GrafoCSR,
+        dijkstra_multi,
+        a_json,
+        de_json,
+        escribe_cabecera,
+        huella_arcos,
+        lee_cabecera,
+    )
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo usan los motores vectorizados
+    np = None
+
+
+def _floyd_vectorizado(D, P):
+    """Floyd sobre arrays de NumPy, modificando D y P en el sitio.
+    En la iteración k la fila y la columna k de D no cambian (no hay ciclos
+    negativos), así que se pueden usar directamente sin copiarlas.
+
+    Args:
+        D: Matriz n x n de distancias.
+        P: Matriz n x n de predecesores (-1 si no hay).
+    """
+    n = D.shape[0]
+    for k in range(n):
+        nueva = D[:, k, None] + D[None, k, :]
+        mejora = nueva < D
+        np.copyto(D, nueva, where=mejora)
+        np.copyto(P, np.broadcast_to(P[k].copy(), P.shape), where=mejora)
+
+
+
+def _actualiza_bloques(D, P, bloques: list, intermedios: tuple):
+    """Actualiza los bloques (filas, columnas) de D y P usando como nodos
+    intermedios los del rango `intermedios`, en orden creciente.
+
+    Args:
+        D: Matriz n x n de distancias.
+        P: Matriz n x n de predecesores (-1 si no hay).
+        bloques (list): Pares de rangos (inicio, fin) de filas y columnas.
+        intermedios (tuple): Rango (inicio, fin) de nodos intermedios.
+    """
+    for filas, columnas in bloques:
+        I = slice(*filas)
+        J = slice(*columnas)
+        bloque_D = D[I, J]
+        bloque_P = P[I, J]
+        for k in range(*intermedios):
+            nueva = D[I, k, None] + D[None, k, J]
+            mejora = nueva < bloque_D
+            np.copyto(bloque_D, nueva, where=mejora)
+            np.copyto(bloque_P, np.broadcast_to(P[k, J].copy(), bloque_P.shape), where=mejora)
+
+
+def _abre_memoria_compartida(nombre: str):
+    """Se conecta a un bloque de memoria compartida creado por el proceso
+    principal, que es quien lo libera.
+    """
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Python < 3.13 no tiene el parámetro track. Los procesos del pool
+        # comparten el resource_tracker del principal, así que el registro
+        # repetido no tiene efecto y no hay que deshacerlo aquí.
+        return shared_memory.SharedMemory(name=nombre)
+
+
+def _abre_matriz(almacen: tuple, n: int) -> tuple:
+    """Abre desde un proceso del pool una matriz n x n descrita por
+    (tipo, nombre, dtype), donde tipo es "memoria" (memoria compartida) o
+    "fichero" (fichero .npy que se proyecta en memoria).
+
+    Returns:
+        tuple: La matriz y la memoria compartida a cerrar (None si es un fichero).
+    """
+    tipo, nombre, dtype = almacen
+    if tipo == "fichero":
+        return np.load(nombre, mmap_mode="r+"), None
+    memoria = _abre_memoria_compartida(nombre)
+    return np.ndarray((n, n), dtype=dtype, buffer=memoria.buf), memoria
+
+
+def _tarea_bloques(almacen_D: tuple, almacen_P: tuple, n: int, bloques: list, intermedios: tuple):
+    """Tarea de un proceso del pool: actualiza bloques de D y P que están en
+    memoria compartida o en ficheros proyectados en memoria.
+    """
+    D, memoria_D = _abre_matriz(almacen_D, n)
+    P, memoria_P = _abre_matriz(almacen_P, n)
+    try:
+        _actualiza_bloques(D, P, bloques, intermedios)
+    finally:
+        # Hay que soltar las vistas antes de cerrar la memoria
+        del D, P
+        for memoria in (memoria_D, memoria_P):
+            if memoria is not None:
+                memoria.close()
+
+
+def _floyd_por_bloques(n: int, tamano_bloque: int, ejecuta):
+    """Floyd por bloques: divide las matrices en bloques de tamano_bloque x
+    tamano_bloque y, para cada bloque diagonal K, sigue las tres fases:
+
+        1. El bloque (K, K), que solo depende de sí mismo.
+        2. Los bloques de la fila K y de la columna K, que dependen de (K, K).
+        3. El resto de bloques, que dependen de su bloque de la fila K y de su
+           bloque de la columna K.
+
+    Las tareas de una misma fase son independientes entre sí.
+
+    Args:
+        n (int): Número de nodos.
+        tamano_bloque (int): Lado de los bloques.
+        ejecuta (Callable): Recibe una lista de tareas (bloques, intermedios)
+            y las ejecuta, volviendo cuando han terminado todas.
+    """
+    limites = [(inicio, min(inicio + tamano_bloque, n)) for inicio in range(0, n, tamano_bloque)]
+    for kb, K in enumerate(limites):
+        otros = [B for b, B in enumerate(limites) if b != kb]
+        ejecuta([([(K, K)], K)])
+        ejecuta([([(K, J)], K) for J in otros] + [([(I, K)], K) for I in otros])
+        # Una tarea por fila de bloques para no crear demasiadas tareas pequeñas
+        ejecuta([([(I, J) for J in otros], K) for I in otros])
+
+
+def _arcos_indices(grafo, nodo_a_indice: dict):
+    """Itera sobre los arcos del grafo como tuplas (i, j, peso) con los índices
+    de las matrices.
+
+    Args:
+        grafo: Diccionario de arcos y pesos o GrafoCSR.
+        nodo_a_indice (dict): Índice de cada nodo en las matrices.
+
+    Yields:
+        tuple: Arco (i, j, peso).
+    """
+    if isinstance(grafo, GrafoCSR):
+        # Los índices del GrafoCSR coinciden con los de las matrices
+        indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+        for i in range(len(grafo)):
+            for k in range(indptr[i], indptr[i + 1]):
+                yield i, indices[k], pesos[k]
+    else:
+        for (origen, destino), peso in grafo.items():
+            yield nodo_a_indice[origen], nodo_a_indice[destino], peso
+
+
+def _arcos_directos(grafo) -> dict:
+    """Diccionario de arcos y pesos del grafo. Si hay arcos repetidos (GrafoCSR)
+    se queda el de menor peso, que es el único que importa para los caminos.
+
+    Args:
+        grafo: Diccionario de arcos y pesos o GrafoCSR.
+
+    Returns:
+        dict: Arcos {(origen, destino): peso}.
+    """
+    if not isinstance(grafo, GrafoCSR):
+        return dict(grafo)
+    arcos: dict = {}
+    for origen, destino, peso in grafo.arcos():
+        if (origen, destino) not in arcos or peso < arcos[origen, destino]:
+            arcos[origen, destino] = peso
+    return arcos
+
+
+def huella_grafo(grafo) -> str:
+    """Calcula una huella (SHA-256) del contenido de un grafo que no depende del
+    orden en que estén guardados los arcos.
+
+    Args:
+        grafo: Diccionario de arcos y pesos o GrafoCSR.
+
+    Returns:
+        str: Huella en hexadecimal.
+
+    Complexity:
+        O(m log m)
+    """
+    if isinstance(grafo, GrafoCSR):
+        grafo = _arcos_directos(grafo)
+    return huella_arcos((origen, destino, peso) for (origen, destino), peso in grafo.items())
+
 
 class CaminosMinimosFloyd:
     """
     Clase para representar los caminos mínimos entre todos los nodos de un grafo.
     Los caminos deben calcularse con el algoritmo de Floyd.
     El espacio de almacenamiento debe ser O(n^2), siendo n el número de nodos.
+
+    Motores disponibles:
+        - "python": listas de listas; P usa None cuando no hay predecesor.
+        - "numpy": arrays de NumPy (float64 para D, int32 para P con -1 cuando
+          no hay predecesor); cada iteración de k se hace vectorizada.
+        - "bloques": como "numpy", pero por bloques de tamano_bloque nodos y
+          repartiendo los bloques independientes de cada fase entre varios
+          procesos que comparten D y P en memoria compartida.
+
+    Con los motores de NumPy se puede indicar un directorio: D y P se guardan
+    entonces en ficheros .npy proyectados en memoria (numpy.memmap), que se
+    pueden volver a abrir con `abre` desde otro proceso sin recalcular ni
+    cargar las matrices enteras. Los arcos se guardan aparte en binario
+    (índices y pesos) y solo se leen si hacen falta; cada actualiza_arco los
+    anota al final de un registro de cambios en lugar de reescribirlos.
+
+    Con `save` y `load` el resultado se guarda en un único fichero binario
+    junto con la huella del grafo, para no recalcularlo al reiniciar si el
+    grafo no ha cambiado.
     """
 
-    def __init__(self, grafo: dict):
+    MOTORES = ("python", "numpy", "bloques")
+    FICHERO_D = "D.npy"
+    FICHERO_P = "P.npy"
+    FICHERO_NODOS = "nodos.json"
+    FICHERO_ARCOS = "arcos.npy"  # (origen, destino) como índices de nodos
+    FICHERO_PESOS = "pesos.npy"
+    FICHERO_CAMBIOS = "cambios.jsonl"  # [origen, destino, peso] por línea
+    # Formato de save: MAGIA, longitud de la cabecera (8 bytes, little endian),
+    # cabecera (JSON) y después D y P en binario little endian
+    MAGIA = b"FLOYD\x01"
+
+    def __init__(
+        self,
+        grafo: dict,
+        motor: str = "python",
+        tamano_bloque: int = 256,
+        procesos: Optional[int] = None,
+        directorio: Optional[str] = None,
+        tipo_distancias: str = "float64",
+    ):
         """Constructor que recibe el grafo sobre el que calcular los caminos
         mínimos.
         El grafo que se recibe es un diccionario donde las claves son arcos
         (pares de nodos) y los valores son el peso de los arcos.
 
+        También acepta un GrafoCSR; en ese caso se usa su orden de nodos y sus
+        arcos sin pasar por el diccionario.
+
         Args:
-            grafo (dict): Grafo representado como un diccionario de arcos y pesos.
+            grafo (dict): Grafo representado como un diccionario de arcos y pesos o GrafoCSR.
+            motor (str, optional): Implementación del algoritmo, una de MOTORES. Defaults to "python".
+            tamano_bloque (int, optional): Lado de los bloques del motor "bloques". Defaults to 256.
+            procesos (int, optional): Procesos del motor "bloques"; None usa todos
+                los núcleos y 1 no crea procesos. Defaults to None.
+            directorio (str, optional): Directorio donde guardar D y P como
+                ficheros proyectados en memoria. Defaults to None (en memoria).
+            tipo_distancias (str, optional): Tipo de NumPy de D, "float64" o
+                "float32". Defaults to "float64".
+
+        Raises:
+            ValueError: El motor no existe o no admite las opciones indicadas.
+            ImportError: El motor necesita NumPy y no está instalado.
         """
-        # Extraer todos los nodos del grafo
-        nodos = set()
-        for origen, destino in grafo:
-            nodos.add(origen)
-            nodos.add(destino)
-        self.nodos = sorted(list(nodos))  # Ordenamos para tener un orden fijo
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {self.MOTORES}")
+        if motor != "python" and np is None:
+            raise ImportError(f"El motor {motor} necesita NumPy")
+        if motor == "python" and (directorio is not None or tipo_distancias != "float64"):
+            raise ValueError("El motor python no admite directorio ni tipo_distancias")
+        self.motor = motor
+        self.directorio = directorio
+        self.tipo_distancias = tipo_distancias
+        self.opciones = {"tamano_bloque": tamano_bloque, "procesos": procesos}
+
+        # Arcos directos, para poder recalcular tras actualiza_arco
+        self._arcos = _arcos_directos(grafo)
+
+        if isinstance(grafo, GrafoCSR):
+            self.nodos = list(grafo.nodos)
+        else:
+            # Extraer todos los nodos del grafo
+            nodos = set()
+            for origen, destino in grafo:
+                nodos.add(origen)
+                nodos.add(destino)
+            self.nodos = sorted(list(nodos))  # Ordenamos para tener un orden fijo
+
+        self._construye_indices()
+        self._calcula(grafo)
+
+        if directorio is not None:
+            self.D.flush()
+            self.P.flush()
+            self._guarda_arcos()
+            # Los nodos se escriben al final: un directorio sin este fichero
+            # está a medio calcular
+            self._guarda_metadatos()
+
+    def _calcula(self, grafo):
+        """Calcula D y P con el motor y las opciones del objeto. Los nodos y sus
+        índices deben estar ya construidos.
+
+        Args:
+            grafo: Diccionario de arcos y pesos o GrafoCSR.
+        """
+        if self.motor == "python":
+            self._floyd_python(grafo)
+        elif self.motor == "numpy" and self.directorio is None:
+            self._floyd_numpy(grafo)
+        else:
+            # En disco siempre por bloques, para no crear temporales de n x n
+            procesos = 1 if self.motor == "numpy" else self.opciones["procesos"]
+            self._floyd_bloques(grafo, self.opciones["tamano_bloque"], procesos)
+
+    @classmethod
+    def abre(cls, directorio: str, escritura: bool = False) -> "CaminosMinimosFloyd":
+        """Abre unos caminos mínimos calculados antes con un directorio.
+        D y P se proyectan en memoria y los arcos no se leen hasta que hacen
+        falta, así que abrir es inmediato (O(n)) y las consultas solo leen las
+        filas que necesitan.
+
+        Args:
+            directorio (str): Directorio usado al construir los caminos.
+            escritura (bool, optional): Abrir las matrices en modo escritura,
+                necesario para actualiza_arco. Defaults to False.
+
+        Raises:
+            ValueError: El fichero de nodos del directorio no es válido.
+
+        Returns:
+            CaminosMinimosFloyd: Caminos mínimos listos para consultar.
+        """
+        if np is None:
+            raise ImportError("Abrir caminos mínimos en disco necesita NumPy")
+        with open(os.path.join(directorio, cls.FICHERO_NODOS), encoding="utf-8") as fichero:
+            try:
+                datos = json.load(fichero)
+            except ValueError as error:
+                raise ValueError(f"{directorio} no tiene caminos mínimos válidos") from error
+        caminos = cls._desde_metadatos(datos)
+
+        modo = "r+" if escritura else "r"
+        caminos.directorio = directorio
+        caminos.D = np.load(os.path.join(directorio, cls.FICHERO_D), mmap_mode=modo)
+        caminos.P = np.load(os.path.join(directorio, cls.FICHERO_P), mmap_mode=modo)
+        caminos.tipo_distancias = caminos.D.dtype.name
+        return caminos
+
+    @property
+    def arcos(self) -> dict:
+        """Arcos directos del grafo {(origen, destino): peso}, con las
+        actualizaciones hechas. Si los caminos se abrieron de un directorio se
+        leen la primera vez que se piden.
+        """
+        if self._arcos is None:
+            self._arcos = self._lee_arcos()
+        return self._arcos
+
+    @property
+    def huella(self) -> str:
+        """Huella del grafo con las actualizaciones hechas (ver huella_grafo).
+        Se calcula al pedirla, O(m log m), y solo la usan save y load.
+        """
+        return huella_grafo(self.arcos)
+
+    def _metadatos(self) -> dict:
+        """Datos, aparte de D, P y los arcos, que se guardan en disco (en JSON)."""
+        return {
+            "nodos": a_json(self.nodos),
+            "motor": self.motor,
+            "opciones": {
+                "tamano_bloque": self.opciones["tamano_bloque"],
+                "procesos": self.opciones["procesos"],
+            },
+        }
+
+    @classmethod
+    def _desde_metadatos(cls, datos: dict) -> "CaminosMinimosFloyd":
+        """Crea un objeto sin calcular nada a partir de los datos guardados con
+        _metadatos y, si los hay, los arcos (como en la cabecera de `save`).
+        Falta asignar D, P, directorio y tipo_distancias.
+
+        Raises:
+            ValueError: Los datos no tienen el formato de _metadatos.
+        """
+        try:
+            motor = datos["motor"]
+            nodos = de_json(datos["nodos"])
+            arcos = None
+            if "arcos" in datos:
+                arcos = {
+                    (de_json(origen), de_json(destino)): peso
+                    for origen, destino, peso in datos["arcos"]
+                }
+            opciones = {
+                "tamano_bloque": int(datos["opciones"]["tamano_bloque"]),
+                "procesos": datos["opciones"]["procesos"],
+            }
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError("Los metadatos de los caminos mínimos no son válidos") from error
+        if motor not in cls.MOTORES or not isinstance(nodos, list):
+            raise ValueError("Los metadatos de los caminos mínimos no son válidos")
+
+        caminos = cls.__new__(cls)
+        caminos.motor = motor
+        caminos._arcos = arcos
+        caminos.opciones = opciones
+        caminos.nodos = nodos
+        caminos._construye_indices()
+        return caminos
+
+    def save(self, ruta: str):
+        """Guarda los caminos mínimos en un fichero binario: una cabecera con
+        los nodos (en el orden de nodo_a_indice), el motor y la huella del grafo,
+        seguida de las matrices D y P.
+
+        Se escribe primero en ruta + ".tmp" y después se renombra, así que un
+        guardado interrumpido nunca deja un fichero a medias en la ruta.
+
+        Args:
+            ruta (str): Fichero donde guardar.
+        """
+        n = len(self.nodos)
+        if self.motor == "python":
+            # Los None de P pasan a -1; se recuerda si todas las distancias eran enteras
+            D = array("d", (d for fila in self.D for d in fila))
+            P = array("i", (-1 if p is None else p for fila in self.P for p in fila))
+            enteras = all(type(d) is int for fila in self.D for d in fila if d != float("inf"))
+            if sys.byteorder == "big":
+                D.byteswap()
+                P.byteswap()
+            tipo_D = "<f8"
+        else:
+            D = np.ascontiguousarray(self.D, dtype=np.dtype(self.tipo_distancias).newbyteorder("<"))
+            P = np.ascontiguousarray(self.P, dtype="<i4")
+            enteras = False
+            tipo_D = D.dtype.str
+
+        cabecera = {
+            **self._metadatos(),
+            "arcos": [
+                [a_json(origen), a_json(destino), peso]
+                for (origen, destino), peso in self.arcos.items()
+            ],
+            "huella": self.huella,
+            "tipo_D": tipo_D,
+            "enteras": enteras,
+            "n": n,
+        }
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as fichero:
+            escribe_cabecera(fichero, self.MAGIA, cabecera)
+            fichero.write(D.tobytes())
+            fichero.write(P.tobytes())
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def load(cls, ruta: str, grafo=None, **opciones) -> "CaminosMinimosFloyd":
+        """Carga unos caminos mínimos guardados con `save`.
+
+        Si se pasa el grafo y el fichero no existe, no es válido (por ejemplo,
+        está truncado) o su huella no coincide con la del grafo (el grafo ha
+        cambiado), se recalculan los caminos con las opciones indicadas y se
+        guardan en la ruta.
+
+        Args:
+            ruta (str): Fichero guardado con `save`.
+            grafo (optional): Grafo con el que comprobar la huella. Defaults to None.
+            **opciones: Argumentos del constructor si hay que recalcular.
+
+        Raises:
+            ValueError: Sin grafo, el fichero no tiene el formato de `save` o
+                está incompleto.
+
+        Returns:
+            CaminosMinimosFloyd: Caminos mínimos.
+        """
+        if grafo is None:
+            return cls._carga(ruta)
+
+        try:
+            if cls._lee_cabecera(ruta)[0].get("huella") == huella_grafo(grafo):
+                return cls._carga(ruta)
+        except (OSError, ValueError):
+            pass  # No existe o no es válido: se recalcula
+
+        caminos = cls(grafo, **opciones)
+        caminos.save(ruta)
+        return caminos
+
+    @classmethod
+    def _carga(cls, ruta: str) -> "CaminosMinimosFloyd":
+        """Lee un fichero guardado con `save` sin comprobar la huella.
+
+        Raises:
+            ValueError: El fichero no tiene el formato de `save` o está incompleto.
+        """
+        cabecera, inicio = cls._lee_cabecera(ruta)
+        caminos = cls._desde_metadatos(cabecera)
+        caminos.directorio = None
+        n = len(caminos.nodos)
+        if cabecera.get("n") != n or cabecera.get("tipo_D") not in ("<f8", "<f4"):
+            raise ValueError(f"{ruta} no es un fichero de caminos mínimos")
+
+        tamano_D = n * n * int(cabecera["tipo_D"][-1])
+        with open(ruta, "rb") as fichero:
+            fichero.seek(inicio)
+            datos_D = fichero.read(tamano_D)
+            datos_P = fichero.read(n * n * 4)
+        if len(datos_D) != tamano_D or len(datos_P) != n * n * 4:
+            raise ValueError(f"{ruta} está incompleto")
+
+        if caminos.motor == "python":
+            caminos.tipo_distancias = "float64"
+            D = array("d", datos_D)
+            P = array("i", datos_P)
+            if sys.byteorder == "big":
+                D.byteswap()
+                P.byteswap()
+            convierte = int if cabecera.get("enteras") else float
+            caminos.D = [
+                [d if d == float("inf") else convierte(d) for d in D[i * n:(i + 1) * n]]
+                for i in range(n)
+            ]
+            caminos.P = [
+                [None if p < 0 else p for p in P[i * n:(i + 1) * n]] for i in range(n)
+            ]
+        else:
+            if np is None:
+                raise ImportError(f"Cargar caminos del motor {caminos.motor} necesita NumPy")
+            tipo_D = np.dtype(cabecera["tipo_D"])
+            caminos.tipo_distancias = tipo_D.name
+            caminos.D = np.frombuffer(datos_D, dtype=tipo_D).astype(tipo_D.newbyteorder("=")).reshape(n, n)
+            caminos.P = np.frombuffer(datos_P, dtype="<i4").astype(np.int32).reshape(n, n)
+        return caminos
+
+    @classmethod
+    def _lee_cabecera(cls, ruta: str) -> tuple:
+        """Lee la cabecera de un fichero guardado con `save`.
+
+        Returns:
+            tuple: Cabecera y posición del fichero donde empiezan las matrices.
+        """
+        with open(ruta, "rb") as fichero:
+            cabecera = lee_cabecera(fichero, cls.MAGIA)
+            if cabecera is None:
+                raise ValueError(f"{ruta} no es un fichero de caminos mínimos")
+            return cabecera, fichero.tell()
+
+    def actualiza_arco(self, origen, destino, peso):
+        """Inserta el arco o cambia su peso, actualizando D y P sin recalcular
+        todo.
+
+        Si el arco es nuevo o su peso baja, solo pueden mejorar los caminos
+        i -> origen -> destino -> j, así que basta con comprobar cada par (i, j)
+        una vez: O(n^2).
+        Si el peso sube y el arco era un camino mínimo de origen a destino,
+        puede que otros caminos dejen de ser mínimos y no hay forma barata de
+        saber cuáles: en ese caso se recalcula todo con el mismo motor, O(n^3).
+        Si el arco no era camino mínimo, subir su peso no cambia nada.
+
+        Los bucles (origen == destino) no se admiten: el constructor pone su
+        peso en la diagonal de D y actualizarlo obligaría a recalcular todo.
+
+        Args:
+            origen: Origen del arco (debe ser un nodo del grafo).
+            destino: Destino del arco (debe ser un nodo del grafo).
+            peso: Nuevo peso del arco.
+
+        Raises:
+            ValueError: Alguno de los nodos no está en el grafo o el arco es un bucle.
+        """
+        if origen not in self.nodo_a_indice or destino not in self.nodo_a_indice:
+            raise ValueError("Los nodos del arco deben estar en el grafo; hay que reconstruir")
+        if origen == destino:
+            raise ValueError("No se pueden actualizar bucles; hay que reconstruir")
 
-        # Construir diccionarios
+        anterior = self.arcos.get((origen, destino))
+        self.arcos[origen, destino] = peso
+
+        u = self.nodo_a_indice[origen]
+        v = self.nodo_a_indice[destino]
+        recalculado = False
+        if anterior is not None and peso > anterior:
+            if self.motor != "python":
+                # Se compara en el tipo de D: con float32, en float64 sería
+                # 0.7 > float32(0.7) y no se recalcularía
+                anterior = self.D.dtype.type(anterior)
+            if anterior <= self.D[u][v]:
+                # El arco era un camino mínimo: se recalcula todo con los mismos nodos
+                self._calcula(self.arcos)
+                recalculado = True
+            # Si no lo era, D y P no cambian
+        elif self.motor == "python":
+            self._relaja_arco_python(u, v, peso)
+        else:
+            self._relaja_arco_numpy(u, v, peso)
+
+        if self.directorio is not None:
+            self.D.flush()
+            self.P.flush()
+            if recalculado:
+                # Ya se ha hecho un trabajo O(n^3): se reescriben los arcos y se
+                # vacía el registro de cambios
+                self._guarda_arcos()
+            else:
+                self._anota_cambio(u, v, peso)
+
+    def _escribe_atomico(self, nombre: str, escribe, modo: str = "wb"):
+        """Escribe un fichero del directorio en un temporal y lo renombra, para
+        que nunca quede a medias.
+
+        Args:
+            nombre (str): Nombre del fichero dentro del directorio.
+            escribe: Función que recibe el fichero abierto y escribe el contenido.
+            modo (str, optional): Modo de apertura. Defaults to "wb".
+        """
+        ruta = os.path.join(self.directorio, nombre)
+        with open(ruta + ".tmp", modo) as fichero:
+            escribe(fichero)
+        os.replace(ruta + ".tmp", ruta)
+
+    def _guarda_metadatos(self):
+        """Escribe el fichero de nodos, motor y opciones del directorio."""
+        self._escribe_atomico(
+            self.FICHERO_NODOS, lambda fichero: json.dump(self._metadatos(), fichero), "w"
+        )
+
+    def _guarda_arcos(self):
+        """Escribe los arcos del directorio en binario y vacía el registro de
+        cambios.
+
+        Complexity:
+            O(m)
+        """
+        arcos = np.array(
+            [(self.nodo_a_indice[origen], self.nodo_a_indice[destino]) for origen, destino in self.arcos],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        pesos = np.array(list(self.arcos.values()))
+        if pesos.dtype.kind not in "iuf":
+            pesos = pesos.astype(np.float64)
+        self._escribe_atomico(self.FICHERO_ARCOS, lambda fichero: np.save(fichero, arcos))
+        self._escribe_atomico(self.FICHERO_PESOS, lambda fichero: np.save(fichero, pesos))
+        cambios = os.path.join(self.directorio, self.FICHERO_CAMBIOS)
+        if os.path.exists(cambios):
+            os.remove(cambios)
+
+    def _anota_cambio(self, u: int, v: int, peso):
+        """Añade el arco (u, v) con su nuevo peso al registro de cambios.
+
+        Complexity:
+            O(1)
+        """
+        with open(os.path.join(self.directorio, self.FICHERO_CAMBIOS), "a", encoding="utf-8") as fichero:
+            fichero.write(json.dumps([u, v, peso]) + "\n")
+
+    def _lee_arcos(self) -> dict:
+        """Lee los arcos del directorio y les aplica el registro de cambios.
+
+        Returns:
+            dict: Arcos {(origen, destino): peso}.
+
+        Complexity:
+            O(m + cambios)
+        """
+        arcos = np.load(os.path.join(self.directorio, self.FICHERO_ARCOS))
+        pesos = np.load(os.path.join(self.directorio, self.FICHERO_PESOS))
+        nodos = self.nodos
+        resultado = {
+            (nodos[i], nodos[j]): peso for (i, j), peso in zip(arcos.tolist(), pesos.tolist())
+        }
+        cambios = os.path.join(self.directorio, self.FICHERO_CAMBIOS)
+        if os.path.exists(cambios):
+            with open(cambios, encoding="utf-8") as fichero:
+                for linea in fichero:
+                    if not linea.endswith("\n"):
+                        break  # Última línea a medio escribir
+                    i, j, peso = json.loads(linea)
+                    resultado[nodos[i], nodos[j]] = peso
+        return resultado
+
+    def _relaja_arco_python(self, u: int, v: int, peso):
+        """Mejora los caminos i -> u -> v -> j con el arco (u, v) en las listas.
+        La columna u y la fila v no cambian (no hay ciclos negativos).
+        """
+        INF = float("inf")
+        n = len(self.nodos)
+        fila_v = self.D[v]
+        predecesores_v = list(self.P[v])
+        predecesores_v[v] = u
+        for i in range(n):
+            if self.D[i][u] == INF:
+                continue
+            base = self.D[i][u] + peso
+            fila_D = self.D[i]
+            fila_P = self.P[i]
+            for j in range(n):
+                if fila_v[j] != INF and base + fila_v[j] < fila_D[j]:
+                    fila_D[j] = base + fila_v[j]
+                    fila_P[j] = predecesores_v[j]
+
+    def _relaja_arco_numpy(self, u: int, v: int, peso, filas_por_banda: int = 1024):
+        """Mejora los caminos i -> u -> v -> j con el arco (u, v) en los arrays,
+        por bandas de filas para no crear temporales de n x n.
+        """
+        n = len(self.nodos)
+        fila_v = np.array(self.D[v])
+        predecesores_v = np.array(self.P[v])
+        predecesores_v[v] = u
+        for inicio in range(0, n, filas_por_banda):
+            I = slice(inicio, min(inicio + filas_por_banda, n))
+            nueva = self.D[I, u, None] + peso + fila_v[None, :]
+            mejora = nueva < self.D[I]
+            np.copyto(self.D[I], nueva, where=mejora)
+            np.copyto(self.P[I], np.broadcast_to(predecesores_v, mejora.shape), where=mejora)
+
+    def _construye_indices(self):
+        """Construye los diccionarios entre nodos e índices de las matrices."""
         self.nodo_a_indice = {}
         self.indice_a_nodo = {}
         for i, nodo in enumerate(self.nodos):
             self.nodo_a_indice[nodo] = i
             self.indice_a_nodo[i] = nodo
+
+    def _reserva_numpy(self) -> tuple:
+        """Reserva D y P en memoria o, si hay directorio, en ficheros .npy
+        proyectados en memoria.
+
+        Returns:
+            tuple: Matrices D y P sin inicializar.
+        """
+        n = len(self.nodos)
+        if self.directorio is None:
+            return (
+                np.empty((n, n), dtype=self.tipo_distancias),
+                np.empty((n, n), dtype=np.int32),
+            )
+        os.makedirs(self.directorio, exist_ok=True)
+        return (
+            np.lib.format.open_memmap(
+                os.path.join(self.directorio, self.FICHERO_D),
+                mode="w+", dtype=self.tipo_distancias, shape=(n, n),
+            ),
+            np.lib.format.open_memmap(
+                os.path.join(self.directorio, self.FICHERO_P),
+                mode="w+", dtype=np.int32, shape=(n, n),
+            ),
+        )
+
+    def _floyd_python(self, grafo):
+        """Algoritmo de Floyd con listas de listas.
+
+        Complexity:
+            O(n^3)
+        """
         n = len(self.nodos)
 
         # Inicializar matrices D y P
@@ -49,11 +783,11 @@ class CaminosMinimosFloyd:
             self.D[i][i] = 0
 
         # Llenar matrices D y P con la información del grafo
-        for (origen, destino), peso in grafo.items():
-            i = self.nodo_a_indice[origen]
-            j = self.nodo_a_indice[destino]
-            self.D[i][j] = peso
-            self.P[i][j] = i  # El predecesor de j en el camino desde i es i
+        # Si hay arcos repetidos (GrafoCSR) nos quedamos con el de menor peso
+        for i, j, peso in _arcos_indices(grafo, self.nodo_a_indice):
+            if self.P[i][j] is None or peso < self.D[i][j]:
+                self.D[i][j] = peso
+                self.P[i][j] = i  # El predecesor de j en el camino desde i es i
 
         # Algoritmo de Floyd
         # D es la matriz de distancias mínimas
@@ -66,6 +800,106 @@ class CaminosMinimosFloyd:
                             self.D[i][j] = self.D[i][k] + self.D[k][j]
                             self.P[i][j] = self.P[k][j]
 
+    def _inicializa_numpy(self, grafo, D, P):
+        """Rellena los arrays D y P (ya reservados) con los arcos del grafo.
+        P usa -1 cuando no hay predecesor.
+        """
+        D.fill(np.inf)
+        P.fill(-1)
+        np.fill_diagonal(D, 0)
+        for i, j, peso in _arcos_indices(grafo, self.nodo_a_indice):
+            if P[i, j] < 0 or peso < D[i, j]:
+                D[i, j] = peso
+                P[i, j] = i
+
+    def _floyd_numpy(self, grafo):
+        """Algoritmo de Floyd vectorizado con NumPy.
+        Cada iteración de k calcula a la vez todos los D[i][k] + D[k][j] y
+        actualiza D y P solo donde mejora la distancia.
+
+        Complexity:
+            O(n^3) operaciones, O(n) iteraciones de Python
+        """
+        self.D, self.P = self._reserva_numpy()
+        self._inicializa_numpy(grafo, self.D, self.P)
+        _floyd_vectorizado(self.D, self.P)
+
+    def _floyd_bloques(self, grafo, tamano_bloque: int, procesos: Optional[int]):
+        """Algoritmo de Floyd por bloques, con los bloques independientes de cada
+        fase repartidos en un ProcessPoolExecutor.
+        D y P se construyen en memoria compartida para que los procesos no
+        tengan que copiarlas; al terminar se copian a arrays normales. Si hay
+        directorio, los procesos abren directamente los ficheros .npy.
+
+        Complexity:
+            O(n^3) operaciones, O((n / tamano_bloque)^3) tareas
+        """
+        n = len(self.nodos)
+        if procesos is None:
+            procesos = os.cpu_count() or 1
+
+        if procesos == 1 or n <= tamano_bloque:
+            # No compensa crear procesos: mismos bloques en este proceso
+            self.D, self.P = self._reserva_numpy()
+            self._inicializa_numpy(grafo, self.D, self.P)
+            _floyd_por_bloques(
+                n,
+                tamano_bloque,
+                lambda tareas: [_actualiza_bloques(self.D, self.P, *tarea) for tarea in tareas],
+            )
+            return
+
+        def ejecuta_en_pool(pool, almacen_D, almacen_P):
+            def ejecuta(tareas):
+                futuros = [
+                    pool.submit(_tarea_bloques, almacen_D, almacen_P, n, *tarea)
+                    for tarea in tareas
+                ]
+                for futuro in futuros:
+                    futuro.result()
+
+            return ejecuta
+
+        if self.directorio is not None:
+            self.D, self.P = self._reserva_numpy()
+            self._inicializa_numpy(grafo, self.D, self.P)
+            self.D.flush()
+            self.P.flush()
+            almacen_D = ("fichero", self.D.filename, self.D.dtype)
+            almacen_P = ("fichero", self.P.filename, self.P.dtype)
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                _floyd_por_bloques(n, tamano_bloque, ejecuta_en_pool(pool, almacen_D, almacen_P))
+            return
+
+        tipo_D = np.dtype(self.tipo_distancias)
+        memoria_D = shared_memory.SharedMemory(create=True, size=max(1, n * n * tipo_D.itemsize))
+        memoria_P = shared_memory.SharedMemory(create=True, size=max(1, n * n * 4))
+        try:
+            D = np.ndarray((n, n), dtype=tipo_D, buffer=memoria_D.buf)
+            P = np.ndarray((n, n), dtype=np.int32, buffer=memoria_P.buf)
+            self._inicializa_numpy(grafo, D, P)
+
+            almacen_D = ("memoria", memoria_D.name, tipo_D)
+            almacen_P = ("memoria", memoria_P.name, P.dtype)
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                _floyd_por_bloques(n, tamano_bloque, ejecuta_en_pool(pool, almacen_D, almacen_P))
+
+            self.D = D.copy()
+            self.P = P.copy()
+            del D, P
+        finally:
+            memoria_D.close()
+            memoria_D.unlink()
+            memoria_P.close()
+            memoria_P.unlink()
+
+    def _predecesor(self, i: int, j: int) -> Optional[int]:
+        """Devuelve el predecesor de j en el camino mínimo desde i, o None."""
+        p = self.P[i][j]
+        if p is None or p < 0:
+            return None
+        return int(p)
+
     def __init__Profesor(self, grafo: dict):
         """Constructor que recibe el grafo sobre el que calcular los caminos
         mínimos.
@@ -127,6 +961,8 @@ class CaminosMinimosFloyd:
         if self.D[i][j] == float("inf"):
             return None
 
+        if self.motor != "python":
+            return float(self.D[i][j])
         return self.D[i][j]
     
     def distancia_Profesor(self, origen: str, destino: str) -> Optional[float]:
@@ -171,7 +1007,7 @@ class CaminosMinimosFloyd:
         # Reconstruir el camino usando la matriz P
         camino = [destino]
         while i != j:
-            j = self.P[i][j]
+            j = self._predecesor(i, j)
             if j is not None:
                 camino.insert(0, self.indice_a_nodo[j])
             else:
@@ -208,6 +1044,190 @@ class CaminosMinimosFloyd:
             return None
 
 
+class CaminosMinimosJohnson:
+    """
+    Caminos mínimos entre todos los nodos con el algoritmo de Johnson, con la
+    misma interfaz de consulta que CaminosMinimosFloyd (distancia y camino).
+
+    1. Bellman-Ford desde un nodo auxiliar unido a todos con peso 0 da un
+       potencial h que hace no negativos los pesos w(u, v) + h(u) - h(v).
+    2. Dijkstra con montículo desde cada nodo sobre el grafo con esos pesos.
+    3. Se deshace el cambio: d(u, v) = d'(u, v) - h(u) + h(v).
+
+    Para grafos dispersos (m mucho menor que n^2) es mejor que Floyd:
+    O(n m log n) frente a O(n^3).
+    """
+
+    def __init__(self, grafo: dict, procesos: Optional[int] = 1):
+        """Constructor que recibe el grafo sobre el que calcular los caminos
+        mínimos, en el mismo formato que CaminosMinimosFloyd (diccionario de
+        arcos y pesos o GrafoCSR).
+
+        Args:
+            grafo (dict): Grafo representado como un diccionario de arcos y pesos o GrafoCSR.
+            procesos (int, optional): Procesos entre los que repartir los
+                Dijkstra de cada origen (ver dijkstra_multi); None usa todos los
+                núcleos y 1 no crea procesos. Defaults to 1.
+
+        Raises:
+            ValueError: El grafo tiene un ciclo de peso negativo.
+        """
+        if not isinstance(grafo, GrafoCSR):
+            # Mismo orden de nodos que CaminosMinimosFloyd
+            nodos = set()
+            for origen, destino in grafo:
+                nodos.add(origen)
+                nodos.add(destino)
+            arcos = ((origen, destino, peso) for (origen, destino), peso in grafo.items())
+            grafo = GrafoCSR.from_arcos(arcos, sorted(nodos))
+
+        self.nodos = list(grafo.nodos)
+        self.nodo_a_indice = dict(grafo.indice)
+        self.indice_a_nodo = dict(enumerate(self.nodos))
+
+        self._enteros = grafo.pesos.typecode == "q"
+        self.h = self._potencial(grafo)
+        reponderado = self._repondera(grafo, self.h)
+
+        resultados = dijkstra_multi(reponderado, self.nodos, procesos)
+
+        # Deshacer el cambio de pesos
+        INF = float("inf")
+        self.D = []
+        self.P = []
+        for s, nodo in enumerate(self.nodos):
+            distancia, predecesor = resultados.indices(nodo)
+            self.D.append([
+                d if d == INF else self._sin_potencial(d, s, j)
+                for j, d in enumerate(distancia)
+            ])
+            self.P.append(predecesor)
+
+    def _sin_potencial(self, d, i: int, j: int):
+        """Distancia original a partir de la distancia con los pesos cambiados."""
+        d = d - self.h[i] + self.h[j]
+        return int(d) if isinstance(d, float) and self._enteros and d.is_integer() else d
+
+    def _potencial(self, grafo: GrafoCSR) -> list:
+        """Bellman-Ford desde un nodo auxiliar con arcos de peso 0 a todos los
+        nodos. Si no hay pesos negativos el potencial es 0.
+
+        Complexity:
+            O(n m)
+        """
+        indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+        n = len(grafo)
+        h = [0] * n
+        if all(peso >= 0 for peso in pesos):
+            return h
+
+        for _ in range(n):
+            cambios = False
+            for i in range(n):
+                for k in range(indptr[i], indptr[i + 1]):
+                    j = indices[k]
+                    if h[i] + pesos[k] < h[j]:
+                        h[j] = h[i] + pesos[k]
+                        cambios = True
+            if not cambios:
+                return h
+        raise ValueError("El grafo tiene un ciclo de peso negativo")
+
+    @staticmethod
+    def _repondera(grafo: GrafoCSR, h: list) -> GrafoCSR:
+        """Devuelve el grafo con pesos w(u, v) + h(u) - h(v), todos >= 0."""
+        if not any(h):
+            return grafo
+        indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+        nuevos = array(pesos.typecode, bytes(pesos.itemsize * len(pesos)))
+        for i in range(len(grafo)):
+            for k in range(indptr[i], indptr[i + 1]):
+                nuevos[k] = pesos[k] + h[i] - h[indices[k]]
+        return GrafoCSR(grafo.nodos, indptr, indices, nuevos)
+
+    def distancia(self, origen: str, destino: str) -> Optional[float]:
+        """Devuelve la distancia del camino mínimo ente origen y destino.
+        Si no hay camino devuelve None.
+
+        Args:
+            origen (str): Origen del camino.
+            destino (str): Destino del camino.
+
+        Returns:
+            Optional[float]: Distancia del camino mínimo o None si no hay camino.
+        """
+        if origen not in self.nodo_a_indice or destino not in self.nodo_a_indice:
+            return None
+        d = self.D[self.nodo_a_indice[origen]][self.nodo_a_indice[destino]]
+        return None if d == float("inf") else d
+
+    def camino(self, origen: str, destino: str) -> Optional[List[str]]:
+        """Devuelve en una lista de nodos el camino mínimo entre origen y
+        destino.
+        Si no hay camino devuelve None.
+
+        Args:
+            origen (str): Origen del camino.
+            destino (str): Destino del camino.
+
+        Returns:
+            Optional[List[str]]: Lista de nodos del camino mínimo o None si no hay camino.
+        """
+        if self.distancia(origen, destino) is None:
+            return None
+
+        i = self.nodo_a_indice[origen]
+        j = self.nodo_a_indice[destino]
+        camino = [destino]
+        while j != i:
+            j = self.P[i][j]
+            camino.append(self.indice_a_nodo[j])
+        camino.reverse()
+        return camino
+
+
+# Por encima de esta densidad (m / n^2) se usa Floyd; por debajo, Johnson
+UMBRAL_DENSIDAD_FLOYD = 0.1
+
+
+def caminos_minimos(
+    grafo: dict,
+    umbral_densidad: float = UMBRAL_DENSIDAD_FLOYD,
+    motor: Optional[str] = None,
+    procesos: Optional[int] = 1,
+):
+    """Calcula los caminos mínimos entre todos los nodos eligiendo el algoritmo
+    según la densidad del grafo: Floyd para grafos densos y Johnson para
+    grafos dispersos.
+
+    Args:
+        grafo (dict): Grafo representado como un diccionario de arcos y pesos o GrafoCSR.
+        umbral_densidad (float, optional): Densidad m / n^2 a partir de la que se
+            usa Floyd. Defaults to UMBRAL_DENSIDAD_FLOYD.
+        motor (str, optional): Motor de Floyd. Defaults to None ("numpy" si
+            está instalado y "python" si no).
+        procesos (int, optional): Procesos para Johnson o para el motor
+            "bloques" de Floyd. Defaults to 1.
+
+    Returns:
+        CaminosMinimosFloyd | CaminosMinimosJohnson: Caminos mínimos.
+    """
+    if isinstance(grafo, GrafoCSR):
+        n, m = len(grafo), grafo.numero_arcos()
+    else:
+        nodos = set()
+        for origen, destino in grafo:
+            nodos.add(origen)
+            nodos.add(destino)
+        n, m = len(nodos), len(grafo)
+
+    if n == 0 or m / (n * n) >= umbral_densidad:
+        if motor is None:
+            motor = "python" if np is None else "numpy"
+        return CaminosMinimosFloyd(grafo, motor=motor, procesos=procesos)
+    return CaminosMinimosJohnson(grafo, procesos=procesos)
+
+
 def multiplicacion_encadenada_matrices(dimensiones: List[int]) -> tuple:
     """Dadas las dimensiones de varias matrices a multiplicar, aplica el método
     de programación dinámica para para determinar en qué orden realizar las
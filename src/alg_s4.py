@@ -13,8 +13,19 @@
 
 # NOTA: Los grafos son dirigidos y pesados.
 
+import hashlib
 import heapq
-from typing import Optional
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
 
 
 grafo_de_ejemplo: dict[str, dict[str, int]] = {
@@ -47,6 +58,8 @@ def numero_arcos(grafo: dict) -> int:
     Returns:
         int: Número de arcos
     """
+    if isinstance(grafo, Grafo):
+        return grafo.numero_arcos()
     total = 0
     for nodo in grafo:
         total += len(grafo[nodo])
@@ -64,6 +77,8 @@ def peso_total(grafo: dict) -> int:
     Returns:
         int: Suma de los pesos
     """
+    if isinstance(grafo, Grafo):
+        return grafo.peso_total()
     total = 0
     for nodo in grafo:
         for destino in grafo[nodo]:
@@ -120,6 +135,8 @@ def inserta_nodo(grafo: dict, nodo: str) -> dict:
     Returns:
         dict: Grafo
     """
+    if isinstance(grafo, Grafo):
+        return grafo.inserta_nodo(nodo)
     grafo.setdefault(nodo, {})
     return grafo
 
@@ -155,6 +172,8 @@ def inserta_arco(grafo: dict, origen: str, destino: str, peso: int = 1) -> dict:
     Returns:
         dict: Grafo
     """
+    if isinstance(grafo, Grafo):
+        return grafo.inserta_arco(origen, destino, peso)
     grafo = inserta_nodo(grafo, origen)
     grafo = inserta_nodo(grafo, destino)
     grafo[origen][destino] = peso
@@ -174,6 +193,8 @@ def grado(grafo: dict, nodo: str, salida: bool = True) -> int:
     Returns:
         int: Grado
     """
+    if isinstance(grafo, Grafo):
+        return grafo.grado(nodo, salida)
     if salida:
         return len(grafo[nodo]) if nodo in grafo else 0
 
@@ -199,6 +220,8 @@ def pesos_adyacentes(grafo: dict, nodo: str, salida: bool = True) -> int:
     Returns:
         int: Suma de pesos
     """
+    if isinstance(grafo, Grafo):
+        return grafo.pesos_adyacentes(nodo, salida)
     if salida:
         return sum(grafo[nodo].values()) if nodo in grafo else 0
 
@@ -258,10 +281,508 @@ def coste_camino_profesor(grafo: dict, camino: list[str]) -> Optional[int]:
     return coste
 
 
+# Grafo con índice inverso
+# En el diccionario de diccionarios solo están los arcos de salida, así que las
+# consultas de entrada (grado, pesos) recorren todo el grafo. La clase Grafo es el
+# mismo diccionario de diccionarios (sirve para todas las funciones de la
+# práctica) y además mantiene el índice de arcos de entrada de cada nodo.
+
+
+class Grafo(dict):
+    """
+    Grafo dirigido y pesado en formato diccionario de diccionarios que mantiene
+    además un índice inverso: `entrada[nodo]` es {origen: peso} con los arcos que
+    llegan al nodo, y el número de arcos y la suma de pesos acumulados, de modo
+    que `numero_arcos` y `peso_total` son O(1).
+
+    Las modificaciones deben hacerse con `inserta_nodo` e `inserta_arco` (los
+    métodos o las funciones del módulo); si se modifican directamente los
+    diccionarios de adyacencia el índice inverso deja de ser correcto.
+    """
+
+    def __init__(self, grafo: Optional[dict] = None):
+        """Crea el grafo, vacío o a partir de un diccionario de diccionarios.
+
+        Args:
+            grafo (dict, optional): Grafo a copiar. Defaults to None.
+
+        Complexity:
+            O(n + m)
+        """
+        super().__init__()
+        self.entrada: dict = {}
+        self._numero_arcos = 0
+        self._peso_total = 0
+        if grafo is not None:
+            for nodo in grafo:
+                self.inserta_nodo(nodo)
+            for origen, vecinos in grafo.items():
+                for destino, peso in vecinos.items():
+                    self.inserta_arco(origen, destino, peso)
+
+    @classmethod
+    def from_dict_of_dicts(cls, grafo: dict) -> "Grafo":
+        """Construye el grafo a partir de un diccionario de diccionarios."""
+        return cls(grafo)
+
+    def inserta_nodo(self, nodo) -> "Grafo":
+        """Inserta el nodo en el grafo. Si ya estaba, no se modifica.
+
+        Returns:
+            Grafo: El propio grafo
+        """
+        if nodo not in self:
+            self[nodo] = {}
+            self.entrada[nodo] = {}
+        return self
+
+    def inserta_arco(self, origen, destino, peso: int = 1) -> "Grafo":
+        """Inserta el arco en el grafo. Si ya estaba se actualiza el peso.
+
+        Returns:
+            Grafo: El propio grafo
+
+        Complexity:
+            O(1)
+        """
+        self.inserta_nodo(origen)
+        self.inserta_nodo(destino)
+        if destino in self[origen]:
+            # Se sustituye el peso anterior
+            self._peso_total -= self[origen][destino]
+        else:
+            self._numero_arcos += 1
+        self._peso_total += peso
+        self[origen][destino] = peso
+        self.entrada[destino][origen] = peso
+        return self
+
+    def numero_arcos(self) -> int:
+        """Número de arcos del grafo.
+
+        Complexity:
+            O(1)
+        """
+        return self._numero_arcos
+
+    def peso_total(self) -> int:
+        """Suma de los pesos de los arcos del grafo.
+
+        Complexity:
+            O(1)
+        """
+        return self._peso_total
+
+    def grado(self, nodo, salida: bool = True) -> int:
+        """Grado de salida o de entrada del nodo (0 si no está en el grafo).
+
+        Complexity:
+            O(1)
+        """
+        adyacentes = self if salida else self.entrada
+        return len(adyacentes[nodo]) if nodo in adyacentes else 0
+
+    def pesos_adyacentes(self, nodo, salida: bool = True) -> int:
+        """Suma de los pesos de los arcos de salida o de entrada del nodo.
+
+        Complexity:
+            O(grado del nodo)
+        """
+        adyacentes = self if salida else self.entrada
+        return sum(adyacentes[nodo].values()) if nodo in adyacentes else 0
+
+    def grados_entrada(self) -> dict:
+        """Grado de entrada de todos los nodos.
+
+        Complexity:
+            O(n)
+        """
+        return {nodo: len(origenes) for nodo, origenes in self.entrada.items()}
+
+    def pesos_entrada(self) -> dict:
+        """Suma de los pesos de los arcos de entrada de todos los nodos.
+
+        Complexity:
+            O(n + m)
+        """
+        return {nodo: sum(origenes.values()) for nodo, origenes in self.entrada.items()}
+
+
+def grados_entrada(grafo: dict) -> dict:
+    """Devuelve el grado de entrada de todos los nodos en una sola pasada.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o Grafo)
+
+    Returns:
+        dict: Grado de entrada de cada nodo
+
+    Complexity:
+        O(n + m), O(n) con un Grafo
+    """
+    if isinstance(grafo, Grafo):
+        return grafo.grados_entrada()
+    grados = dict.fromkeys(grafo, 0)
+    for vecinos in grafo.values():
+        for destino in vecinos:
+            grados[destino] += 1
+    return grados
+
+
+def pesos_entrada(grafo: dict) -> dict:
+    """Devuelve la suma de los pesos de los arcos de entrada de todos los nodos
+    en una sola pasada.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o Grafo)
+
+    Returns:
+        dict: Suma de pesos de entrada de cada nodo
+
+    Complexity:
+        O(n + m)
+    """
+    if isinstance(grafo, Grafo):
+        return grafo.pesos_entrada()
+    pesos = dict.fromkeys(grafo, 0)
+    for vecinos in grafo.values():
+        for destino, peso in vecinos.items():
+            pesos[destino] += peso
+    return pesos
+
+
+# Representación compacta de grafos (CSR)
+# Para grafos grandes el diccionario de diccionarios ocupa mucha memoria por arco
+# y obliga a una búsqueda en un diccionario en cada relajación. La clase GrafoCSR
+# guarda el mismo grafo en formato "compressed sparse row" sobre arrays de enteros.
+
+
+class GrafoCSR:
+    """
+    Grafo dirigido y pesado inmutable en formato CSR (compressed sparse row).
+
+    Los nodos se internan como enteros 0..n-1: `nodos[i]` es el nodo de índice i
+    e `indice[nodo]` es el índice de un nodo.
+    Los arcos que salen del nodo i ocupan las posiciones
+    `indptr[i]`..`indptr[i + 1] - 1` de los arrays `indices` (destinos) y `pesos`.
+
+    Los pesos se guardan como enteros ('q') si todos lo son y como reales ('d') en
+    otro caso.
+    """
+
+    __slots__ = ("nodos", "indice", "indptr", "indices", "pesos")
+
+    def __init__(self, nodos: Iterable, indptr: array, indices: array, pesos: array):
+        """Crea el grafo a partir de los arrays CSR ya construidos.
+        Normalmente se usan los constructores `from_dict_of_dicts`,
+        `from_arc_dict` o `from_arcos`.
+
+        Args:
+            nodos (Iterable): Nodos en el orden de sus índices.
+            indptr (array): Inicio de los arcos de cada nodo (n + 1 elementos).
+            indices (array): Destino de cada arco.
+            pesos (array): Peso de cada arco.
+        """
+        nodos = tuple(nodos)
+        if len(indptr) != len(nodos) + 1 or len(indices) != len(pesos):
+            raise ValueError("Los arrays no forman un grafo CSR válido")
+        object.__setattr__(self, "nodos", nodos)
+        object.__setattr__(self, "indice", {nodo: i for i, nodo in enumerate(nodos)})
+        object.__setattr__(self, "indptr", indptr)
+        object.__setattr__(self, "indices", indices)
+        object.__setattr__(self, "pesos", pesos)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("GrafoCSR es inmutable")
+
+    def __reduce__(self):
+        # Necesario para pickle (por ejemplo, al enviarlo a otros procesos),
+        # ya que __setattr__ no permite restaurar los atributos
+        return (GrafoCSR, (self.nodos, self.indptr, self.indices, self.pesos))
+
+    @classmethod
+    def from_arcos(cls, arcos: Iterable, nodos: Iterable = ()) -> "GrafoCSR":
+        """Construye el grafo a partir de un iterable de arcos (origen, destino, peso).
+
+        Args:
+            arcos (Iterable): Arcos en forma de tuplas (origen, destino, peso).
+            nodos (Iterable, optional): Nodos a internar primero, incluidos los
+                aislados. Defaults to ().
+
+        Returns:
+            GrafoCSR: Grafo en formato CSR.
+
+        Complexity:
+            O(n + m)
+        """
+        indice: dict = {}
+        for nodo in nodos:
+            indice.setdefault(nodo, len(indice))
+
+        origenes = array("q")
+        destinos = array("q")
+        pesos = array("q")
+        for origen, destino, peso in arcos:
+            origenes.append(indice.setdefault(origen, len(indice)))
+            destinos.append(indice.setdefault(destino, len(indice)))
+            try:
+                pesos.append(peso)
+            except TypeError:
+                # Hay pesos reales: pasamos a un array de reales
+                pesos = array("d", pesos)
+                pesos.append(peso)
+
+        n = len(indice)
+        m = len(origenes)
+
+        # Ordenación por cuentas de los arcos según su origen
+        indptr = array("q", bytes(8 * (n + 1)))
+        for origen in origenes:
+            indptr[origen + 1] += 1
+        for i in range(n):
+            indptr[i + 1] += indptr[i]
+
+        siguiente = array("q", indptr[:-1])
+        indices = array("q", bytes(8 * m))
+        pesos_csr = array(pesos.typecode, bytes(pesos.itemsize * m))
+        for k in range(m):
+            origen = origenes[k]
+            posicion = siguiente[origen]
+            indices[posicion] = destinos[k]
+            pesos_csr[posicion] = pesos[k]
+            siguiente[origen] = posicion + 1
+
+        return cls(indice, indptr, indices, pesos_csr)
+
+    @classmethod
+    def from_dict_of_dicts(cls, grafo: dict) -> "GrafoCSR":
+        """Construye el grafo a partir de un diccionario de diccionarios
+        (el formato de esta práctica).
+
+        Args:
+            grafo (dict): Grafo
+
+        Returns:
+            GrafoCSR: Grafo en formato CSR.
+
+        Complexity:
+            O(n + m)
+        """
+        arcos = (
+            (origen, destino, peso)
+            for origen, vecinos in grafo.items()
+            for destino, peso in vecinos.items()
+        )
+        return cls.from_arcos(arcos, grafo)
+
+    @classmethod
+    def from_arc_dict(cls, grafo: dict, simetrico: bool = False) -> "GrafoCSR":
+        """Construye el grafo a partir de un diccionario de arcos
+        {(origen, destino): peso} (el formato de las prácticas 5 y 10).
+
+        Args:
+            grafo (dict): Grafo en formato de diccionario de arcos.
+            simetrico (bool, optional): Si es True cada arco se añade en ambos
+                sentidos (grafo no dirigido). Defaults to False.
+
+        Returns:
+            GrafoCSR: Grafo en formato CSR.
+
+        Complexity:
+            O(n + m)
+        """
+        if simetrico:
+            arcos = (
+                arco
+                for (origen, destino), peso in grafo.items()
+                for arco in ((origen, destino, peso), (destino, origen, peso))
+            )
+        else:
+            arcos = ((origen, destino, peso) for (origen, destino), peso in grafo.items())
+        return cls.from_arcos(arcos)
+
+    def __len__(self) -> int:
+        """Devuelve el número de nodos."""
+        return len(self.nodos)
+
+    def __contains__(self, nodo) -> bool:
+        """Indica si el nodo está en el grafo."""
+        return nodo in self.indice
+
+    def __getitem__(self, nodo) -> dict:
+        """Devuelve los adyacentes de salida de un nodo como {destino: peso},
+        igual que en el diccionario de diccionarios.
+
+        Args:
+            nodo: Nodo del grafo.
+
+        Returns:
+            dict: Adyacentes del nodo y pesos de los arcos.
+        """
+        i = self.indice[nodo]
+        nodos, indices, pesos = self.nodos, self.indices, self.pesos
+        return {
+            nodos[indices[k]]: pesos[k]
+            for k in range(self.indptr[i], self.indptr[i + 1])
+        }
+
+    def __iter__(self) -> Iterator:
+        """Itera sobre los nodos en el orden de sus índices."""
+        return iter(self.nodos)
+
+    def numero_arcos(self) -> int:
+        """Devuelve el número de arcos."""
+        return len(self.indices)
+
+    def arcos(self) -> Iterator[tuple]:
+        """Itera sobre los arcos del grafo como tuplas (origen, destino, peso).
+
+        Yields:
+            tuple: Arco (origen, destino, peso).
+        """
+        nodos, indptr, indices, pesos = self.nodos, self.indptr, self.indices, self.pesos
+        for i in range(len(nodos)):
+            for k in range(indptr[i], indptr[i + 1]):
+                yield nodos[i], nodos[indices[k]], pesos[k]
+
+
+# Cabeceras de los ficheros binarios
+# Los índices y caminos precalculados se guardan como: una marca (MAGIA), la
+# longitud de la cabecera (8 bytes, little endian), la cabecera en JSON y después
+# los arrays en binario. Leer la cabecera no ejecuta código (a diferencia de
+# pickle). Los nodos pueden ser tuplas, que se guardan como {"tupla": [...]}
+# para distinguirlas de las listas. Estas funciones son el formato común de los
+# ficheros de esta práctica (IndiceALT, JerarquiaContraccion) y de la práctica 10
+# (CaminosMinimosFloyd).
+
+
+def a_json(valor):
+    """Convierte un nodo, o una lista de nodos, en un valor que se puede guardar
+    en JSON.
+
+    Args:
+        valor: Nodo (str, int, float o tupla de estos) o lista de nodos.
+
+    Returns:
+        Valor equivalente sin tuplas.
+    """
+    if isinstance(valor, tuple):
+        return {"tupla": [a_json(elemento) for elemento in valor]}
+    if isinstance(valor, list):
+        return [a_json(elemento) for elemento in valor]
+    return valor
+
+
+def de_json(valor):
+    """Deshace la conversión de `a_json`.
+
+    Args:
+        valor: Valor leído de JSON.
+
+    Returns:
+        Nodo o lista de nodos original.
+    """
+    if isinstance(valor, dict):
+        return tuple(de_json(elemento) for elemento in valor["tupla"])
+    if isinstance(valor, list):
+        return [de_json(elemento) for elemento in valor]
+    return valor
+
+
+def huella_arcos(arcos: Iterable[tuple]) -> str:
+    """Calcula una huella (SHA-256) de unos arcos (origen, destino, peso) que no
+    depende del orden en que se recorran.
+
+    Args:
+        arcos (Iterable[tuple]): Arcos del grafo.
+
+    Returns:
+        str: Huella en hexadecimal.
+
+    Complexity:
+        O(m log m)
+    """
+    return hashlib.sha256("\n".join(sorted(repr(arco) for arco in arcos)).encode()).hexdigest()
+
+
+def escribe_cabecera(fichero, magia: bytes, cabecera: dict):
+    """Escribe la marca y la cabecera JSON al principio de un fichero binario.
+
+    Args:
+        fichero: Fichero abierto en modo "wb".
+        magia (bytes): Marca del formato.
+        cabecera (dict): Datos de la cabecera (ya convertidos con `a_json`).
+    """
+    datos = json.dumps(cabecera).encode()
+    fichero.write(magia)
+    fichero.write(struct.pack("<Q", len(datos)))
+    fichero.write(datos)
+
+
+def lee_cabecera(fichero, magia: bytes) -> Optional[dict]:
+    """Lee la cabecera escrita con `escribe_cabecera`. El fichero queda
+    posicionado al principio de los arrays.
+
+    Args:
+        fichero: Fichero abierto en modo "rb".
+        magia (bytes): Marca del formato.
+
+    Returns:
+        dict: Cabecera, o None si el fichero no tiene la marca o la cabecera no
+            es válida.
+    """
+    if fichero.read(len(magia)) != magia:
+        return None
+    longitud = fichero.read(8)
+    if len(longitud) != 8:
+        return None
+    try:
+        cabecera = json.loads(fichero.read(struct.unpack("<Q", longitud)[0]))
+    except ValueError:
+        return None
+    return cabecera if isinstance(cabecera, dict) else None
+
+
 ###################
 # Habiendo creado las funciones anteriores, se pide implementar los siguientes métodos:
 
 
+def _prim_csr(grafo: GrafoCSR, inicial=None) -> dict:
+    """Prim con montículo y borrado perezoso sobre los índices de un GrafoCSR.
+    Devuelve el árbol como diccionario de diccionarios con los nodos originales.
+
+    Complexity:
+        O(m log m)
+    """
+    nodos, indptr, indices, pesos = grafo.nodos, grafo.indptr, grafo.indices, grafo.pesos
+    n = len(nodos)
+    arbol: dict = {nodo: {} for nodo in nodos}
+    if n == 0:
+        return arbol
+
+    origen = 0 if inicial is None else grafo.indice[inicial]
+    visitado = bytearray(n)
+    visitado[origen] = 1
+    cola = [(pesos[k], origen, indices[k]) for k in range(indptr[origen], indptr[origen + 1])]
+    heapq.heapify(cola)
+
+    restantes = n - 1
+    while cola and restantes:
+        peso, i, j = heapq.heappop(cola)
+        if visitado[j]:
+            continue
+        visitado[j] = 1
+        restantes -= 1
+        arbol[nodos[i]][nodos[j]] = peso
+        arbol[nodos[j]][nodos[i]] = peso
+
+        for k in range(indptr[j], indptr[j + 1]):
+            if not visitado[indices[k]]:
+                heapq.heappush(cola, (pesos[k], j, indices[k]))
+
+    return arbol
+
+
 def prim(grafo: dict, inicial: Optional[str] = None) -> dict:
     """Implementa el algoritmo de Prim para obtener el árbol de expansión mínima de un grafo usando colas de prioridad.
     Devuelve en el formato del grafo el árbol.
@@ -269,17 +790,21 @@ def prim(grafo: dict, inicial: Optional[str] = None) -> dict:
     Se recuerda que un árbol es un grafo sin bucles y conectado.
 
     El grafo que se va a recibir siempre será conexo y sin direcciones.
+    También acepta un GrafoCSR (con los arcos en ambos sentidos).
 
     Args:
-        grafo (dict): Grafo
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
         inicial (str, optional): Nodo inicial. Defaults to None.
 
     Returns:
         dict: Árbol de expansión mínima
 
     Complexity:
-        O(n log n)
+        O(m log m), con m el número de arcos
     """
+    if isinstance(grafo, GrafoCSR):
+        return _prim_csr(grafo, inicial)
+
     # Si no se proporciona nodo inicial, tomar el primero
     if inicial is None:
         inicial = list(grafo.keys())[0]
@@ -290,23 +815,32 @@ def prim(grafo: dict, inicial: Optional[str] = None) -> dict:
     # Conjunto de nodos visitados
     visitados = {inicial}
 
-    # Repetir hasta que todos los nodos estén en el árbol
-    while len(visitados) < len(grafo):
-        arco_minimo = (None, None, float("inf"))  # (origen, destino, peso)
+    # Montículo de arcos candidatos (peso, contador, origen, destino). Los arcos
+    # hacia nodos ya visitados no se borran: se descartan al sacarlos (borrado
+    # perezoso). El contador desempata sin comparar los nodos.
+    cola = []
+    contador = 0
+    for vecino, peso in grafo[inicial].items():
+        cola.append((peso, contador, inicial, vecino))
+        contador += 1
+    heapq.heapify(cola)
 
-        # Buscar el arco de menor peso entre visitados y no visitados
-        for nodo in visitados:
-            for vecino, peso in grafo[nodo].items():
-                if vecino not in visitados and peso < arco_minimo[2]:
-                    arco_minimo = (nodo, vecino, peso)
+    # Repetir hasta que todos los nodos estén en el árbol
+    while cola and len(visitados) < len(grafo):
+        peso, _, origen, destino = heapq.heappop(cola)
+        if destino in visitados:
+            continue
 
         # Añadir el arco mínimo al árbol
-        origen, destino, peso = arco_minimo
         arbol[origen][destino] = peso
         arbol[destino][origen] = peso  # Ya que es un grafo no dirigido
 
-        # Añadir el nuevo nodo a visitados
+        # Añadir el nuevo nodo a visitados y sus arcos a la cola
         visitados.add(destino)
+        for vecino, peso_vecino in grafo[destino].items():
+            if vecino not in visitados:
+                heapq.heappush(cola, (peso_vecino, contador, destino, vecino))
+                contador += 1
 
     return arbol
 
@@ -351,48 +885,517 @@ def prim_profesor(grafo: dict, inicial: Optional[str] = None) -> dict:
     return arbol
 
 
-def dijkstra(grafo: dict, inicial: str) -> dict:
+class MonticuloIndexado:
+    """
+    Montículo d-ario indexado de mínimos sobre los elementos 0..n-1.
+
+    Cada elemento aparece a lo sumo una vez: su posición en el montículo se
+    guarda en un array, lo que permite reducir su prioridad (decrease_key) en
+    lugar de insertar duplicados. Así el montículo nunca pasa de n entradas.
+    Con aridad d, subir un elemento cuesta O(log_d n) y extraer el mínimo
+    O(d log_d n); aridades 4 u 8 suelen compensar en grafos densos.
+    """
+
+    def __init__(self, n: int, aridad: int = 4):
+        """Crea el montículo vacío.
+
+        Args:
+            n (int): Número de elementos posibles (0..n-1)
+            aridad (int, optional): Hijos por nodo del montículo. Defaults to 4.
+
+        Raises:
+            ValueError: La aridad es menor que 2.
+        """
+        if aridad < 2:
+            raise ValueError("La aridad del montículo debe ser al menos 2")
+        self.aridad = aridad
+        self.elementos: list = []  # Elementos en orden de montículo
+        self.prioridades: list = [float("inf")] * n  # Prioridad de cada elemento
+        self.posicion = array("q", [-1]) * n  # Posición en el montículo (-1 si no está)
+
+    def __len__(self) -> int:
+        return len(self.elementos)
+
+    def __contains__(self, elemento: int) -> bool:
+        return self.posicion[elemento] >= 0
+
+    def prioridad(self, elemento: int):
+        """Prioridad actual del elemento (inf si nunca se ha insertado)."""
+        return self.prioridades[elemento]
+
+    def inserta(self, elemento: int, prioridad):
+        """Inserta un elemento que no está en el montículo.
+
+        Raises:
+            KeyError: El elemento ya está en el montículo.
+        """
+        if self.posicion[elemento] >= 0:
+            raise KeyError(elemento)
+        self.prioridades[elemento] = prioridad
+        self.elementos.append(elemento)
+        self.posicion[elemento] = len(self.elementos) - 1
+        self._sube(len(self.elementos) - 1)
+
+    def decrease_key(self, elemento: int, prioridad):
+        """Reduce la prioridad de un elemento del montículo.
+
+        Raises:
+            KeyError: El elemento no está en el montículo.
+            ValueError: La nueva prioridad es mayor que la actual.
+        """
+        if self.posicion[elemento] < 0:
+            raise KeyError(elemento)
+        if prioridad > self.prioridades[elemento]:
+            raise ValueError("La nueva prioridad es mayor que la actual")
+        self.prioridades[elemento] = prioridad
+        self._sube(self.posicion[elemento])
+
+    def inserta_o_reduce(self, elemento: int, prioridad) -> bool:
+        """Inserta el elemento o reduce su prioridad si la nueva es menor.
+
+        Returns:
+            bool: True si se ha insertado o reducido.
+        """
+        if self.posicion[elemento] < 0:
+            self.inserta(elemento, prioridad)
+            return True
+        if prioridad < self.prioridades[elemento]:
+            self.prioridades[elemento] = prioridad
+            self._sube(self.posicion[elemento])
+            return True
+        return False
+
+    def pop_min(self) -> tuple:
+        """Extrae el elemento de menor prioridad.
+
+        Raises:
+            IndexError: El montículo está vacío.
+
+        Returns:
+            tuple: Elemento y prioridad.
+        """
+        elementos = self.elementos
+        if not elementos:
+            raise IndexError("pop_min de un montículo vacío")
+        minimo = elementos[0]
+        ultimo = elementos.pop()
+        self.posicion[minimo] = -1
+        if elementos:
+            elementos[0] = ultimo
+            self.posicion[ultimo] = 0
+            self._baja(0)
+        return minimo, self.prioridades[minimo]
+
+    def _sube(self, i: int):
+        """Sube el elemento de la posición i hasta restaurar el orden."""
+        elementos, prioridades, posicion, aridad = self.elementos, self.prioridades, self.posicion, self.aridad
+        elemento = elementos[i]
+        prioridad = prioridades[elemento]
+        while i > 0:
+            padre = (i - 1) // aridad
+            elemento_padre = elementos[padre]
+            if prioridades[elemento_padre] <= prioridad:
+                break
+            elementos[i] = elemento_padre
+            posicion[elemento_padre] = i
+            i = padre
+        elementos[i] = elemento
+        posicion[elemento] = i
+
+    def _baja(self, i: int):
+        """Baja el elemento de la posición i hasta restaurar el orden."""
+        elementos, prioridades, posicion, aridad = self.elementos, self.prioridades, self.posicion, self.aridad
+        n = len(elementos)
+        elemento = elementos[i]
+        prioridad = prioridades[elemento]
+        while True:
+            primero = aridad * i + 1
+            if primero >= n:
+                break
+            # Hijo de menor prioridad
+            hijo = primero
+            prioridad_hijo = prioridades[elementos[primero]]
+            for k in range(primero + 1, min(primero + aridad, n)):
+                if prioridades[elementos[k]] < prioridad_hijo:
+                    hijo, prioridad_hijo = k, prioridades[elementos[k]]
+            if prioridad <= prioridad_hijo:
+                break
+            elementos[i] = elementos[hijo]
+            posicion[elementos[i]] = i
+            i = hijo
+        elementos[i] = elemento
+        posicion[elemento] = i
+
+
+def _conjunto_objetivos(grafo, objetivos) -> Optional[set]:
+    """Normaliza los nodos objetivo de una búsqueda en un conjunto.
+    Acepta un único nodo del grafo o un iterable de nodos. Las cadenas, los
+    bytes y las tuplas se toman siempre como un único nodo.
+
+    Args:
+        grafo: Grafo (o cualquier contenedor de nodos que admita `in`)
+        objetivos: Nodo objetivo, iterable de nodos objetivo o None
+
+    Raises:
+        KeyError: Algún objetivo no está en el grafo.
+
+    Returns:
+        Optional[set]: Conjunto de nodos objetivo o None si no hay objetivos
+    """
+    if objetivos is None:
+        return None
+    if isinstance(objetivos, (str, bytes, tuple)) or not isinstance(objetivos, Iterable):
+        objetivos = (objetivos,)
+    pendientes = set(objetivos)
+    for objetivo in pendientes:
+        if objetivo not in grafo:
+            raise KeyError(objetivo)
+    return pendientes
+
+
+def dijkstra_indices(grafo: GrafoCSR, origen: int, pendientes: Optional[set] = None) -> tuple:
+    """Dijkstra con montículo sobre los índices de un GrafoCSR.
+    Es el motor de `dijkstra` para grafos CSR y lo usan otros algoritmos que
+    trabajan directamente con índices (por ejemplo, Johnson).
+
+    Args:
+        grafo (GrafoCSR): Grafo
+        origen (int): Índice del nodo inicial
+        pendientes (set, optional): Índices objetivo; se modifica. Defaults to None.
+
+    Returns:
+        tuple: Listas de distancias y de índices predecesores (-1 si no hay).
+    """
+    indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+    n = len(grafo)
+    distancia = [float("inf")] * n
+    predecesor = [-1] * n
+    visitado = bytearray(n)
+
+    distancia[origen] = 0
+    cola = [(0, origen)]
+    while cola:
+        distancia_actual, i = heapq.heappop(cola)
+        if visitado[i]:
+            continue
+        visitado[i] = 1
+
+        if pendientes is not None:
+            pendientes.discard(i)
+            if not pendientes:
+                break
+
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            nueva_distancia = distancia_actual + pesos[k]
+            if nueva_distancia < distancia[j]:
+                distancia[j] = nueva_distancia
+                predecesor[j] = i
+                heapq.heappush(cola, (nueva_distancia, j))
+
+    return distancia, predecesor
+
+
+def _resultado_csr(grafo: GrafoCSR, distancia: list, predecesor: list) -> dict:
+    """Traduce las listas de Dijkstra sobre índices al formato
+    {nodo: (predecesor, distancia)}.
+    """
+    nodos = grafo.nodos
+    return {
+        nodos[i]: (nodos[predecesor[i]] if predecesor[i] >= 0 else None, distancia[i])
+        for i in range(len(nodos))
+    }
+
+
+def dijkstra(grafo: dict, inicial: str, objetivos=None) -> dict:
     """Implementa el algoritmo de Dijkstra
     Devuelve un diccionario con la distancia mínima desde el nodo inicial a cada uno de los nodos del grafo.
 
+    La selección del siguiente nodo se hace con un montículo binario (heapq) con
+    borrado perezoso: las entradas obsoletas se descartan al extraerlas.
+
+    Si se indican objetivos (un nodo o un conjunto de nodos), la búsqueda se
+    detiene en cuanto todos ellos están fijados. En ese caso solo son definitivas
+    las distancias de los nodos fijados (entre ellos los objetivos); el resto
+    pueden ser cotas superiores o infinito.
+
+    También acepta un GrafoCSR, en cuyo caso el cálculo se hace sobre los
+    índices enteros de los nodos.
+
     Args:
-        grafo (dict): Grafo
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
         inicial (str): Nodo inicial
+        objetivos (optional): Nodo o conjunto de nodos objetivo. Defaults to None.
 
     Returns:
         dict: Distancias mínimas
 
     Complexity:
-        O(n^2)
+        O((n + m) log n)
     """
+    if isinstance(grafo, GrafoCSR):
+        pendientes = _conjunto_objetivos(grafo, objetivos)
+        if pendientes is not None:
+            pendientes = {grafo.indice[nodo] for nodo in pendientes}
+        distancia, predecesor = dijkstra_indices(grafo, grafo.indice[inicial], pendientes)
+        return _resultado_csr(grafo, distancia, predecesor)
+
     # Inicializar distancias y predecesores
     distancias = {nodo: (None, float("inf")) for nodo in grafo}
     distancias[inicial] = (None, 0)
 
-    # Conjunto de nodos no visitados
-    no_visitados = set(grafo.keys())
+    pendientes = _conjunto_objetivos(grafo, objetivos)
 
-    while no_visitados:
-        # Encontrar el nodo no visitado con la menor distancia
-        nodo_actual = min(no_visitados, key=lambda x: distancias[x][1])
+    # Conjunto de nodos ya fijados
+    visitados = set()
+    # Entradas (distancia, contador, nodo): el contador desempata sin comparar
+    # los nodos, que pueden ser de tipos distintos
+    cola = [(0, 0, inicial)]
+    contador = 1
 
-        # Si la distancia es infinito, no hay más caminos posibles
-        if distancias[nodo_actual][1] == float("inf"):
-            break
+    while cola:
+        # Extraer el nodo no visitado con la menor distancia
+        distancia_actual, _, nodo_actual = heapq.heappop(cola)
+        if nodo_actual in visitados:
+            continue
+        visitados.add(nodo_actual)
 
-        # Eliminar el nodo actual de no_visitados
-        no_visitados.remove(nodo_actual)
+        # Si ya se han fijado todos los objetivos, terminamos
+        if pendientes is not None:
+            pendientes.discard(nodo_actual)
+            if not pendientes:
+                break
 
         # Actualizar las distancias de los nodos adyacentes
         for vecino, peso in grafo[nodo_actual].items():
-            nueva_distancia = distancias[nodo_actual][1] + peso
+            nueva_distancia = distancia_actual + peso
 
             if nueva_distancia < distancias[vecino][1]:
                 distancias[vecino] = (nodo_actual, nueva_distancia)
+                heapq.heappush(cola, (nueva_distancia, contador, vecino))
+                contador += 1
 
     return distancias
 
 
+def dijkstra_monticulo_indexado(grafo: dict, inicial: str, aridad: int = 4) -> dict:
+    """Dijkstra con un MonticuloIndexado: en lugar de insertar entradas
+    duplicadas se reduce la prioridad del nodo, así que el montículo tiene a lo
+    sumo n entradas y no hay extracciones obsoletas.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+        inicial (str): Nodo inicial
+        aridad (int, optional): Aridad del montículo. Defaults to 4.
+
+    Returns:
+        dict: Distancias mínimas, con el mismo formato que `dijkstra`
+
+    Complexity:
+        O(m log_d n + n d log_d n)
+    """
+    if not isinstance(grafo, GrafoCSR):
+        grafo = GrafoCSR.from_dict_of_dicts(grafo)
+    indptr, indices, pesos = grafo.indptr, grafo.indices, grafo.pesos
+    n = len(grafo)
+    predecesor = [-1] * n
+    fijado = bytearray(n)
+
+    monticulo = MonticuloIndexado(n, aridad)
+    monticulo.inserta(grafo.indice[inicial], 0)
+    distancia = monticulo.prioridades  # Las prioridades son las distancias provisionales
+    while monticulo:
+        i, distancia_actual = monticulo.pop_min()
+        fijado[i] = 1
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not fijado[j] and monticulo.inserta_o_reduce(j, distancia_actual + pesos[k]):
+                predecesor[j] = i
+
+    return _resultado_csr(grafo, distancia, predecesor)
+
+
+def comparar_monticulos(
+    num_nodos: int = 2000,
+    densidades: tuple = (0.001, 0.01, 0.1),
+    aridades: tuple = (2, 4, 8),
+    repeticiones: int = 3,
+    semilla: int = 1,
+) -> dict:
+    """
+    Compara el tiempo de Dijkstra con heapq y borrado perezoso frente al
+    montículo indexado con distintas aridades, para varias densidades.
+
+    Args:
+        num_nodos: Número de nodos de los grafos aleatorios.
+        densidades: Fracción de los n(n-1) arcos posibles que tiene cada grafo.
+        aridades: Aridades del montículo indexado a probar.
+        repeticiones: Número de grafos aleatorios por densidad.
+        semilla: Semilla para generar los grafos.
+
+    Returns:
+        dict: Tiempo medio en ms por densidad y por método ("heapq" o "d=<aridad>").
+    """
+    random.seed(semilla)
+    metodos = ["heapq"] + [f"d={aridad}" for aridad in aridades]
+    print(f"{'Densidad':<10}" + "".join(f"{metodo + ' (ms)':<15}" for metodo in metodos))
+    print("-" * (10 + 15 * len(metodos)))
+
+    resultados = {}
+    for densidad in densidades:
+        tiempos = dict.fromkeys(metodos, 0.0)
+        for _ in range(repeticiones):
+            grafo = {nodo: {} for nodo in range(num_nodos)}
+            for _ in range(int(densidad * num_nodos * (num_nodos - 1))):
+                origen, destino = random.randrange(num_nodos), random.randrange(num_nodos)
+                if origen != destino:
+                    grafo[origen][destino] = random.randint(1, 100)
+            csr = GrafoCSR.from_dict_of_dicts(grafo)
+
+            inicio = time.perf_counter()
+            dijkstra(csr, 0)
+            tiempos["heapq"] += (time.perf_counter() - inicio) * 1000
+            for aridad in aridades:
+                inicio = time.perf_counter()
+                dijkstra_monticulo_indexado(csr, 0, aridad)
+                tiempos[f"d={aridad}"] += (time.perf_counter() - inicio) * 1000
+
+        resultados[densidad] = {metodo: total / repeticiones for metodo, total in tiempos.items()}
+        print(f"{densidad:<10}" + "".join(f"{resultados[densidad][metodo]:<15.2f}" for metodo in metodos))
+    return resultados
+
+
+# Grafo de cada proceso del pool de dijkstra_multi (se envía una vez al crear el proceso)
+_grafo_proceso: Optional[GrafoCSR] = None
+
+
+def _inicia_proceso_dijkstra(grafo: GrafoCSR):
+    """Inicializador de los procesos del pool de dijkstra_multi."""
+    global _grafo_proceso
+    _grafo_proceso = grafo
+
+
+def _dijkstra_fuentes(origenes: list) -> list:
+    """Tarea de un proceso del pool: Dijkstra desde cada origen (índice) sobre el
+    grafo del proceso.
+
+    Returns:
+        list: Pares (distancias, predecesores). Los predecesores van en un array
+            compacto; las distancias solo si los pesos son reales, porque con
+            pesos enteros un array 'd' las convertiría en reales (y un array 'q'
+            no admite inf) y el resultado no coincidiría con el de un proceso.
+    """
+    reales = _grafo_proceso.pesos.typecode == "d"
+    resultados = []
+    for origen in origenes:
+        distancia, predecesor = dijkstra_indices(_grafo_proceso, origen)
+        resultados.append((array("d", distancia) if reales else distancia, array("q", predecesor)))
+    return resultados
+
+
+class ResultadosDijkstra(Mapping):
+    """
+    Resultado de dijkstra_multi: diccionario de solo lectura fuente -> resultado
+    de Dijkstra desde esa fuente, en el mismo formato que `dijkstra`.
+
+    Internamente se guardan los arrays de distancias y predecesores sobre los
+    índices del grafo; el diccionario {nodo: (predecesor, distancia)} solo se
+    construye al acceder a una fuente. Con varios procesos, acceder a una
+    fuente espera únicamente a que termine la tarea que la contiene.
+    """
+
+    def __init__(self, grafo: GrafoCSR, fuentes: list, procesos: int):
+        """Lanza los cálculos. Normalmente se crea con dijkstra_multi.
+
+        Args:
+            grafo (GrafoCSR): Grafo ya preprocesado.
+            fuentes (list): Nodos origen, sin repetir.
+            procesos (int): Número de procesos; con 1 se calcula cada fuente la
+                primera vez que se consulta.
+        """
+        self.grafo = grafo
+        self._fuentes = fuentes
+        self._conjunto_fuentes = set(fuentes)
+        self._calculados: dict = {}
+        self._pendientes: dict = {}
+
+        if procesos > 1 and len(fuentes) > 1:
+            tamano = -(-len(fuentes) // (4 * procesos))  # Varias tareas por proceso
+            pool = ProcessPoolExecutor(
+                max_workers=procesos,
+                initializer=_inicia_proceso_dijkstra,
+                initargs=(grafo,),
+            )
+            for inicio in range(0, len(fuentes), tamano):
+                parte = fuentes[inicio:inicio + tamano]
+                futuro = pool.submit(_dijkstra_fuentes, [grafo.indice[f] for f in parte])
+                for posicion, fuente in enumerate(parte):
+                    self._pendientes[fuente] = (futuro, posicion)
+            # Las tareas ya enviadas siguen ejecutándose
+            pool.shutdown(wait=False)
+
+    def indices(self, fuente) -> tuple:
+        """Devuelve las distancias y los predecesores desde la fuente sobre los
+        índices del grafo (-1 si no hay predecesor), sin construir diccionarios.
+
+        Args:
+            fuente: Nodo origen.
+
+        Returns:
+            tuple: Distancias y predecesores indexados por índice de nodo.
+        """
+        if fuente not in self._calculados:
+            if fuente in self._pendientes:
+                futuro, posicion = self._pendientes.pop(fuente)
+                self._calculados[fuente] = futuro.result()[posicion]
+            elif fuente in self._conjunto_fuentes:
+                self._calculados[fuente] = dijkstra_indices(self.grafo, self.grafo.indice[fuente])
+            else:
+                raise KeyError(fuente)
+        return self._calculados[fuente]
+
+    def __getitem__(self, fuente) -> dict:
+        """Resultado de Dijkstra desde la fuente, como {nodo: (predecesor, distancia)}."""
+        distancia, predecesor = self.indices(fuente)
+        return _resultado_csr(self.grafo, distancia, predecesor)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._fuentes)
+
+    def __len__(self) -> int:
+        return len(self._fuentes)
+
+
+def dijkstra_multi(grafo: dict, fuentes: Iterable, procesos: Optional[int] = None) -> ResultadosDijkstra:
+    """Dijkstra desde varias fuentes a la vez.
+    El grafo se convierte una sola vez a GrafoCSR (nodos internados y arcos en
+    arrays) y las fuentes se reparten entre un pool de procesos, que reciben el
+    grafo una vez al arrancar.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+        fuentes (Iterable): Nodos origen.
+        procesos (int, optional): Número de procesos; None usa todos los núcleos
+            y 1 no crea procesos. Defaults to None.
+
+    Returns:
+        ResultadosDijkstra: Diccionario fuente -> resultado de dijkstra, que se
+        materializa al consultarlo.
+
+    Complexity:
+        O(s (n + m) log n) repartido entre los procesos, siendo s el número de fuentes
+    """
+    if not isinstance(grafo, GrafoCSR):
+        grafo = GrafoCSR.from_dict_of_dicts(grafo)
+    fuentes = list(dict.fromkeys(fuentes))
+    for fuente in fuentes:
+        if fuente not in grafo:
+            raise KeyError(fuente)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+    return ResultadosDijkstra(grafo, fuentes, procesos)
+
+
 def dijkstra_profesor(grafo: dict, inicial: str) -> dict:
     """Implementa el algoritmo de Dijkstra
     Devuelve un diccionario con la distancia mínima desde el nodo inicial a cada uno de los nodos del grafo.
@@ -484,3 +1487,993 @@ def obten_camino_minimo(
 
     # Invertir el camino para que vaya del inicio al final
     return list(reversed(camino))
+
+
+# Búsquedas punto a punto
+# Cuando solo interesa el camino entre dos nodos no hace falta un Dijkstra
+# completo. Estas funciones devuelven directamente (distancia, camino) y, si se
+# pasa un diccionario de estadísticas, anotan en "fijados" cuántos nodos han
+# tenido que fijar, para compararlo con los de dijkstra.
+
+
+def grafo_inverso(grafo: dict) -> dict:
+    """Devuelve el grafo con todos los arcos invertidos.
+    Se usa para la búsqueda hacia atrás de dijkstra_bidireccional; si se hacen
+    muchas consultas sobre el mismo grafo conviene calcularlo una sola vez.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+
+    Returns:
+        dict: Grafo inverso
+
+    Complexity:
+        O(n + m)
+    """
+    inverso: dict = {nodo: {} for nodo in grafo}
+    for origen in grafo:
+        for destino, peso in grafo[origen].items():
+            inverso[destino][origen] = peso
+    return inverso
+
+
+def _reconstruye_camino(predecesores: dict, final) -> list:
+    """Reconstruye el camino que termina en final siguiendo los predecesores
+    hasta un nodo sin predecesor (None).
+    """
+    camino = [final]
+    while predecesores[camino[-1]] is not None:
+        camino.append(predecesores[camino[-1]])
+    camino.reverse()
+    return camino
+
+
+def dijkstra_bidireccional(
+    grafo: dict,
+    inicial: str,
+    final: str,
+    inverso: Optional[dict] = None,
+    estadisticas: Optional[dict] = None,
+) -> tuple:
+    """Camino mínimo entre dos nodos con Dijkstra bidireccional: una búsqueda
+    hacia delante desde inicial y otra hacia atrás (sobre el grafo inverso)
+    desde final, alternándose. Se para cuando la suma de las distancias mínimas
+    de las dos colas no puede mejorar el mejor camino encontrado.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+        inicial (str): Nodo inicial
+        final (str): Nodo final
+        inverso (dict, optional): Grafo inverso precalculado con grafo_inverso. Defaults to None.
+        estadisticas (dict, optional): Si se indica, se guarda en "fijados" el
+            número de nodos fijados por las dos búsquedas. Defaults to None.
+
+    Returns:
+        tuple: Distancia (inf si no hay camino) y camino (None si no hay camino).
+
+    Complexity:
+        O((n + m) log n) en el peor caso
+    """
+    if inverso is None:
+        inverso = grafo_inverso(grafo)
+
+    # Índice 0: búsqueda hacia delante; índice 1: hacia atrás
+    grafos = (grafo, inverso)
+    distancias: tuple = ({inicial: 0}, {final: 0})
+    predecesores: tuple = ({inicial: None}, {final: None})
+    fijados: tuple = (set(), set())
+    # Entradas (distancia, contador, nodo): el contador desempata sin comparar nodos
+    colas: tuple = ([(0, 0, inicial)], [(0, 0, final)])
+    contador = 1
+
+    mejor = 0 if inicial == final else float("inf")
+    encuentro = inicial if inicial == final else None
+
+    while colas[0] and colas[1] and colas[0][0][0] + colas[1][0][0] < mejor:
+        # Se avanza la búsqueda con la cola más pequeña
+        lado = 0 if len(colas[0]) <= len(colas[1]) else 1
+        distancia_actual, _, nodo = heapq.heappop(colas[lado])
+        if nodo in fijados[lado]:
+            continue
+        fijados[lado].add(nodo)
+
+        for vecino, peso in grafos[lado][nodo].items():
+            nueva_distancia = distancia_actual + peso
+            if nueva_distancia < distancias[lado].get(vecino, float("inf")):
+                distancias[lado][vecino] = nueva_distancia
+                predecesores[lado][vecino] = nodo
+                heapq.heappush(colas[lado], (nueva_distancia, contador, vecino))
+                contador += 1
+            # Camino que pasa por el arco (nodo, vecino) y une las dos búsquedas
+            otra = distancias[1 - lado].get(vecino)
+            if otra is not None and nueva_distancia + otra < mejor:
+                mejor = nueva_distancia + otra
+                encuentro = vecino
+
+    if estadisticas is not None:
+        estadisticas["fijados"] = len(fijados[0]) + len(fijados[1])
+
+    if encuentro is None:
+        return float("inf"), None
+
+    camino = _reconstruye_camino(predecesores[0], encuentro)
+    # La parte hacia atrás va de encuentro a final
+    nodo = predecesores[1][encuentro]
+    while nodo is not None:
+        camino.append(nodo)
+        nodo = predecesores[1][nodo]
+    return mejor, camino
+
+
+def _heuristica_nula(nodo, final) -> int:
+    """Heurística de A* que no estima nada: A* se comporta como Dijkstra."""
+    return 0
+
+
+def a_estrella(
+    grafo: dict,
+    inicial: str,
+    final: str,
+    heuristica: Optional[Callable] = None,
+    estadisticas: Optional[dict] = None,
+) -> tuple:
+    """Camino mínimo entre dos nodos con el algoritmo A*.
+    Los nodos se expanden por distancia desde inicial más la estimación de la
+    heurística hasta final. Si la heurística nunca sobreestima (es admisible),
+    el camino es mínimo; si además es consistente, cada nodo se fija una sola
+    vez. Sin heurística es un Dijkstra que para al llegar a final.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+        inicial (str): Nodo inicial
+        final (str): Nodo final
+        heuristica (Callable, optional): Función heuristica(nodo, final) con una
+            cota inferior de la distancia de nodo a final. Defaults to None.
+        estadisticas (dict, optional): Si se indica, se guarda en "fijados" el
+            número de nodos expandidos. Defaults to None.
+
+    Returns:
+        tuple: Distancia (inf si no hay camino) y camino (None si no hay camino).
+
+    Complexity:
+        O((n + m) log n) con heurística consistente
+    """
+    if heuristica is None:
+        heuristica = _heuristica_nula
+
+    distancias = {inicial: 0}
+    predecesores = {inicial: None}
+    # Entradas (estimación, distancia, contador, nodo): el contador desempata
+    # sin comparar nodos
+    cola = [(heuristica(inicial, final), 0, 0, inicial)]
+    contador = 1
+    expandidos = 0
+
+    while cola:
+        _, distancia_actual, _, nodo = heapq.heappop(cola)
+        if distancia_actual > distancias[nodo]:
+            continue  # Entrada obsoleta
+        expandidos += 1
+        if nodo == final:
+            break
+
+        for vecino, peso in grafo[nodo].items():
+            nueva_distancia = distancia_actual + peso
+            if nueva_distancia < distancias.get(vecino, float("inf")):
+                distancias[vecino] = nueva_distancia
+                predecesores[vecino] = nodo
+                heapq.heappush(cola, (nueva_distancia + heuristica(vecino, final), nueva_distancia, contador, vecino))
+                contador += 1
+
+    if estadisticas is not None:
+        estadisticas["fijados"] = expandidos
+
+    if final not in distancias:
+        return float("inf"), None
+    return distancias[final], _reconstruye_camino(predecesores, final)
+
+
+# Índice ALT (A*, landmarks y desigualdad triangular)
+# Para muchas consultas sobre el mismo grafo se precalculan las distancias desde
+# y hasta unos pocos nodos "landmark" L. Por la desigualdad triangular,
+# d(v, t) >= d(L, t) - d(L, v) y d(v, t) >= d(v, L) - d(t, L), lo que da una
+# heurística admisible y consistente para a_estrella.
+
+
+class IndiceALT:
+    """
+    Índice de landmarks para consultas punto a punto con A* (ALT).
+
+    Para cada landmark se guardan dos tablas de n reales (array 'd'): las
+    distancias desde el landmark a cada nodo y desde cada nodo al landmark.
+    """
+
+    MAGIA = b"ALT\x01"
+
+    def __init__(self, grafo: dict, k: int = 8, semilla: Optional[int] = None):
+        """Construye el índice eligiendo k landmarks: el primero al azar y cada
+        uno de los siguientes el más alejado de los ya elegidos.
+
+        Args:
+            grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+            k (int, optional): Número de landmarks. Defaults to 8.
+            semilla (int, optional): Semilla para elegir el primer landmark. Defaults to None.
+
+        Complexity:
+            O(k (n + m) log n)
+        """
+        self.grafo = grafo
+        csr = grafo if isinstance(grafo, GrafoCSR) else GrafoCSR.from_dict_of_dicts(grafo)
+        inverso = GrafoCSR.from_arcos(
+            ((destino, origen, peso) for origen, destino, peso in csr.arcos()), csr.nodos
+        )
+        self.nodos = csr.nodos
+        self.indice = csr.indice
+        self.landmarks: list = []
+        self.desde: list = []  # desde[l][v] = d(L, v)
+        self.hasta: list = []  # hasta[l][v] = d(v, L)
+
+        n = len(csr)
+        if n == 0:
+            return
+        generador = random.Random(semilla)
+        siguiente = generador.randrange(n)
+        # Distancia mínima de cada nodo a los landmarks ya elegidos
+        cercania = [float("inf")] * n
+        for _ in range(min(k, n)):
+            self.landmarks.append(self.nodos[siguiente])
+            desde = array("d", dijkstra_indices(csr, siguiente)[0])
+            self.desde.append(desde)
+            self.hasta.append(array("d", dijkstra_indices(inverso, siguiente)[0]))
+
+            for v in range(n):
+                if desde[v] < cercania[v]:
+                    cercania[v] = desde[v]
+            candidatos = [v for v in range(n) if 0 < cercania[v] < float("inf")]
+            if not candidatos:
+                # Todo lo alcanzable es ya landmark: se salta a otra zona del grafo
+                candidatos = [v for v in range(n) if cercania[v] == float("inf")]
+                if not candidatos:
+                    break
+                siguiente = generador.choice(candidatos)
+            else:
+                siguiente = max(candidatos, key=cercania.__getitem__)
+
+    def heuristica(self, nodo, final) -> float:
+        """Cota inferior de la distancia de nodo a final según los landmarks.
+
+        Args:
+            nodo: Nodo del grafo.
+            final: Nodo destino.
+
+        Returns:
+            float: Cota inferior (inf si se sabe que no hay camino).
+        """
+        INF = float("inf")
+        v = self.indice[nodo]
+        t = self.indice[final]
+        cota = 0
+        for desde, hasta in zip(self.desde, self.hasta):
+            # d(v, t) >= d(L, t) - d(L, v)
+            if desde[v] != INF:
+                if desde[t] == INF:
+                    return INF  # L llega a v pero no a t: v no llega a t
+                cota = max(cota, desde[t] - desde[v])
+            # d(v, t) >= d(v, L) - d(t, L)
+            if hasta[t] != INF:
+                if hasta[v] == INF:
+                    return INF  # t llega a L pero v no: v no llega a t
+                cota = max(cota, hasta[v] - hasta[t])
+        return cota
+
+    def consulta(self, inicial, final, estadisticas: Optional[dict] = None) -> tuple:
+        """Camino mínimo entre dos nodos con A* guiado por los landmarks.
+
+        Args:
+            inicial: Nodo inicial
+            final: Nodo final
+            estadisticas (dict, optional): Si se indica, se guarda en "fijados"
+                el número de nodos expandidos. Defaults to None.
+
+        Returns:
+            tuple: Distancia (inf si no hay camino) y camino (None si no hay camino).
+        """
+        return a_estrella(self.grafo, inicial, final, self.heuristica, estadisticas)
+
+    @staticmethod
+    def huella(grafo) -> str:
+        """Huella del grafo que se guarda con el índice (ver huella_arcos).
+
+        Args:
+            grafo: Grafo (diccionario de diccionarios o GrafoCSR)
+
+        Returns:
+            str: Huella en hexadecimal.
+        """
+        if isinstance(grafo, GrafoCSR):
+            return huella_arcos(grafo.arcos())
+        return huella_arcos(
+            (origen, destino, peso)
+            for origen, vecinos in grafo.items()
+            for destino, peso in vecinos.items()
+        )
+
+    def save(self, ruta: str):
+        """Guarda los landmarks y sus tablas de distancias junto con la huella
+        del grafo (no el grafo).
+
+        Args:
+            ruta (str): Fichero donde guardar.
+        """
+        cabecera = {
+            "nodos": a_json(list(self.nodos)),
+            "landmarks": a_json(self.landmarks),
+            "huella": self.huella(self.grafo),
+            "orden": sys.byteorder,
+        }
+        with open(ruta, "wb") as fichero:
+            escribe_cabecera(fichero, self.MAGIA, cabecera)
+            for tabla in self.desde + self.hasta:
+                fichero.write(tabla.tobytes())
+
+    @classmethod
+    def load(cls, ruta: str, grafo: dict) -> "IndiceALT":
+        """Carga un índice guardado con `save` para el grafo indicado.
+        Las tablas solo valen para el grafo con el que se calcularon: si la
+        huella del grafo no coincide con la guardada (ha cambiado algún arco o
+        algún peso) el índice no se carga.
+
+        Args:
+            ruta (str): Fichero guardado con `save`.
+            grafo (dict): Grafo con el que se construyó el índice.
+
+        Raises:
+            ValueError: El fichero no es un índice ALT o es de otro grafo.
+
+        Returns:
+            IndiceALT: Índice listo para consultas.
+        """
+        with open(ruta, "rb") as fichero:
+            cabecera = lee_cabecera(fichero, cls.MAGIA)
+            try:
+                nodos = tuple(de_json(cabecera["nodos"]))
+                landmarks = de_json(cabecera["landmarks"])
+                huella = cabecera["huella"]
+                orden = cabecera["orden"]
+            except (KeyError, TypeError) as error:
+                raise ValueError(f"{ruta} no es un índice ALT") from error
+            n = len(nodos)
+            tablas = []
+            for _ in range(2 * len(landmarks)):
+                tabla = array("d")
+                datos = fichero.read(8 * n)
+                if len(datos) != 8 * n:
+                    raise ValueError(f"{ruta} no es un índice ALT")
+                tabla.frombytes(datos)
+                if orden != sys.byteorder:
+                    tabla.byteswap()
+                tablas.append(tabla)
+
+        if huella != cls.huella(grafo):
+            raise ValueError("El índice se calculó para otro grafo")
+
+        indice = cls.__new__(cls)
+        indice.grafo = grafo
+        indice.nodos = nodos
+        indice.indice = {nodo: i for i, nodo in enumerate(nodos)}
+        indice.landmarks = landmarks
+        k = len(landmarks)
+        indice.desde = tablas[:k]
+        indice.hasta = tablas[k:]
+        return indice
+
+
+def comparar_nodos_fijados(
+    grafo: dict, indice: IndiceALT, consultas: int = 100, semilla: int = 1
+) -> dict:
+    """Compara, para consultas aleatorias, los nodos fijados por Dijkstra
+    completo, Dijkstra con parada en el destino (A* sin heurística), Dijkstra
+    bidireccional y A* con el índice ALT. Imprime la media de cada uno.
+
+    Args:
+        grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+        indice (IndiceALT): Índice construido sobre el grafo.
+        consultas (int, optional): Número de pares origen-destino. Defaults to 100.
+        semilla (int, optional): Semilla de los pares. Defaults to 1.
+
+    Returns:
+        dict: Media de nodos fijados por cada método.
+    """
+    generador = random.Random(semilla)
+    nodos = list(grafo)
+    inverso = grafo_inverso(grafo)
+    totales = {"dijkstra": 0, "dijkstra_objetivo": 0, "bidireccional": 0, "alt": 0}
+
+    for _ in range(consultas):
+        origen, destino = generador.choice(nodos), generador.choice(nodos)
+        # Dijkstra completo fija todos los nodos alcanzables
+        completo = dijkstra(grafo, origen)
+        totales["dijkstra"] += sum(1 for _, d in completo.values() if d != float("inf"))
+
+        for nombre, busqueda in (
+            ("dijkstra_objetivo", lambda e: a_estrella(grafo, origen, destino, estadisticas=e)),
+            ("bidireccional", lambda e: dijkstra_bidireccional(grafo, origen, destino, inverso, e)),
+            ("alt", lambda e: indice.consulta(origen, destino, e)),
+        ):
+            estadisticas: dict = {}
+            distancia, _ = busqueda(estadisticas)
+            if distancia != completo[destino][1]:
+                raise Exception(f"{nombre} no da la distancia mínima de {origen} a {destino}")
+            totales[nombre] += estadisticas["fijados"]
+
+    medias = {nombre: total / consultas for nombre, total in totales.items()}
+    print(f"{'Método':<20}{'Nodos fijados (media)':<25}")
+    print("-" * 45)
+    for nombre, media in medias.items():
+        print(f"{nombre:<20}{media:<25.1f}")
+    return medias
+
+
+# Jerarquías de contracción
+# Se "contraen" los nodos uno a uno en un orden de importancia. Al contraer v,
+# para cada par de vecinos u -> v -> x sin otro camino igual de corto que no pase
+# por v (testigo), se añade un atajo u -> x. Las consultas solo suben en la
+# jerarquía: búsqueda hacia delante desde el origen por arcos hacia nodos más
+# importantes y hacia atrás desde el destino también hacia nodos más importantes.
+
+
+class JerarquiaContraccion:
+    """
+    Jerarquía de contracción sobre un grafo dirigido y pesado (pesos no
+    negativos) para consultas punto a punto muy rápidas.
+
+    Atributos principales:
+        rango: posición de cada nodo en el orden de contracción.
+        subida: subida[u] = {x: peso} con los arcos (originales o atajos) de u a
+            nodos de mayor rango.
+        bajada: bajada[x] = {u: peso} con los arcos u -> x desde nodos de mayor
+            rango (la búsqueda hacia atrás los recorre al revés).
+        intermedios: intermedios[(u, x)] = v si el arco u -> x es un atajo por v.
+    """
+
+    MAGIA = b"CH\x01"
+
+    def __init__(self, grafo: dict, limite_testigo: int = 64):
+        """Preprocesa el grafo: calcula el orden de contracción (diferencia de
+        arcos con actualización perezosa) y añade los atajos necesarios.
+
+        Args:
+            grafo (dict): Grafo (diccionario de diccionarios o GrafoCSR)
+            limite_testigo (int, optional): Máximo de nodos que fija cada
+                búsqueda de testigos. Un límite bajo preprocesa más rápido a
+                costa de añadir algún atajo innecesario (nunca incorrecto).
+                Defaults to 64.
+        """
+        self.limite_testigo = limite_testigo
+        self.rango: dict = {}
+        self.subida: dict = {nodo: {} for nodo in grafo}
+        self.bajada: dict = {nodo: {} for nodo in grafo}
+        self.intermedios: dict = {}
+
+        # Grafo restante (nodos sin contraer), con arcos de salida y de entrada
+        salida: dict = {nodo: {} for nodo in grafo}
+        entrada: dict = {nodo: {} for nodo in grafo}
+        for origen in grafo:
+            for destino, peso in grafo[origen].items():
+                if origen != destino and peso < salida[origen].get(destino, float("inf")):
+                    salida[origen][destino] = peso
+                    entrada[destino][origen] = peso
+
+        vecinos_contraidos = {nodo: 0 for nodo in grafo}
+        orden = {nodo: i for i, nodo in enumerate(grafo)}  # Desempate sin comparar nodos
+        cola = [
+            (self._prioridad(nodo, salida, entrada, vecinos_contraidos), orden[nodo], nodo)
+            for nodo in grafo
+        ]
+        heapq.heapify(cola)
+
+        while cola:
+            _, posicion, nodo = heapq.heappop(cola)
+            # Actualización perezosa: si ha empeorado, se vuelve a meter
+            prioridad = self._prioridad(nodo, salida, entrada, vecinos_contraidos)
+            if cola and prioridad > cola[0][0]:
+                heapq.heappush(cola, (prioridad, posicion, nodo))
+                continue
+            self._contrae(nodo, salida, entrada, vecinos_contraidos)
+
+    def _atajos(self, nodo, salida: dict, entrada: dict) -> list:
+        """Atajos (u, x, peso) necesarios al contraer nodo en el grafo restante."""
+        atajos = []
+        for u, peso_entrada in entrada[nodo].items():
+            objetivos = {
+                x: peso_entrada + peso_salida
+                for x, peso_salida in salida[nodo].items()
+                if x != u
+            }
+            if not objetivos:
+                continue
+            testigos = self._busca_testigos(u, nodo, objetivos, salida)
+            for x, peso in objetivos.items():
+                if testigos.get(x, float("inf")) > peso:
+                    atajos.append((u, x, peso))
+        return atajos
+
+    def _busca_testigos(self, inicial, evitado, objetivos: dict, salida: dict) -> dict:
+        """Dijkstra limitado desde inicial en el grafo restante sin pasar por
+        evitado. Para al superar la mayor distancia de interés o el límite de
+        nodos fijados.
+
+        Returns:
+            dict: Distancias encontradas (cotas superiores de las reales).
+        """
+        maximo = max(objetivos.values())
+        distancias = {inicial: 0}
+        fijados = set()
+        cola = [(0, 0, inicial)]
+        contador = 1  # Desempate en la cola sin comparar nodos
+        while cola and len(fijados) < self.limite_testigo:
+            distancia, _, nodo = heapq.heappop(cola)
+            if nodo in fijados:
+                continue
+            if distancia > maximo:
+                break
+            fijados.add(nodo)
+            for vecino, peso in salida[nodo].items():
+                if vecino == evitado:
+                    continue
+                nueva = distancia + peso
+                if nueva < distancias.get(vecino, float("inf")):
+                    distancias[vecino] = nueva
+                    heapq.heappush(cola, (nueva, contador, vecino))
+                    contador += 1
+        return distancias
+
+    def _prioridad(self, nodo, salida: dict, entrada: dict, vecinos_contraidos: dict) -> int:
+        """Diferencia de arcos: atajos que añadiría menos arcos que elimina, más
+        el número de vecinos ya contraídos (para repartir la contracción).
+        """
+        return (
+            len(self._atajos(nodo, salida, entrada))
+            - len(salida[nodo])
+            - len(entrada[nodo])
+            + vecinos_contraidos[nodo]
+        )
+
+    def _contrae(self, nodo, salida: dict, entrada: dict, vecinos_contraidos: dict):
+        """Contrae el nodo: sus arcos con el grafo restante pasan a la jerarquía,
+        se quita del grafo restante y se añaden los atajos.
+        """
+        self.rango[nodo] = len(self.rango)
+        self.subida[nodo] = dict(salida[nodo])
+        self.bajada[nodo] = dict(entrada[nodo])
+        atajos = self._atajos(nodo, salida, entrada)
+
+        for x in salida[nodo]:
+            del entrada[x][nodo]
+            vecinos_contraidos[x] += 1
+        for u in entrada[nodo]:
+            del salida[u][nodo]
+            vecinos_contraidos[u] += 1
+        salida[nodo] = {}
+        entrada[nodo] = {}
+
+        for u, x, peso in atajos:
+            if peso < salida[u].get(x, float("inf")):
+                salida[u][x] = peso
+                entrada[x][u] = peso
+                self.intermedios[u, x] = nodo
+
+    def consulta(self, inicial, final, estadisticas: Optional[dict] = None) -> tuple:
+        """Camino mínimo entre dos nodos con la búsqueda bidireccional hacia
+        arriba. El camino se devuelve desempaquetado (sin atajos), con el mismo
+        formato que obten_camino_minimo.
+
+        Args:
+            inicial: Nodo inicial
+            final: Nodo final
+            estadisticas (dict, optional): Si se indica, se guarda en "fijados"
+                el número de nodos fijados por las dos búsquedas. Defaults to None.
+
+        Returns:
+            tuple: Distancia (inf si no hay camino) y camino (None si no hay camino).
+        """
+        grafos = (self.subida, self.bajada)
+        distancias: tuple = ({inicial: 0}, {final: 0})
+        predecesores: tuple = ({inicial: None}, {final: None})
+        fijados: tuple = (set(), set())
+        colas: tuple = ([(0, 0, inicial)], [(0, 0, final)])
+        contador = 1
+
+        mejor = float("inf")
+        encuentro = None
+        while True:
+            # Solo siguen las búsquedas que aún pueden mejorar el resultado
+            activos = [lado for lado in (0, 1) if colas[lado] and colas[lado][0][0] < mejor]
+            if not activos:
+                break
+            lado = min(activos, key=lambda l: colas[l][0][0])
+            distancia, _, nodo = heapq.heappop(colas[lado])
+            if nodo in fijados[lado]:
+                continue
+            fijados[lado].add(nodo)
+
+            otra = distancias[1 - lado].get(nodo)
+            if otra is not None and distancia + otra < mejor:
+                mejor = distancia + otra
+                encuentro = nodo
+
+            for vecino, peso in grafos[lado][nodo].items():
+                nueva = distancia + peso
+                if nueva < distancias[lado].get(vecino, float("inf")):
+                    distancias[lado][vecino] = nueva
+                    predecesores[lado][vecino] = nodo
+                    heapq.heappush(colas[lado], (nueva, contador, vecino))
+                    contador += 1
+
+        if estadisticas is not None:
+            estadisticas["fijados"] = len(fijados[0]) + len(fijados[1])
+
+        if encuentro is None:
+            return float("inf"), None
+
+        # Camino en la jerarquía: inicial ... encuentro ... final
+        camino = _reconstruye_camino(predecesores[0], encuentro)
+        nodo = predecesores[1][encuentro]
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = predecesores[1][nodo]
+        return mejor, self._desempaqueta(camino)
+
+    def _desempaqueta(self, camino: list) -> list:
+        """Sustituye cada atajo del camino por los arcos originales."""
+        completo = [camino[0]]
+        for origen, destino in zip(camino, camino[1:]):
+            pila = [(origen, destino)]
+            while pila:
+                u, x = pila.pop()
+                intermedio = self.intermedios.get((u, x))
+                if intermedio is None:
+                    completo.append(x)
+                else:
+                    # Primero u -> intermedio, después intermedio -> x
+                    pila.append((intermedio, x))
+                    pila.append((u, intermedio))
+        return completo
+
+    def numero_atajos(self) -> int:
+        """Devuelve el número de atajos añadidos."""
+        return len(self.intermedios)
+
+    def save(self, ruta: str):
+        """Guarda la jerarquía (orden de nodos, arcos hacia arriba y atajos).
+
+        Args:
+            ruta (str): Fichero donde guardar.
+        """
+        # Los nodos pueden ser tuplas, que no valen como claves de JSON: los
+        # diccionarios se guardan como listas de arcos
+        cabecera = {
+            "orden": a_json(sorted(self.rango, key=self.rango.__getitem__)),
+            "subida": [
+                [a_json(u), a_json(x), peso]
+                for u, vecinos in self.subida.items()
+                for x, peso in vecinos.items()
+            ],
+            "bajada": [
+                [a_json(x), a_json(u), peso]
+                for x, vecinos in self.bajada.items()
+                for u, peso in vecinos.items()
+            ],
+            "intermedios": [
+                [a_json(u), a_json(x), a_json(v)] for (u, x), v in self.intermedios.items()
+            ],
+            "limite_testigo": self.limite_testigo,
+        }
+        with open(ruta, "wb") as fichero:
+            escribe_cabecera(fichero, self.MAGIA, cabecera)
+
+    @classmethod
+    def load(cls, ruta: str) -> "JerarquiaContraccion":
+        """Carga una jerarquía guardada con `save`.
+
+        Args:
+            ruta (str): Fichero guardado con `save`.
+
+        Raises:
+            ValueError: El fichero no es una jerarquía de contracción.
+
+        Returns:
+            JerarquiaContraccion: Jerarquía lista para consultas.
+        """
+        with open(ruta, "rb") as fichero:
+            datos = lee_cabecera(fichero, cls.MAGIA)
+
+        jerarquia = cls.__new__(cls)
+        try:
+            orden = de_json(datos["orden"])
+            jerarquia.limite_testigo = int(datos["limite_testigo"])
+            jerarquia.rango = {nodo: i for i, nodo in enumerate(orden)}
+            jerarquia.subida = {nodo: {} for nodo in orden}
+            jerarquia.bajada = {nodo: {} for nodo in orden}
+            for u, x, peso in datos["subida"]:
+                jerarquia.subida[de_json(u)][de_json(x)] = peso
+            for x, u, peso in datos["bajada"]:
+                jerarquia.bajada[de_json(x)][de_json(u)] = peso
+            jerarquia.intermedios = {
+                (de_json(u), de_json(x)): de_json(v) for u, x, v in datos["intermedios"]
+            }
+        except (KeyError, TypeError, ValueError) as error:
+            raise ValueError(f"{ruta} no es una jerarquía de contracción") from error
+        return jerarquia
+
+
+# Carga masiva de grafos desde ficheros de arcos
+# Los ficheros se leen por bloques (opcionalmente con mmap) y los arcos se van
+# generando sin guardar el fichero entero en memoria. Los grafos se construyen
+# directamente, sin pasar por inserta_arco arco a arco.
+
+FORMATOS_ARCOS = ("csv", "tsv", "binario")
+
+
+class ContadorProgreso:
+    """
+    Contador de progreso para `lee_arcos` y `carga_grafo`: recibe tras cada
+    bloque el total de arcos y bytes leídos y escribe el ritmo de carga cada
+    `intervalo` segundos (si hay salida).
+    """
+
+    def __init__(self, intervalo: float = 1.0, salida=None):
+        """
+        Args:
+            intervalo (float, optional): Segundos entre mensajes. Defaults to 1.0.
+            salida (optional): Fichero donde escribir (por ejemplo sys.stderr).
+                Si es None solo se acumulan los datos. Defaults to None.
+        """
+        self.intervalo = intervalo
+        self.salida = salida
+        self.arcos = 0
+        self.bytes = 0
+        self.inicio = time.perf_counter()
+        self.ultimo = self.inicio
+
+    def __call__(self, arcos: int, bytes_leidos: int):
+        self.arcos = arcos
+        self.bytes = bytes_leidos
+        ahora = time.perf_counter()
+        if self.salida is not None and ahora - self.ultimo >= self.intervalo:
+            self.ultimo = ahora
+            print(
+                f"{self.arcos} arcos, {self.bytes / 2**20:.1f} MiB, "
+                f"{self.arcos_por_segundo():.0f} arcos/s",
+                file=self.salida,
+            )
+
+    def segundos(self) -> float:
+        """Segundos transcurridos desde que se creó el contador."""
+        return time.perf_counter() - self.inicio
+
+    def arcos_por_segundo(self) -> float:
+        """Ritmo medio de carga en arcos por segundo."""
+        segundos = self.segundos()
+        return self.arcos / segundos if segundos > 0 else 0.0
+
+
+def _bloques_fichero(fichero, tamano_bloque: int, memoria_mapeada: bool) -> Iterator[bytes]:
+    """Genera el contenido del fichero en bloques de tamano_bloque bytes."""
+    if memoria_mapeada and os.fstat(fichero.fileno()).st_size > 0:
+        with mmap.mmap(fichero.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for inicio in range(0, len(mapa), tamano_bloque):
+                yield mapa[inicio:inicio + tamano_bloque]
+    else:
+        while True:
+            bloque = fichero.read(tamano_bloque)
+            if not bloque:
+                return
+            yield bloque
+
+
+def lee_arcos(
+    ruta: str,
+    formato: Optional[str] = None,
+    tipo_nodo: Callable = str,
+    tipo_peso: Callable = int,
+    cabecera: bool = False,
+    formato_binario: str = "<qqq",
+    tamano_bloque: int = 1 << 20,
+    memoria_mapeada: bool = False,
+    progreso: Optional[Callable] = None,
+) -> Iterator[tuple]:
+    """Lee un fichero de arcos por bloques y genera los arcos (origen, destino, peso).
+
+    Formatos:
+        csv / tsv: una línea por arco "origen,destino[,peso]" (o separado por
+            tabuladores). Sin peso se toma 1. Se ignoran las líneas vacías y las
+            que empiezan por "#".
+        binario: registros de tamaño fijo con `formato_binario` (por defecto tres
+            enteros de 64 bits little-endian: origen, destino y peso).
+
+    Args:
+        ruta (str): Fichero de arcos.
+        formato (str, optional): "csv", "tsv" o "binario". Si es None se deduce de
+            la extensión (.csv, .tsv, .bin). Defaults to None.
+        tipo_nodo (Callable, optional): Conversión de los nodos de texto. Defaults to str.
+        tipo_peso (Callable, optional): Conversión de los pesos de texto. Defaults to int.
+        cabecera (bool, optional): Si la primera línea es una cabecera. Defaults to False.
+        formato_binario (str, optional): Formato struct de cada registro binario.
+            Defaults to "<qqq".
+        tamano_bloque (int, optional): Bytes leídos en cada bloque. Defaults to 1 MiB.
+        memoria_mapeada (bool, optional): Leer el fichero con mmap. Defaults to False.
+        progreso (Callable, optional): Función progreso(arcos, bytes) llamada tras
+            cada bloque, por ejemplo un ContadorProgreso. Defaults to None.
+
+    Raises:
+        ValueError: Formato desconocido, o un fichero binario con un registro incompleto.
+
+    Yields:
+        tuple: Arcos (origen, destino, peso).
+    """
+    if formato is None:
+        extension = os.path.splitext(ruta)[1].lower()
+        formato = {".csv": "csv", ".tsv": "tsv", ".bin": "binario"}.get(extension)
+    if formato not in FORMATOS_ARCOS:
+        raise ValueError(f"Formato de arcos desconocido: {formato}. Opciones: {FORMATOS_ARCOS}")
+
+    arcos = 0
+    bytes_leidos = 0
+    with open(ruta, "rb") as fichero:
+        if formato == "binario":
+            registro = struct.Struct(formato_binario)
+            # Bloques con un número entero de registros
+            tamano_bloque = max(1, tamano_bloque // registro.size) * registro.size
+            resto = b""
+            for bloque in _bloques_fichero(fichero, tamano_bloque, memoria_mapeada):
+                bytes_leidos += len(bloque)
+                if resto:
+                    bloque = resto + bloque
+                completo = len(bloque) - len(bloque) % registro.size
+                resto = bloque[completo:]
+                for arco_leido in registro.iter_unpack(memoryview(bloque)[:completo]):
+                    yield arco_leido
+                arcos += completo // registro.size
+                if progreso is not None:
+                    progreso(arcos, bytes_leidos)
+            if resto:
+                raise ValueError(f"{ruta} termina con un registro incompleto")
+            return
+
+        separador = "," if formato == "csv" else "\t"
+        resto = b""
+        saltar_cabecera = cabecera
+        for bloque in _bloques_fichero(fichero, tamano_bloque, memoria_mapeada):
+            bytes_leidos += len(bloque)
+            lineas = (resto + bloque).split(b"\n")
+            resto = lineas.pop()  # Línea posiblemente incompleta
+            if saltar_cabecera and lineas:
+                del lineas[0]
+                saltar_cabecera = False
+            for linea in lineas:
+                arco_leido = _arco_de_linea(linea, separador, tipo_nodo, tipo_peso)
+                if arco_leido is not None:
+                    arcos += 1
+                    yield arco_leido
+            if progreso is not None:
+                progreso(arcos, bytes_leidos)
+        if resto and not saltar_cabecera:
+            arco_leido = _arco_de_linea(resto, separador, tipo_nodo, tipo_peso)
+            if arco_leido is not None:
+                arcos += 1
+                yield arco_leido
+                if progreso is not None:
+                    progreso(arcos, bytes_leidos)
+
+
+def _arco_de_linea(linea: bytes, separador: str, tipo_nodo: Callable, tipo_peso: Callable) -> Optional[tuple]:
+    """Convierte una línea de texto en un arco, o None si está vacía o es un comentario."""
+    texto = linea.decode().strip()
+    if not texto or texto.startswith("#"):
+        return None
+    partes = texto.split(separador)
+    peso = tipo_peso(partes[2]) if len(partes) > 2 else 1
+    return tipo_nodo(partes[0].strip()), tipo_nodo(partes[1].strip()), peso
+
+
+def carga_grafo(
+    ruta: str,
+    destino: str = "dict",
+    simetrico: bool = False,
+    **opciones,
+):
+    """Carga un grafo completo desde un fichero de arcos leído por bloques.
+
+    Args:
+        ruta (str): Fichero de arcos (ver `lee_arcos`).
+        destino (str, optional): Representación del resultado:
+            "dict": diccionario de diccionarios (esta práctica).
+            "grafo": Grafo con índice inverso y estadísticas.
+            "arcos": diccionario de arcos {(origen, destino): peso} (práctica 5).
+            "csr": GrafoCSR (arrays de enteros, lo más compacto).
+            Defaults to "dict".
+        simetrico (bool, optional): Añadir también cada arco en sentido contrario
+            (no se aplica a "arcos", que ya representa grafos no dirigidos).
+            Defaults to False.
+        **opciones: Opciones de `lee_arcos` (formato, tipo_nodo, tipo_peso,
+            cabecera, formato_binario, tamano_bloque, memoria_mapeada, progreso).
+
+    Raises:
+        ValueError: Destino o formato desconocido.
+
+    Returns:
+        Grafo en la representación pedida. Si un arco se repite, en "dict",
+        "grafo" y "arcos" se queda el último peso; en "csr" se guardan todos.
+
+    Complexity:
+        O(n + m)
+    """
+    destinos = ("dict", "grafo", "arcos", "csr")
+    if destino not in destinos:
+        raise ValueError(f"Destino desconocido: {destino}. Opciones: {destinos}")
+
+    arcos = lee_arcos(ruta, **opciones)
+    if destino == "arcos":
+        return {(origen, final): peso for origen, final, peso in arcos}
+
+    if simetrico:
+        arcos = (
+            arco_leido
+            for origen, final, peso in arcos
+            for arco_leido in ((origen, final, peso), (final, origen, peso))
+        )
+    if destino == "csr":
+        return GrafoCSR.from_arcos(arcos)
+    if destino == "grafo":
+        return _carga_grafo_indexado(arcos)
+
+    grafo: dict = {}
+    for origen, final, peso in arcos:
+        vecinos = grafo.get(origen)
+        if vecinos is None:
+            vecinos = grafo[origen] = {}
+        vecinos[final] = peso
+        if final not in grafo:
+            grafo[final] = {}
+    return grafo
+
+
+def _carga_grafo_indexado(arcos: Iterable[tuple]) -> Grafo:
+    """Construye un Grafo a partir de los arcos leídos. Se rellenan a la vez
+    la adyacencia, el índice inverso y los contadores, sin pasar por un
+    diccionario intermedio ni llamar a inserta_arco por cada arco.
+
+    Args:
+        arcos (Iterable[tuple]): Arcos (origen, destino, peso).
+
+    Returns:
+        Grafo: Grafo con índice inverso. Si un arco se repite se queda el último peso.
+
+    Complexity:
+        O(n + m)
+    """
+    grafo = Grafo()
+    entrada = grafo.entrada
+    numero_arcos = 0
+    peso_total = 0
+    for origen, final, peso in arcos:
+        vecinos = grafo.get(origen)
+        if vecinos is None:
+            vecinos = grafo[origen] = {}
+            entrada[origen] = {}
+        anterior = vecinos.get(final)
+        if anterior is None:
+            numero_arcos += 1
+        else:
+            peso_total -= anterior
+        peso_total += peso
+        vecinos[final] = peso
+        origenes = entrada.get(final)
+        if origenes is None:
+            grafo[final] = {}
+            origenes = entrada[final] = {}
+        origenes[origen] = peso
+    grafo._numero_arcos = numero_arcos
+    grafo._peso_total = peso_total
+    return grafo
@@ -1,7 +1,29 @@
+import itertools
+import json
+import math
+import os
+import pickle
+import platform
+import statistics
+import sys
+import tempfile
 import time
+import tracemalloc
 import random
 import heapq
-from typing import Iterable, Optional
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+try:
+    from src.alg_s4 import GrafoCSR, MonticuloIndexado, lee_arcos
+except ImportError:  # Ejecutado como script (python src/alg_s5.py): src no es un paquete
+    from alg_s4 import GrafoCSR, MonticuloIndexado, lee_arcos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo usa la versión vectorizada de ParticionEnteros
+    np = None
 
 # # Algoritmia
 # ## Práctica 5
@@ -41,21 +63,73 @@ disjuntos_ejemplo = """
 # particion.une(2, 3) # 3
 
 
+# Estrategias de búsqueda de la raíz (iterativas). Funcionan igual con padres
+# en un diccionario (Particion) o en un array (ParticionEnteros).
+
+
+def _raiz_completa(padres, k):
+    """Compresión completa: todos los nodos del camino pasan a apuntar a la raíz."""
+    raiz = k
+    while padres[raiz] != raiz:
+        raiz = padres[raiz]
+    while padres[k] != raiz:
+        padres[k], k = raiz, padres[k]
+    return raiz
+
+
+def _raiz_mitad(padres, k):
+    """Reducción a la mitad: uno de cada dos nodos del camino apunta a su abuelo."""
+    while padres[k] != k:
+        padres[k] = padres[padres[k]]
+        k = padres[k]
+    return k
+
+
+def _raiz_division(padres, k):
+    """División: cada nodo del camino pasa a apuntar a su abuelo."""
+    while padres[k] != k:
+        siguiente = padres[k]
+        padres[k] = padres[siguiente]
+        k = siguiente
+    return k
+
+
+COMPRESIONES = {
+    "completa": _raiz_completa,
+    "mitad": _raiz_mitad,
+    "division": _raiz_division,
+}
+
+
+def _estrategia_compresion(compresion: str):
+    """Función de búsqueda de la raíz para la estrategia indicada."""
+    if compresion not in COMPRESIONES:
+        raise ValueError(f"Compresión desconocida: {compresion}. Opciones: {tuple(COMPRESIONES)}")
+    return COMPRESIONES[compresion]
+
+
 class Particion:
     """
     Clase que implementa una partición de un conjunto en subconjuntos disjuntos.
     Una partición se corresponde con una estructura Unión-Pertenencia.
     """
 
-    def __init__(self, iterable: Iterable):
+    def __init__(self, iterable: Iterable, compresion: str = "completa"):
         """Crea una partición con los elementos del iterable.
         Inicialmente cada elemento forma un subconjunto.
 
         Args:
             iterable (iter): Elementos iniciales.
+            compresion (str, optional): Estrategia de compresión de caminos al
+                buscar: "completa", "mitad" (reducción a la mitad) o "division".
+                Defaults to "completa".
+
+        Raises:
+            ValueError: Estrategia de compresión desconocida.
         """
+        self._raiz = _estrategia_compresion(compresion)
         self.padres = {x: x for x in iterable}  # Cada elemento es su propio padre
-        self.tamanos = {x: 1 for x in iterable}  # Tamaño de cada subconjunto
+        self.tamanos = dict.fromkeys(self.padres, 1)  # Tamaño de cada subconjunto
         self.num_conjuntos = len(self.padres)
         self.total_elementos = len(self.padres)
 
@@ -103,9 +177,7 @@ class Particion:
         Returns:
             int: Elemento representante del subconjunto.
         """
-        if self.padres[k] != k:
-            self.padres[k] = self.__getitem__(self.padres[k])
-        return self.padres[k]
+        return self._raiz(self.padres, k)
 
     def __iter__(self) -> Iterable:
         """Devuelve un iterador sobre los subconjuntos.
@@ -147,6 +219,52 @@ class Particion:
 
         self.num_conjuntos -= 1
 
+    def une_muchos(self, pares: Iterable):
+        """Une los subconjuntos de cada par (a, b). Equivale a llamar a `une` con
+        cada par, pero con la búsqueda y la unión en un único bucle, sin pasar
+        por los métodos en cada par.
+
+        Args:
+            pares (Iterable): Pares de elementos (también un array de NumPy de
+                forma (m, 2)).
+        """
+        if np is not None and isinstance(pares, np.ndarray):
+            pares = pares.tolist()
+        raiz, padres, tamanos = self._raiz, self.padres, self.tamanos
+        uniones = 0
+        for a, b in pares:
+            raiz_a = a if padres[a] == a else raiz(padres, a)
+            raiz_b = b if padres[b] == b else raiz(padres, b)
+            if raiz_a == raiz_b:
+                continue
+            if tamanos[raiz_a] < tamanos[raiz_b]:
+                raiz_a, raiz_b = raiz_b, raiz_a
+            padres[raiz_b] = raiz_a
+            tamanos[raiz_a] += tamanos[raiz_b]
+            uniones += 1
+        self.num_conjuntos -= uniones
+
+    def componentes(self) -> tuple:
+        """Etiqueta cada elemento con su componente en una sola pasada.
+        Las etiquetas son 0, 1, ... en el orden en que aparecen las componentes.
+
+        Returns:
+            tuple: Diccionario {elemento: etiqueta} y lista con el tamaño de
+                cada componente.
+        """
+        raiz, padres = self._raiz, self.padres
+        etiqueta_raiz: dict = {}
+        etiquetas = {}
+        tamanos = []
+        for elemento in padres:
+            r = raiz(padres, elemento)
+            etiqueta = etiqueta_raiz.get(r)
+            if etiqueta is None:
+                etiqueta = etiqueta_raiz[r] = len(tamanos)
+                tamanos.append(self.tamanos[r])
+            etiquetas[elemento] = etiqueta
+        return etiquetas, tamanos
+
     def une_profesor(self, a: int, b: int):
         """Une los subconjuntos a los que pertencen a y b.
 
@@ -169,26 +287,296 @@ class Particion:
             self.clase[a] = b
 
 
+class ParticionEnteros:
+    """
+    Partición de los enteros 0..n-1 con la misma interfaz que Particion, pero
+    guardando padres y tamaños en arrays de enteros de 32 bits ('i') en lugar de
+    diccionarios: 8 bytes por elemento y sin hash en cada búsqueda.
+    """
+
+    def __init__(self, n, compresion: str = "completa"):
+        """Crea la partición de 0..n-1 con cada elemento en su propio subconjunto.
+
+        Args:
+            n (int o range): Número de elementos, o range(n).
+            compresion (str, optional): Estrategia de compresión de caminos, como
+                en Particion. Defaults to "completa".
+
+        Raises:
+            ValueError: Un range que no empieza en 0 o no tiene paso 1, o una
+                estrategia de compresión desconocida.
+
+        Complexity:
+            O(n)
+        """
+        if isinstance(n, range):
+            if n.start != 0 or n.step != 1:
+                raise ValueError("ParticionEnteros solo admite range(n)")
+            n = len(n)
+        self._raiz = _estrategia_compresion(compresion)
+        self.padres = array("i", range(n))  # Cada elemento es su propio padre
+        self.tamanos = array("i", [1]) * n  # Tamaño de cada subconjunto (válido en las raíces)
+        self.num_conjuntos = n
+        self.total_elementos = n
+
+    def __len__(self):
+        """Devuelve el número de subconjuntos en la partición."""
+        return self.num_conjuntos
+
+    def numero(self, k: Optional[int] = None) -> int:
+        """Devuelve el número de elementos del subconjunto al que pertenece el
+        elemento k. Si k es None devuelve el número de elementos.
+        """
+        if k is None:
+            return self.total_elementos
+        return self.tamanos[self[k]]
+
+    def __getitem__(self, k: int) -> int:
+        """Devuelve el representante del subconjunto al que pertenece el elemento k.
+
+        Raises:
+            KeyError: k no está en 0..n-1.
+        """
+        if not 0 <= k < self.total_elementos:
+            raise KeyError(k)
+        return self._raiz(self.padres, k)
+
+    def __iter__(self) -> Iterable:
+        """Devuelve un iterador sobre los representantes de los subconjuntos."""
+        padres = self.padres
+        for elemento in range(self.total_elementos):
+            if padres[elemento] == elemento:
+                yield elemento
+
+    def une(self, a: int, b: int):
+        """Une los subconjuntos a los que pertencen a y b (unión por tamaño)."""
+        raiz_a = self[a]
+        raiz_b = self[b]
+
+        if raiz_a == raiz_b:
+            return
+
+        tamanos = self.tamanos
+        if tamanos[raiz_a] < tamanos[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padres[raiz_b] = raiz_a
+        tamanos[raiz_a] += tamanos[raiz_b]
+        self.num_conjuntos -= 1
+
+    def une_muchos(self, pares: Iterable):
+        """Une los subconjuntos de cada par (a, b), como `une` con cada par pero
+        en un único bucle. Si pares es un array de NumPy de forma (m, 2) se
+        usa una versión vectorizada (ver `_une_muchos_numpy`).
+
+        Args:
+            pares (Iterable): Pares de elementos de 0..n-1.
+
+        Raises:
+            KeyError: Algún elemento no está en 0..n-1.
+        """
+        if np is not None and isinstance(pares, np.ndarray):
+            self._une_muchos_numpy(pares)
+            return
+        raiz, padres, tamanos, n = self._raiz, self.padres, self.tamanos, self.total_elementos
+        uniones = 0
+        for a, b in pares:
+            if not (0 <= a < n and 0 <= b < n):
+                raise KeyError((a, b))
+            raiz_a = a if padres[a] == a else raiz(padres, a)
+            raiz_b = b if padres[b] == b else raiz(padres, b)
+            if raiz_a == raiz_b:
+                continue
+            if tamanos[raiz_a] < tamanos[raiz_b]:
+                raiz_a, raiz_b = raiz_b, raiz_a
+            padres[raiz_b] = raiz_a
+            tamanos[raiz_a] += tamanos[raiz_b]
+            uniones += 1
+        self.num_conjuntos -= uniones
+
+    def _raices_numpy(self):
+        """Raíz de cada elemento como array de NumPy (saltos de punteros)."""
+        raices = np.frombuffer(self.padres, dtype=np.intc).astype(np.intp)
+        while True:
+            siguientes = raices[raices]
+            if np.array_equal(siguientes, raices):
+                return raices
+            raices = siguientes
+
+    def _une_muchos_numpy(self, pares):
+        """Versión vectorizada de une_muchos: en cada ronda cada par cuelga la
+        mayor de sus dos raíces de la menor y después se comprimen todos los
+        caminos con saltos de punteros, hasta que todos los pares comparten raíz.
+        El bosque resultante tiene profundidad 1 y cada raíz es el menor
+        elemento de su subconjunto.
+        """
+        pares = np.asarray(pares, dtype=np.intp).reshape(-1, 2)
+        n = self.total_elementos
+        if pares.size and (pares.min() < 0 or pares.max() >= n):
+            raise KeyError("Hay elementos fuera de 0..n-1")
+
+        raices = self._raices_numpy()
+        a, b = pares[:, 0], pares[:, 1]
+        while True:
+            raiz_a, raiz_b = raices[a], raices[b]
+            distintos = raiz_a != raiz_b
+            if not distintos.any():
+                break
+            a, b = a[distintos], b[distintos]
+            raiz_a, raiz_b = raiz_a[distintos], raiz_b[distintos]
+            menor = np.minimum(raiz_a, raiz_b)
+            np.minimum.at(raices, raiz_a, menor)
+            np.minimum.at(raices, raiz_b, menor)
+            while True:
+                siguientes = raices[raices]
+                if np.array_equal(siguientes, raices):
+                    break
+                raices = siguientes
+
+        np.frombuffer(self.padres, dtype=np.intc)[:] = raices
+        np.frombuffer(self.tamanos, dtype=np.intc)[:] = np.bincount(raices, minlength=n)
+        self.num_conjuntos = int(np.count_nonzero(raices == np.arange(n)))
+
+    def componentes(self) -> tuple:
+        """Etiqueta cada elemento con su componente en una sola pasada.
+        Las etiquetas son 0, 1, ... en el orden del menor elemento de cada
+        componente. Con NumPy disponible el cálculo se vectoriza.
+
+        Returns:
+            tuple: array('i') con la etiqueta de cada elemento y array('i') con
+                el tamaño de cada componente.
+        """
+        n = self.total_elementos
+        etiquetas = array("i")
+        tamanos = array("i")
+        if np is not None:
+            raices = self._raices_numpy()
+            np.frombuffer(self.padres, dtype=np.intc)[:] = raices  # Caminos comprimidos
+            _, primeros, inversa, cuentas = np.unique(
+                raices, return_index=True, return_inverse=True, return_counts=True
+            )
+            orden = np.argsort(primeros)
+            rango = np.empty_like(orden)
+            rango[orden] = np.arange(len(orden))
+            etiquetas.frombytes(rango[inversa].astype(np.intc).tobytes())
+            tamanos.frombytes(cuentas[orden].astype(np.intc).tobytes())
+            return etiquetas, tamanos
+
+        raiz, padres = self._raiz, self.padres
+        etiqueta_raiz = array("i", [-1]) * n
+        etiquetas = array("i", bytes(etiquetas.itemsize * n))
+        for elemento in range(n):
+            r = raiz(padres, elemento)
+            if etiqueta_raiz[r] < 0:
+                etiqueta_raiz[r] = len(tamanos)
+                tamanos.append(self.tamanos[r])
+            etiquetas[elemento] = etiqueta_raiz[r]
+        return etiquetas, tamanos
+
+
+def _secuencia_binomial(n: int) -> list:
+    """Uniones que forman árboles binomiales (profundidad log n), el peor caso de
+    la unión por tamaño: se unen bloques de 1, 2, 4... elementos por sus raíces.
+    """
+    uniones = []
+    paso = 1
+    while paso < n:
+        uniones.extend((i, i + paso) for i in range(0, n - paso, 2 * paso))
+        paso *= 2
+    return uniones
+
+
+def _secuencia_aleatoria(n: int, semilla: int = 1) -> list:
+    """n - 1 uniones entre elementos aleatorios."""
+    aleatorio = random.Random(semilla)
+    return [(aleatorio.randrange(n), aleatorio.randrange(n)) for _ in range(n - 1)]
+
+
+SECUENCIAS_UNIONES = {"binomial": _secuencia_binomial, "aleatoria": _secuencia_aleatoria}
+
+
+def comparar_compresiones(
+    tamanos: tuple = (10**6,),
+    clases: tuple = (Particion, ParticionEnteros),
+    secuencias: tuple = ("binomial", "aleatoria"),
+) -> dict:
+    """
+    Compara las estrategias de compresión de caminos: para cada secuencia de
+    uniones mide el tiempo de hacer las uniones y después buscar la raíz de todos
+    los elementos empezando por los más profundos.
+    Para 10**7 elementos conviene usar solo ParticionEnteros.
+
+    Args:
+        tamanos: Números de elementos a probar.
+        clases: Clases de partición a probar.
+        secuencias: Secuencias de uniones ("binomial", "aleatoria").
+
+    Returns:
+        dict: Tiempo en ms por (tamaño, clase, secuencia, estrategia).
+    """
+    print(f"{'Elementos':<12}{'Clase':<18}{'Secuencia':<12}" + "".join(f"{c + ' (ms)':<17}" for c in COMPRESIONES))
+    print("-" * (42 + 17 * len(COMPRESIONES)))
+
+    resultados = {}
+    for n in tamanos:
+        for nombre_secuencia in secuencias:
+            uniones = SECUENCIAS_UNIONES[nombre_secuencia](n)
+            for clase in clases:
+                tiempos = []
+                for compresion in COMPRESIONES:
+                    particion = clase(range(n), compresion)
+                    inicio = time.perf_counter()
+                    for a, b in uniones:
+                        particion.une(a, b)
+                    for k in range(n - 1, -1, -1):
+                        particion[k]
+                    tiempo = (time.perf_counter() - inicio) * 1000
+                    resultados[n, clase.__name__, nombre_secuencia, compresion] = tiempo
+                    tiempos.append(tiempo)
+                print(f"{n:<12}{clase.__name__:<18}{nombre_secuencia:<12}" + "".join(f"{t:<17.2f}" for t in tiempos))
+    return resultados
+
+
 # Sugerencia: Implementar con las diveras técncias de unión-pertenencia vistas en clase y probar los tiempos de ejecución.
 
 # Hacer con montículo
 
 
-def kruskal(grafo: dict) -> dict:
+def kruskal(grafo: dict, modo: str = "ordenado", procesos: Optional[int] = 1) -> dict:
     """Dado un grafo devuelve otro grafo con el árbol expandido mínimo,
     utilizando el algoritmo de Kruskal.
     Los grafos son diccionario donde las claves son arcos (pares de nodos) y los
     valores son el peso de los arcos.
 
+    También acepta un GrafoCSR; en ese caso se trabaja con los índices enteros
+    de los nodos y el árbol se devuelve con los nodos originales.
+
     Args:
-        grafo (dict): Grafo en formato de diccionario.
+        grafo (dict): Grafo en formato de diccionario o GrafoCSR.
+        modo (str, optional): "ordenado" (ordena todos los arcos), "filtro"
+            (kruskal_filtro) o "boruvka" (boruvka en paralelo). Todos devuelven
+            el mismo árbol. Defaults to "ordenado".
+        procesos (int, optional): Número de procesos del modo "boruvka".
+            Defaults to 1.
+
+    Raises:
+        ValueError: Modo desconocido.
 
     Returns:
         dict: Árbol de expansión mínima en formato de diccionario.
 
     Complexity:
-        O(n log n)
+        O(m log m)
     """
+    if modo not in MODOS_KRUSKAL:
+        raise ValueError(f"Modo desconocido: {modo}. Opciones: {MODOS_KRUSKAL}")
+    if modo == "filtro":
+        return kruskal_filtro(grafo)
+    if modo == "boruvka":
+        return boruvka(grafo, procesos)
+
+    if isinstance(grafo, GrafoCSR):
+        return _kruskal_csr(grafo)
+
     # Ordenamos los arcos por peso
     arcos_ordenados = sorted(grafo.items(), key=lambda item: item[1])
 
@@ -216,6 +604,334 @@ def kruskal(grafo: dict) -> dict:
     return arbol
 
 
+def _kruskal_csr(grafo: GrafoCSR) -> dict:
+    """Kruskal sobre los índices de un GrafoCSR.
+    Si el grafo tiene cada arco en ambos sentidos, el segundo se descarta al
+    estar ya sus extremos en la misma componente.
+
+    Args:
+        grafo (GrafoCSR): Grafo en formato CSR.
+
+    Returns:
+        dict: Árbol de expansión mínima en formato de diccionario.
+
+    Complexity:
+        O(m log m)
+    """
+    nodos, indptr, indices, pesos = grafo.nodos, grafo.indptr, grafo.indices, grafo.pesos
+    n = len(nodos)
+
+    # Origen de cada arco, en el mismo orden que indices y pesos
+    origenes = [i for i in range(n) for _ in range(indptr[i], indptr[i + 1])]
+
+    particion = ParticionEnteros(n)
+    arbol = {}
+    for k in sorted(range(len(indices)), key=pesos.__getitem__):
+        u, v = origenes[k], indices[k]
+        if particion[u] != particion[v]:
+            arbol[(nodos[u], nodos[v])] = pesos[k]
+            particion.une(u, v)
+            if len(particion) == 1:
+                break
+
+    return arbol
+
+
+# Variantes de Kruskal que no ordenan todos los arcos
+# Los arcos se numeran 0..m-1 en el orden del diccionario y se comparan por
+# (peso, número de arco). Con este orden total el árbol mínimo es único y
+# coincide con el de kruskal (que ordena de forma estable por peso).
+
+MODOS_KRUSKAL = ("ordenado", "filtro", "boruvka")
+
+# Por debajo de este número de arcos filter-Kruskal ordena directamente
+UMBRAL_FILTRO = 1024
+
+
+def _arcos_indexados(grafo) -> tuple:
+    """Numera nodos y arcos de un diccionario de arcos o de un GrafoCSR.
+
+    Returns:
+        tuple: Claves (u, v) de cada arco, orígenes y destinos como índices de
+            nodo, pesos y número de nodos.
+    """
+    if isinstance(grafo, GrafoCSR):
+        claves = [(origen, destino) for origen, destino, _ in grafo.arcos()]
+        pesos = list(grafo.pesos)  # arcos() recorre los arcos en el orden del CSR
+    else:
+        claves = list(grafo)
+        pesos = list(grafo.values())
+    indice: dict = {}
+    origenes = array("q", [indice.setdefault(u, len(indice)) for u, _ in claves])
+    destinos = array("q", [indice.setdefault(v, len(indice)) for _, v in claves])
+    return claves, origenes, destinos, pesos, len(indice)
+
+
+def kruskal_filtro(grafo: dict, semilla: Optional[int] = None) -> dict:
+    """Filter-Kruskal: en lugar de ordenar todos los arcos, se parten por un
+    pivote aleatorio; se resuelven primero los ligeros y de los pesados se
+    descartan los que ya unen nodos de la misma componente antes de seguir.
+    En grafos densos la mayoría de los arcos se descartan sin ordenarlos.
+
+    Args:
+        grafo (dict): Grafo en formato de diccionario de arcos o GrafoCSR.
+        semilla (int, optional): Semilla del generador propio con el que se
+            eligen los pivotes (no se toca el estado global de random).
+            Defaults to None.
+
+    Returns:
+        dict: Árbol de expansión mínima, el mismo que devuelve kruskal.
+
+    Complexity:
+        O(m + n log n log(m / n)) esperado
+    """
+    claves, origenes, destinos, pesos, n = _arcos_indexados(grafo)
+    generador = random.Random(semilla)
+    particion = ParticionEnteros(n)
+    raiz, padres = particion._raiz, particion.padres
+    arbol = {}
+
+    def clave(k):
+        return pesos[k], k
+
+    def anade(k):
+        u, v = raiz(padres, origenes[k]), raiz(padres, destinos[k])
+        if u != v:
+            arbol[claves[k]] = pesos[k]
+            particion.une(u, v)
+
+    def resuelve(arcos: list):
+        if len(particion) == 1:
+            return
+        if len(arcos) <= UMBRAL_FILTRO:
+            for k in sorted(arcos, key=clave):
+                anade(k)
+            return
+        # Partición por (peso, número de arco) del pivote. Es un orden total, así
+        # que el pivote es el único arco igual a sí mismo: va aparte y ambas
+        # mitades son estrictamente menores que arcos.
+        pivote = generador.choice(arcos)
+        peso_pivote = pesos[pivote]
+        ligeros, pesados = [], []
+        for k in arcos:
+            peso = pesos[k]
+            if peso < peso_pivote or (peso == peso_pivote and k < pivote):
+                ligeros.append(k)
+            elif k != pivote:
+                pesados.append(k)
+        resuelve(ligeros)
+        anade(pivote)
+        if len(particion) == 1:
+            return
+        # Filtro: fuera los arcos pesados internos a una componente
+        resuelve([k for k in pesados if raiz(padres, origenes[k]) != raiz(padres, destinos[k])])
+
+    resuelve(list(range(len(claves))))
+    return arbol
+
+
+# Arcos de cada proceso del pool de boruvka (se envían una vez al crear el proceso)
+_arcos_proceso: Optional[tuple] = None
+
+
+def _inicia_proceso_boruvka(origenes: array, destinos: array, pesos: list):
+    """Inicializador de los procesos del pool de boruvka."""
+    global _arcos_proceso
+    _arcos_proceso = (origenes, destinos, pesos)
+
+
+def _mas_baratos(inicio: int, fin: int, componente: array) -> dict:
+    """Arco más barato (por peso y número de arco) que sale de cada componente
+    entre los arcos inicio..fin-1.
+
+    Returns:
+        dict: {componente: arco}
+    """
+    origenes, destinos, pesos = _arcos_proceso
+    mejor: dict = {}
+    for k in range(inicio, fin):
+        cu, cv = componente[origenes[k]], componente[destinos[k]]
+        if cu == cv:
+            continue
+        # Los arcos se recorren en orden creciente, así que con "<" un empate
+        # de peso lo gana el de menor número
+        peso = pesos[k]
+        actual = mejor.get(cu)
+        if actual is None or peso < pesos[actual]:
+            mejor[cu] = k
+        actual = mejor.get(cv)
+        if actual is None or peso < pesos[actual]:
+            mejor[cv] = k
+    return mejor
+
+
+def boruvka(grafo: dict, procesos: Optional[int] = 1) -> dict:
+    """Algoritmo de Borůvka: en cada ronda cada componente elige su arco de
+    salida más barato y se añaden todos a la vez; el número de componentes al
+    menos se divide entre dos en cada ronda. La búsqueda de los arcos más
+    baratos se reparte por bloques de arcos entre un pool de procesos.
+
+    Args:
+        grafo (dict): Grafo en formato de diccionario de arcos o GrafoCSR.
+        procesos (int, optional): Número de procesos; None usa todos los núcleos
+            y 1 no crea procesos. Defaults to 1.
+
+    Returns:
+        dict: Árbol de expansión mínima, el mismo que devuelve kruskal.
+
+    Complexity:
+        O(m log n), repartido entre los procesos
+    """
+    global _arcos_proceso
+    claves, origenes, destinos, pesos, n = _arcos_indexados(grafo)
+    m = len(claves)
+    if procesos is None:
+        procesos = os.cpu_count() or 1
+
+    pool = None
+    if procesos > 1 and m > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=procesos,
+            initializer=_inicia_proceso_boruvka,
+            initargs=(origenes, destinos, pesos),
+        )
+        tamano = -(-m // procesos)
+    else:
+        _inicia_proceso_boruvka(origenes, destinos, pesos)
+
+    particion = ParticionEnteros(n)
+    arbol = {}
+    try:
+        while len(particion) > 1:
+            componente = array("i", (particion._raiz(particion.padres, i) for i in range(n)))
+            if pool is None:
+                partes = [_mas_baratos(0, m, componente)]
+            else:
+                futuros = [
+                    pool.submit(_mas_baratos, inicio, min(inicio + tamano, m), componente)
+                    for inicio in range(0, m, tamano)
+                ]
+                partes = [futuro.result() for futuro in futuros]
+
+            mejor: dict = {}
+            for parte in partes:
+                for c, k in parte.items():
+                    if c not in mejor or (pesos[k], k) < (pesos[mejor[c]], mejor[c]):
+                        mejor[c] = k
+            if not mejor:
+                break  # Grafo no conexo: el resultado es un bosque
+
+            # Con el orden total no se forman ciclos; un arco elegido por sus dos
+            # componentes solo se añade una vez
+            for k in set(mejor.values()):
+                u, v = origenes[k], destinos[k]
+                if particion[u] != particion[v]:
+                    arbol[claves[k]] = pesos[k]
+                    particion.une(u, v)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        else:
+            _arcos_proceso = None
+
+    return arbol
+
+
+# Kruskal en memoria externa
+# Para conjuntos de arcos mayores que la memoria: los arcos se leen por bloques,
+# cada bloque se ordena y se guarda en disco, y después se mezclan todos los
+# bloques ordenados con un montículo (heapq.merge) a la vez que se construye el
+# árbol. En memoria solo están los nodos, la partición y un bloque de arcos.
+
+# Arcos por cada lote de pickle dentro de un bloque ordenado en disco
+_LOTE_EXTERNO = 4096
+
+
+def _escribe_bloque(arcos: list, directorio: str, numero: int) -> str:
+    """Ordena un bloque de arcos (peso, secuencia, u, v) y lo guarda en disco."""
+    arcos.sort()
+    ruta = os.path.join(directorio, f"bloque{numero}.pickle")
+    with open(ruta, "wb") as fichero:
+        for inicio in range(0, len(arcos), _LOTE_EXTERNO):
+            pickle.dump(arcos[inicio:inicio + _LOTE_EXTERNO], fichero, pickle.HIGHEST_PROTOCOL)
+    return ruta
+
+
+def _lee_bloque(ruta: str) -> Iterator[tuple]:
+    """Genera los arcos de un bloque guardado, leyendo lote a lote."""
+    with open(ruta, "rb") as fichero:
+        while True:
+            try:
+                lote = pickle.load(fichero)
+            except EOFError:
+                return
+            yield from lote
+
+
+def kruskal_externo(
+    arcos,
+    tamano_bloque: int = 10**6,
+    directorio: Optional[str] = None,
+    **opciones,
+) -> Iterator[tuple]:
+    """Kruskal para conjuntos de arcos que no caben en memoria.
+
+    Los arcos se leen en bloques de tamano_bloque, cada bloque se ordena y se
+    escribe en un fichero temporal y los bloques se mezclan con un montículo de
+    k vías. El árbol se genera arco a arco; la memoria depende del número de
+    nodos y del tamaño de bloque, no del número de arcos.
+
+    Los empates de peso se resuelven por orden de lectura, así que el árbol es el
+    mismo que devuelve kruskal con el diccionario de arcos en ese orden.
+
+    Args:
+        arcos: Ruta de un fichero de arcos (se lee con alg_s4.lee_arcos), un
+            diccionario de arcos {(u, v): peso} o un iterable de (u, v, peso).
+        tamano_bloque (int, optional): Arcos por bloque ordenado en memoria.
+            Defaults to 10**6.
+        directorio (str, optional): Directorio para los ficheros temporales.
+            Defaults to None (el del sistema).
+        **opciones: Opciones de lee_arcos cuando arcos es una ruta.
+
+    Yields:
+        tuple: Arcos del árbol ((u, v), peso) en orden de peso creciente.
+
+    Complexity:
+        O(m log m) operaciones y O(m / tamano_bloque) ficheros en la mezcla
+    """
+    if isinstance(arcos, str):
+        arcos = lee_arcos(arcos, **opciones)
+    elif isinstance(arcos, dict):
+        arcos = ((u, v, peso) for (u, v), peso in arcos.items())
+
+    with tempfile.TemporaryDirectory(dir=directorio) as temporal:
+        # Fase 1: bloques ordenados en disco
+        indice: dict = {}
+        rutas = []
+        bloque = []
+        for secuencia, (u, v, peso) in enumerate(arcos):
+            bloque.append((peso, secuencia, indice.setdefault(u, len(indice)), indice.setdefault(v, len(indice))))
+            if len(bloque) >= tamano_bloque:
+                rutas.append(_escribe_bloque(bloque, temporal, len(rutas)))
+                bloque = []
+        if bloque:
+            rutas.append(_escribe_bloque(bloque, temporal, len(rutas)))
+        del bloque
+
+        # Fase 2: mezcla de k vías y Kruskal sobre índices
+        nodos = list(indice)
+        del indice
+        particion = ParticionEnteros(len(nodos))
+        raiz, padres = particion._raiz, particion.padres
+        for peso, _, u, v in heapq.merge(*(_lee_bloque(ruta) for ruta in rutas)):
+            raiz_u, raiz_v = raiz(padres, u), raiz(padres, v)
+            if raiz_u != raiz_v:
+                particion.une(raiz_u, raiz_v)
+                yield (nodos[u], nodos[v]), peso
+                if len(particion) == 1:
+                    return
+
+
 def kruskal_monticulo(grafo: dict) -> dict:
     """Dado un grafo devuelve otro grafo con el árbol expandido mínimo,
     utilizando el algoritmo de Kruskal.
@@ -295,11 +1011,177 @@ def kruskal_profesor(grafo: dict) -> dict:
 # Sugerencia: Prueba a implementar Kruskal para un grafo que esté en formato de matriz de adyacencia.
 
 
-def prim(grafo: dict) -> dict:
+# Densidad (arcos / posibles arcos no dirigidos) a partir de la cual prim usa
+# la versión con matriz de adyacencia (solo con NumPy; sin NumPy el bucle O(n^2)
+# en Python no compensa frente al montículo)
+UMBRAL_DENSIDAD_PRIM = 0.2
+
+
+def prim_matriz(matriz, nodos: Optional[list] = None) -> dict:
+    """Prim para grafos densos dados como matriz de adyacencia simétrica, sin
+    montículo: se guarda en un array el peso del mejor arco que une cada nodo
+    con el árbol y en cada paso se toma el mínimo y se actualiza con la fila del
+    nodo añadido. Con NumPy ambos pasos están vectorizados.
+
+    Args:
+        matriz: Matriz n x n (array de NumPy, o secuencia de filas como listas o
+            arrays) con inf donde no hay arco.
+        nodos (list, optional): Nodo de cada fila. Defaults to None (0..n-1).
+
+    Returns:
+        dict: Árbol de expansión mínima {(u, v): peso} de la componente del
+            primer nodo, con u el nodo que ya estaba en el árbol.
+
+    Complexity:
+        O(n^2)
+    """
+    n = len(matriz)
+    if nodos is None:
+        nodos = range(n)
+    arbol = {}
+    if n == 0:
+        return arbol
+
+    if np is not None:
+        matriz = np.asarray(matriz)
+        clave = matriz[0].astype(float)  # Peso del mejor arco hacia el árbol
+        origen = np.zeros(n, dtype=np.intp)  # Extremo en el árbol de ese arco
+        en_arbol = np.zeros(n, dtype=bool)
+        en_arbol[0] = True
+        clave[0] = np.inf
+        for _ in range(n - 1):
+            j = int(np.argmin(clave))
+            if clave[j] == np.inf:
+                break  # No quedan nodos alcanzables
+            i = int(origen[j])
+            arbol[(nodos[i], nodos[j])] = matriz[i, j].item()
+            en_arbol[j] = True
+            clave[j] = np.inf
+            fila = matriz[j]
+            mejora = (fila < clave) & ~en_arbol
+            clave[mejora] = fila[mejora]
+            origen[mejora] = j
+        return arbol
+
+    inf = float("inf")
+    clave = list(matriz[0])
+    origen = [0] * n
+    en_arbol = bytearray(n)
+    en_arbol[0] = 1
+    clave[0] = inf
+    for _ in range(n - 1):
+        j = min(range(n), key=clave.__getitem__)
+        if clave[j] == inf:
+            break
+        i = origen[j]
+        arbol[(nodos[i], nodos[j])] = matriz[i][j]
+        en_arbol[j] = 1
+        clave[j] = inf
+        fila = matriz[j]
+        for k in range(n):
+            if not en_arbol[k] and fila[k] < clave[k]:
+                clave[k] = fila[k]
+                origen[k] = j
+    return arbol
+
+
+def prim(grafo: dict, aridad: int = 4, umbral_densidad: float = UMBRAL_DENSIDAD_PRIM) -> dict:
     """Implementación del algoritmo de Prim para encontrar el árbol de expansión mínima.
     Los grafos son diccionarios donde las claves son arcos (pares de nodos) y los
     valores son el peso de los arcos.
 
+    Cada nodo fuera del árbol está a lo sumo una vez en un MonticuloIndexado,
+    con el peso del mejor arco que lo une al árbol; al encontrar uno mejor se
+    reduce su prioridad en lugar de insertar un duplicado.
+    Si NumPy está disponible y la densidad del grafo llega a umbral_densidad se
+    usa prim_matriz, que es O(n^2) sin montículo.
+
+    Args:
+        grafo (dict): Grafo en formato de diccionario.
+        aridad (int, optional): Aridad del montículo. Defaults to 4.
+        umbral_densidad (float, optional): Densidad a partir de la cual se usa
+            la matriz de adyacencia. Defaults to UMBRAL_DENSIDAD_PRIM.
+
+    Returns:
+        dict: Árbol de expansión mínima en formato de diccionario.
+
+    Complexity:
+        O(m log_d n + n d log_d n)
+    """
+
+    # Extraer todos los nodos del grafo (en orden de aparición)
+    nodos = {}
+    for u, v in grafo.keys():
+        nodos.setdefault(u, len(nodos))
+        nodos.setdefault(v, len(nodos))
+
+    if not nodos:
+        return {}
+
+    lista_nodos = list(nodos)
+    n = len(lista_nodos)
+    if np is not None and n > 1 and len(grafo) >= umbral_densidad * n * (n - 1) / 2:
+        return _prim_denso(grafo, nodos, lista_nodos)
+
+    # Convertir el grafo a listas de adyacencia sobre índices
+    adyacencia = [[] for _ in lista_nodos]
+    for (u, v), peso in grafo.items():
+        adyacencia[nodos[u]].append((nodos[v], peso))
+        adyacencia[nodos[v]].append((nodos[u], peso))  # Para grafos no dirigidos
+
+    # Empezamos por el primer nodo; origen[j] es el extremo en el árbol del mejor arco hacia j
+    origen = [-1] * len(lista_nodos)
+    en_arbol = bytearray(len(lista_nodos))
+    monticulo = MonticuloIndexado(len(lista_nodos), aridad)
+    monticulo.inserta(0, 0)
+    arbol = {}
+
+    while monticulo:
+        j, peso = monticulo.pop_min()
+        en_arbol[j] = 1
+
+        # Añadimos el arco al árbol (manteniendo el orden original de los nodos)
+        if origen[j] >= 0:
+            u, v = lista_nodos[origen[j]], lista_nodos[j]
+            if grafo.get((u, v)) == peso:
+                arbol[(u, v)] = peso
+            else:
+                arbol[(v, u)] = peso
+
+        # Actualizamos los arcos frontera desde el nuevo nodo
+        for k, peso_vecino in adyacencia[j]:
+            if not en_arbol[k] and monticulo.inserta_o_reduce(k, peso_vecino):
+                origen[k] = j
+
+    return arbol
+
+
+def _prim_denso(grafo: dict, nodos: dict, lista_nodos: list) -> dict:
+    """Prim de un diccionario de arcos denso a través de su matriz de adyacencia."""
+    n = len(lista_nodos)
+    inf = float("inf")
+    matriz = np.full((n, n), inf)
+    for (u, v), peso in grafo.items():
+        i, j = nodos[u], nodos[v]
+        if i != j and peso < matriz[i, j]:
+            matriz[i, j] = matriz[j, i] = peso
+
+    # Se devuelve cada arco con su orientación y su peso originales
+    arbol = {}
+    for u, v in prim_matriz(matriz, lista_nodos):
+        if (u, v) in grafo and grafo[u, v] <= grafo.get((v, u), inf):
+            arbol[(u, v)] = grafo[u, v]
+        else:
+            arbol[(v, u)] = grafo[v, u]
+    return arbol
+
+
+def prim_perezoso(grafo: dict) -> dict:
+    """Implementación del algoritmo de Prim con heapq y borrado perezoso: cada arco
+    frontera se inserta en el montículo y los obsoletos se descartan al extraerlos.
+    Los grafos son diccionarios donde las claves son arcos (pares de nodos) y los
+    valores son el peso de los arcos.
+
     Args:
         grafo (dict): Grafo en formato de diccionario.
 
@@ -357,54 +1239,514 @@ def prim(grafo: dict) -> dict:
     return arbol
 
 
+# Árbol de expansión mínima dinámico
+# Al añadir un arco u-v basta con mirar el ciclo que forma con el árbol: si el
+# arco más pesado del camino u-v en el árbol pesa más que el nuevo, se cambia uno
+# por otro. El camino se consulta con un link-cut tree en el que cada arco del
+# árbol es también un nodo (con su peso) entre sus dos extremos.
+
+
+class ArbolExpansionDinamico:
+    """
+    Árbol (o bosque) de expansión mínima que se mantiene al insertar arcos.
+
+    Internamente es un link-cut tree sobre listas: los nodos del grafo y los
+    arcos del árbol son nodos del link-cut tree, los arcos con su peso como valor
+    y los nodos del grafo con -inf. Cada nodo guarda el del valor máximo de su
+    subárbol splay, de modo que el arco más pesado de un camino se obtiene en
+    O(log n) amortizado.
+    """
+
+    def __init__(self, grafo: Optional[dict] = None):
+        """Crea el árbol a partir del árbol de kruskal del grafo.
+
+        Args:
+            grafo (dict, optional): Grafo en formato de diccionario de arcos (si
+                ya es un árbol, kruskal lo devuelve igual). Defaults to None.
+        """
+        self.indice: dict = {}  # Nodo del grafo -> nodo del link-cut tree
+        self.arcos: dict = {}  # Nodo del link-cut tree de cada arco -> (u, v)
+        self.arbol: dict = {}  # Arcos del árbol {(u, v): peso}
+        self._libres: list = []  # Nodos de arcos cortados, para reutilizar
+        # Al insertar arcos las componentes solo se unen, así que la conexión se
+        # consulta con una unión-pertenencia en lugar de con el link-cut tree
+        self._componente: list = []
+
+        # Link-cut tree: hijos en el árbol splay, padre (o path-parent), marca de
+        # inversión pendiente, valor y nodo de valor máximo del subárbol splay
+        self._izq: list = []
+        self._der: list = []
+        self._padre: list = []
+        self._invertido = bytearray()
+        self._valor: list = []
+        self._maximo: list = []
+
+        if grafo:
+            for (u, v), peso in kruskal(grafo).items():
+                self.inserta_arco(u, v, peso)
+
+    def __len__(self) -> int:
+        """Número de arcos del árbol."""
+        return len(self.arbol)
+
+    def peso_total(self):
+        """Suma de los pesos de los arcos del árbol."""
+        return sum(self.arbol.values())
+
+    def inserta_arco(self, u, v, peso) -> Optional[tuple]:
+        """Añade un arco al grafo y actualiza el árbol: si une dos componentes
+        entra en el árbol; si no, sustituye al arco más pesado del ciclo que
+        forma, cuando este pesa más.
+
+        Args:
+            u: Extremo del arco.
+            v: Extremo del arco.
+            peso: Peso del arco.
+
+        Returns:
+            Optional[tuple]: El arco ((u, v), peso) que queda fuera del árbol (el
+                sustituido o el propio arco nuevo) o None si no sale ninguno.
+
+        Complexity:
+            O(log n) amortizado
+        """
+        x, y = self._nodo(u), self._nodo(v)
+        if x == y:
+            return (u, v), peso
+        raiz_x = _raiz_completa(self._componente, x)
+        raiz_y = _raiz_completa(self._componente, y)
+        if raiz_x != raiz_y:
+            self._componente[raiz_y] = raiz_x
+            self._enlaza_arco(u, v, peso, x, y)
+            return None
+
+        maximo = self._maximo_camino(x, y)
+        if self._valor[maximo] <= peso:
+            return (u, v), peso
+
+        # Se cambia el arco más pesado del ciclo por el nuevo
+        clave = self.arcos.pop(maximo)
+        peso_maximo = self.arbol.pop(clave)
+        a, b = self.indice[clave[0]], self.indice[clave[1]]
+        self._corta(a, maximo)
+        self._corta(maximo, b)
+        self._libres.append(maximo)
+        self._enlaza_arco(u, v, peso, x, y)
+        return clave, peso_maximo
+
+    def _nodo(self, nodo) -> int:
+        """Nodo del link-cut tree de un nodo del grafo (lo crea si no existe)."""
+        x = self.indice.get(nodo)
+        if x is None:
+            x = self.indice[nodo] = self._nuevo(float("-inf"))
+            self._componente[x] = x
+        return x
+
+    def _nuevo(self, valor) -> int:
+        if self._libres:
+            x = self._libres.pop()
+            self._izq[x] = self._der[x] = self._padre[x] = -1
+            self._invertido[x] = 0
+            self._valor[x] = valor
+            self._maximo[x] = x
+            return x
+        x = len(self._valor)
+        self._componente.append(x)
+        self._izq.append(-1)
+        self._der.append(-1)
+        self._padre.append(-1)
+        self._invertido.append(0)
+        self._valor.append(valor)
+        self._maximo.append(x)
+        return x
+
+    def _enlaza_arco(self, u, v, peso, x: int, y: int):
+        """Añade al árbol el arco u-v (x e y en componentes distintas)."""
+        arco_nodo = self._nuevo(peso)
+        self.arcos[arco_nodo] = (u, v)
+        self.arbol[(u, v)] = peso
+        self._enlaza(x, arco_nodo)
+        self._enlaza(arco_nodo, y)
+
+    # Operaciones del link-cut tree
+
+    def _es_raiz(self, x: int) -> bool:
+        """Si x es la raíz de su árbol splay."""
+        p = self._padre[x]
+        return p < 0 or (self._izq[p] != x and self._der[p] != x)
+
+    def _actualiza(self, x: int):
+        valor, maximo = self._valor, self._maximo
+        mejor = x
+        for hijo in (self._izq[x], self._der[x]):
+            if hijo >= 0 and valor[maximo[hijo]] > valor[mejor]:
+                mejor = maximo[hijo]
+        maximo[x] = mejor
+
+    def _empuja(self, x: int):
+        """Aplica a los hijos de x la inversión pendiente."""
+        if self._invertido[x]:
+            izq, der = self._izq[x], self._der[x]
+            self._izq[x], self._der[x] = der, izq
+            for hijo in (izq, der):
+                if hijo >= 0:
+                    self._invertido[hijo] ^= 1
+            self._invertido[x] = 0
+
+    def _rota(self, x: int):
+        izq, der, padre = self._izq, self._der, self._padre
+        p = padre[x]
+        g = padre[p]
+        if not self._es_raiz(p):
+            if izq[g] == p:
+                izq[g] = x
+            else:
+                der[g] = x
+        padre[x] = g
+        if izq[p] == x:
+            izq[p] = der[x]
+            if der[x] >= 0:
+                padre[der[x]] = p
+            der[x] = p
+        else:
+            der[p] = izq[x]
+            if izq[x] >= 0:
+                padre[izq[x]] = p
+            izq[x] = p
+        padre[p] = x
+        self._actualiza(p)
+        self._actualiza(x)
+
+    def _splay(self, x: int):
+        # Primero se aplican las inversiones pendientes desde la raíz del splay
+        camino = [x]
+        while not self._es_raiz(camino[-1]):
+            camino.append(self._padre[camino[-1]])
+        for y in reversed(camino):
+            self._empuja(y)
+
+        izq, padre = self._izq, self._padre
+        while not self._es_raiz(x):
+            p = padre[x]
+            if not self._es_raiz(p):
+                g = padre[p]
+                self._rota(p if (izq[g] == p) == (izq[p] == x) else x)
+            self._rota(x)
+
+    def _accede(self, x: int):
+        """Deja en el árbol splay de x exactamente el camino desde la raíz a x."""
+        ultimo = -1
+        y = x
+        while y >= 0:
+            self._splay(y)
+            self._der[y] = ultimo
+            self._actualiza(y)
+            ultimo = y
+            y = self._padre[y]
+        self._splay(x)
+
+    def _hace_raiz(self, x: int):
+        self._accede(x)
+        self._invertido[x] ^= 1
+
+    def _enlaza(self, x: int, y: int):
+        self._hace_raiz(x)
+        self._padre[x] = y
+
+    def _corta(self, x: int, y: int):
+        """Quita la arista x-y (x e y adyacentes)."""
+        self._hace_raiz(x)
+        self._accede(y)
+        # Ahora x es el hijo izquierdo de y y no tiene hijo derecho
+        self._izq[y] = -1
+        self._padre[x] = -1
+        self._actualiza(y)
+
+    def _maximo_camino(self, x: int, y: int) -> int:
+        """Nodo de mayor valor en el camino de x a y."""
+        self._hace_raiz(x)
+        self._accede(y)
+        return self._maximo[y]
+
+
+def comparar_monticulos_prim(
+    num_nodos: int = 1000,
+    densidades: tuple = (0.01, 0.1, 0.5),
+    aridades: tuple = (2, 4, 8),
+    repeticiones: int = 3,
+) -> dict:
+    """
+    Compara Prim con heapq y borrado perezoso frente a Prim con el montículo
+    indexado con distintas aridades, para varias densidades.
+
+    Args:
+        num_nodos: Número de nodos de los grafos aleatorios.
+        densidades: Fracción de los n(n-1)/2 arcos posibles que tiene cada grafo.
+        aridades: Aridades del montículo indexado a probar.
+        repeticiones: Número de grafos aleatorios por densidad.
+
+    Returns:
+        dict: Tiempo medio en ms por densidad y por método ("heapq" o "d=<aridad>").
+    """
+    metodos = ["heapq"] + [f"d={aridad}" for aridad in aridades]
+    print(f"{'Densidad':<10}" + "".join(f"{metodo + ' (ms)':<15}" for metodo in metodos))
+    print("-" * (10 + 15 * len(metodos)))
+
+    resultados = {}
+    for densidad in densidades:
+        tiempos = dict.fromkeys(metodos, 0.0)
+        for _ in range(repeticiones):
+            # Camino 0-1-...-n-1 para que sea conexo, más arcos aleatorios
+            grafo = {(i, i + 1): random.randint(1, 100) for i in range(num_nodos - 1)}
+            for i in range(num_nodos):
+                for j in range(i + 2, num_nodos):
+                    if random.random() < densidad:
+                        grafo[(i, j)] = random.randint(1, 100)
+
+            inicio = time.perf_counter()
+            prim_perezoso(grafo)
+            tiempos["heapq"] += (time.perf_counter() - inicio) * 1000
+            for aridad in aridades:
+                inicio = time.perf_counter()
+                prim(grafo, aridad)
+                tiempos[f"d={aridad}"] += (time.perf_counter() - inicio) * 1000
+
+        resultados[densidad] = {metodo: total / repeticiones for metodo, total in tiempos.items()}
+        print(f"{densidad:<10}" + "".join(f"{resultados[densidad][metodo]:<15.2f}" for metodo in metodos))
+    return resultados
+
+
 # Sugerencia: Compara los tiempos de ejecución del algoritmo de Kruskal con los del algormitmo de Prim.
 
 
+# Banco de pruebas de árboles de expansión mínima
+# Familias de grafos no dirigidos y conexos con un número de arcos aproximado,
+# algoritmos registrados por nombre y medidas de tiempo (mediana y percentil 95
+# con perf_counter) y de memoria máxima (con tracemalloc, en una ejecución
+# aparte para no alterar los tiempos).
+
+
+def _pesos_aleatorios(m: int, aleatorio: random.Random) -> list:
+    """Lista de m pesos enteros aleatorios entre 1 y 10**6."""
+    if np is not None:
+        generador = np.random.default_rng(aleatorio.getrandbits(64))
+        return generador.integers(1, 10**6, size=m, endpoint=True).tolist()
+    return [aleatorio.randint(1, 10**6) for _ in range(m)]
+
+
+def grafo_disperso(num_arcos: int, aleatorio: random.Random) -> dict:
+    """Grafo aleatorio de grado medio 4: un camino por una permutación aleatoria
+    de los nodos (para que sea conexo) y arcos aleatorios hasta num_arcos."""
+    n = max(2, num_arcos // 2)
+    # Tiene que haber al menos num_arcos pares de nodos distintos
+    while n * (n - 1) // 2 < num_arcos:
+        n += 1
+    orden = list(range(n))
+    aleatorio.shuffle(orden)
+    arcos = set(zip(orden, orden[1:]))
+    while len(arcos) < num_arcos:
+        u, v = aleatorio.randrange(n), aleatorio.randrange(n)
+        if u != v and (v, u) not in arcos:
+            arcos.add((u, v))
+    return dict(zip(arcos, _pesos_aleatorios(len(arcos), aleatorio)))
+
+
+def grafo_rejilla(num_arcos: int, aleatorio: random.Random) -> dict:
+    """Rejilla cuadrada de lado L con 2 L (L - 1) ≈ num_arcos arcos."""
+    lado = max(2, round((1 + math.sqrt(1 + 2 * num_arcos)) / 2))
+    arcos = [((f * lado + c), (f * lado + c + 1)) for f in range(lado) for c in range(lado - 1)]
+    arcos += [((f * lado + c), ((f + 1) * lado + c)) for f in range(lado - 1) for c in range(lado)]
+    return dict(zip(arcos, _pesos_aleatorios(len(arcos), aleatorio)))
+
+
+def grafo_completo(num_arcos: int, aleatorio: random.Random) -> dict:
+    """Grafo completo con n (n - 1) / 2 ≈ num_arcos arcos."""
+    n = max(2, round((1 + math.sqrt(1 + 8 * num_arcos)) / 2))
+    arcos = list(itertools.combinations(range(n), 2))
+    return dict(zip(arcos, _pesos_aleatorios(len(arcos), aleatorio)))
+
+
+def grafo_potencia(num_arcos: int, aleatorio: random.Random) -> dict:
+    """Grafo de ley de potencias (Barabási-Albert): cada nodo nuevo se une a dos
+    nodos existentes elegidos con probabilidad proporcional a su grado."""
+    n = max(3, num_arcos // 2 + 1)
+    arcos = {(0, 1), (0, 2), (1, 2)}
+    extremos = [0, 1, 0, 2, 1, 2]  # Cada nodo aparece tantas veces como su grado
+    for nuevo in range(3, n):
+        destinos = set()
+        while len(destinos) < 2:
+            destinos.add(extremos[aleatorio.randrange(len(extremos))])
+        for destino in destinos:
+            arcos.add((destino, nuevo))
+            extremos += (destino, nuevo)
+    return dict(zip(arcos, _pesos_aleatorios(len(arcos), aleatorio)))
+
+
+FAMILIAS_GRAFOS = {
+    "disperso": grafo_disperso,
+    "rejilla": grafo_rejilla,
+    "completo": grafo_completo,
+    "potencia": grafo_potencia,
+}
+
+# Algoritmos del banco de pruebas: nombre -> (función, máximo de arcos o None)
+ALGORITMOS_MST: dict = {}
+
+
+def registra_algoritmo_mst(nombre: str, funcion, max_arcos: Optional[int] = None):
+    """Añade un algoritmo al banco de pruebas.
+
+    Args:
+        nombre (str): Nombre del algoritmo en los resultados.
+        funcion: Función que recibe un diccionario de arcos y devuelve el árbol.
+        max_arcos (int, optional): No se ejecuta en grafos con más arcos (para
+            algoritmos lentos). Defaults to None.
+    """
+    ALGORITMOS_MST[nombre] = (funcion, max_arcos)
+
+
+registra_algoritmo_mst("kruskal", kruskal)
+registra_algoritmo_mst("kruskal_filtro", kruskal_filtro)
+registra_algoritmo_mst("boruvka", boruvka)
+registra_algoritmo_mst("kruskal_externo", lambda grafo: dict(kruskal_externo(grafo)))
+registra_algoritmo_mst("kruskal_monticulo", kruskal_monticulo)
+registra_algoritmo_mst("kruskal_profesor", kruskal_profesor, max_arcos=10**4)  # O(n m) al reunir los nodos
+registra_algoritmo_mst("prim", prim)
+registra_algoritmo_mst("prim_perezoso", prim_perezoso)
+
+
+def _percentil(valores: list, porcentaje: float) -> float:
+    """Percentil por el método del rango más cercano."""
+    ordenados = sorted(valores)
+    return ordenados[max(0, math.ceil(porcentaje / 100 * len(ordenados)) - 1)]
+
+
+def comparar_arbol_expansion(
+    familias: tuple = tuple(FAMILIAS_GRAFOS),
+    tamanos: tuple = (10**3, 10**4, 10**5),
+    algoritmos: Optional[tuple] = None,
+    repeticiones: int = 5,
+    semilla: int = 1,
+    fichero_json: Optional[str] = None,
+) -> list:
+    """
+    Banco de pruebas de los algoritmos de árbol de expansión mínima. Para cada
+    familia y tamaño se genera un grafo y cada algoritmo se ejecuta repeticiones
+    veces midiendo el tiempo y una vez más con tracemalloc para la memoria.
+
+    Args:
+        familias: Familias de grafos (claves de FAMILIAS_GRAFOS).
+        tamanos: Números aproximados de arcos (hasta 10**6 o más).
+        algoritmos: Nombres de ALGORITMOS_MST a ejecutar. None ejecuta todos.
+        repeticiones: Ejecuciones cronometradas de cada algoritmo.
+        semilla: Semilla para generar los grafos.
+        fichero_json: Si se indica, se guardan ahí los resultados en JSON.
+
+    Raises:
+        ValueError: Familia o algoritmo desconocido, o repeticiones menor que 1.
+
+    Returns:
+        list: Un diccionario por familia, tamaño y algoritmo con el número de
+            nodos y arcos, la mediana y el percentil 95 del tiempo en ms, la
+            memoria máxima en KiB y el peso del árbol.
+    """
+    if repeticiones < 1:
+        raise ValueError("Tiene que haber al menos una repetición")
+    if algoritmos is None:
+        algoritmos = tuple(ALGORITMOS_MST)
+    for familia in familias:
+        if familia not in FAMILIAS_GRAFOS:
+            raise ValueError(f"Familia desconocida: {familia}. Opciones: {tuple(FAMILIAS_GRAFOS)}")
+    for nombre in algoritmos:
+        if nombre not in ALGORITMOS_MST:
+            raise ValueError(f"Algoritmo desconocido: {nombre}. Opciones: {tuple(ALGORITMOS_MST)}")
+
+    print(
+        f"{'Familia':<10}{'Arcos':<10}{'Algoritmo':<20}{'Mediana (ms)':<15}"
+        f"{'p95 (ms)':<15}{'Memoria (KiB)':<15}"
+    )
+    print("-" * 85)
+
+    resultados = []
+    aleatorio = random.Random(semilla)
+    for familia in familias:
+        for tamano in tamanos:
+            grafo = FAMILIAS_GRAFOS[familia](tamano, aleatorio)
+            num_nodos = len({nodo for arco in grafo for nodo in arco})
+            for nombre in algoritmos:
+                funcion, max_arcos = ALGORITMOS_MST[nombre]
+                if max_arcos is not None and len(grafo) > max_arcos:
+                    continue
+
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    arbol = funcion(grafo)
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+
+                tracemalloc.start()
+                try:
+                    funcion(grafo)
+                    _, memoria = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+
+                resultado = {
+                    "familia": familia,
+                    "nodos": num_nodos,
+                    "arcos": len(grafo),
+                    "algoritmo": nombre,
+                    "repeticiones": repeticiones,
+                    "mediana_ms": statistics.median(tiempos),
+                    "p95_ms": _percentil(tiempos, 95),
+                    "memoria_kib": memoria / 1024,
+                    "peso": sum(arbol.values()),
+                }
+                resultados.append(resultado)
+                print(
+                    f"{familia:<10}{len(grafo):<10}{nombre:<20}{resultado['mediana_ms']:<15.2f}"
+                    f"{resultado['p95_ms']:<15.2f}{resultado['memoria_kib']:<15.1f}"
+                )
+
+    if fichero_json is not None:
+        with open(fichero_json, "w") as fichero:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "plataforma": platform.platform(),
+                    "semilla": semilla,
+                    "resultados": resultados,
+                },
+                fichero,
+                indent=2,
+            )
+    return resultados
+
+
 def comparar_tiempos(
     num_nodos_lista: list = [10, 50, 100, 500, 1000], repeticiones: int = 10
 ):
     """
-    Compara los tiempos de ejecución de los algoritmos de Kruskal y Prim.
+    Compara los tiempos de ejecución de los algoritmos de Kruskal y Prim en
+    grafos completos. Usa el banco de pruebas comparar_arbol_expansion.
 
     Args:
         num_nodos_lista: Lista con los diferentes tamaños de grafos a probar.
-        repeticiones: Número de grafos aleatorios a generar para cada tamaño.
-    """
-    print(f"{'Nodos':<10}{'Kruskal (ms)':<15}{'Prim (ms)':<15}")
-    print("-" * 40)
+        repeticiones: Número de ejecuciones de cada algoritmo para cada tamaño.
 
-    for num_nodos in num_nodos_lista:
-        tiempo_kruskal_total = 0
-        tiempo_prim_total = 0
-
-        for _ in range(repeticiones):
-            # Crear un grafo completo aleatorio
-            grafo = {}
-            for i in range(num_nodos):
-                for j in range(i + 1, num_nodos):
-                    peso = random.randint(1, 100)
-                    grafo[(i, j)] = peso
-
-            # Medir tiempo de Kruskal
-            inicio = time.time()
-            kruskal(grafo)
-            fin = time.time()
-            tiempo_kruskal_total += (fin - inicio) * 1000  # ms
-
-            # Medir tiempo de Prim
-            inicio = time.time()
-            prim(grafo)
-            fin = time.time()
-            tiempo_prim_total += (fin - inicio) * 1000  # ms
-
-        tiempo_kruskal_promedio = tiempo_kruskal_total / repeticiones
-        tiempo_prim_promedio = tiempo_prim_total / repeticiones
-
-        print(
-            f"{num_nodos:<10}{tiempo_kruskal_promedio:<15.2f}{tiempo_prim_promedio:<15.2f}"
-        )
+    Returns:
+        list: Resultados de comparar_arbol_expansion.
+    """
+    return comparar_arbol_expansion(
+        familias=("completo",),
+        tamanos=tuple(n * (n - 1) // 2 for n in num_nodos_lista),
+        algoritmos=("kruskal", "prim"),
+        repeticiones=repeticiones,
+    )
 
 
-# Para ejecutar la comparación de tiempos, descomentar la siguiente línea:
+# Para ejecutar el banco de pruebas completo (la tabla sale por pantalla y, si se
+# indica un fichero, los resultados se guardan además en JSON):
+#     python src/alg_s5.py [resultados.json]
 if __name__ == "__main__":
-    comparar_tiempos()
+    comparar_arbol_expansion(fichero_json=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,6 +1,22 @@
+import os
 import unittest
+import random
+import tempfile
 
-from src.alg_s10 import CaminosMinimosFloyd, multiplicacion_encadenada_matrices
+from src.alg_s4 import GrafoCSR
+from src.alg_s10 import (CaminosMinimosFloyd, CaminosMinimosJohnson, caminos_minimos,
+                         multiplicacion_encadenada_matrices, np, huella_grafo)
+
+
+def grafo_aleatorio(n, arcos, semilla=1):
+    """Grafo dirigido aleatorio sin bucles con n nodos y como mucho el número de
+    arcos indicado."""
+    random.seed(semilla)
+    grafo = {}
+    for _ in range(arcos):
+        origen, destino = random.sample(range(n), 2)
+        grafo[origen, destino] = random.randint(1, 20)
+    return grafo
 
 
 class TestCaminosMinimosFloyd(unittest.TestCase):
@@ -44,6 +60,291 @@ class TestCaminosMinimosFloyd(unittest.TestCase):
             self.assertEqual(caminos.camino(origen, destino), camino)
 
 
+    def test_grafo_csr(self):
+
+        grafo = {
+            ("a", "b"): 2, ("a", "d"): 1, ("b", "d"): 3, ("b", "e"): 10,
+            ("c", "a"): 4, ("c", "f"): 5, ("d", "c"): 2, ("d", "e"): 7,
+            ("d", "f"): 8, ("d", "g"): 4, ("e", "g"): 6, ("g", "f"): 1
+        }
+
+        caminos = CaminosMinimosFloyd(grafo)
+        caminos_csr = CaminosMinimosFloyd(GrafoCSR.from_arc_dict(grafo))
+        for origen in caminos.nodos:
+            for destino in caminos.nodos:
+                self.assertEqual(caminos_csr.distancia(origen, destino),
+                                 caminos.distancia(origen, destino))
+                self.assertEqual(caminos_csr.camino(origen, destino),
+                                 caminos.camino(origen, destino))
+
+
+    def comprueba_iguales(self, caminos, otros):
+        """Comprueba que dos objetos de caminos mínimos dan los mismos resultados."""
+        self.assertEqual(caminos.nodos, otros.nodos)
+        for origen in caminos.nodos:
+            for destino in caminos.nodos:
+                self.assertEqual(otros.distancia(origen, destino),
+                                 caminos.distancia(origen, destino))
+                self.assertEqual(otros.camino(origen, destino),
+                                 caminos.camino(origen, destino))
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_motor_numpy(self):
+
+        for semilla in range(5):
+            grafo = grafo_aleatorio(30, 120, semilla)
+            self.comprueba_iguales(CaminosMinimosFloyd(grafo),
+                                   CaminosMinimosFloyd(grafo, motor="numpy"))
+
+    def comprueba_equivalentes(self, grafo, caminos, otros):
+        """Comprueba que otros da las mismas distancias que caminos y caminos
+        válidos del mismo coste (con empates puede elegir otro camino)."""
+        for origen in caminos.nodos:
+            for destino in caminos.nodos:
+                distancia = caminos.distancia(origen, destino)
+                self.assertEqual(otros.distancia(origen, destino), distancia)
+                camino = otros.camino(origen, destino)
+                if distancia is None:
+                    self.assertIsNone(camino)
+                else:
+                    self.assertEqual(camino[0], origen)
+                    self.assertEqual(camino[-1], destino)
+                    self.assertEqual(sum(grafo[a, b] for a, b in zip(camino, camino[1:])), distancia)
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_motor_bloques(self):
+
+        grafo = grafo_aleatorio(40, 160)
+        caminos = CaminosMinimosFloyd(grafo)
+        for procesos in (1, 2):
+            self.comprueba_equivalentes(grafo, caminos, CaminosMinimosFloyd(
+                grafo, motor="bloques", tamano_bloque=7, procesos=procesos))
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_matrices_en_disco(self):
+
+        grafo = grafo_aleatorio(40, 160, semilla=2)
+        caminos = CaminosMinimosFloyd(grafo)
+        for motor, procesos in (("numpy", None), ("bloques", 2)):
+            with tempfile.TemporaryDirectory() as directorio:
+                en_disco = CaminosMinimosFloyd(grafo, motor=motor, tamano_bloque=16,
+                                               procesos=procesos, directorio=directorio)
+                self.assertIsInstance(en_disco.D, np.memmap)
+                self.comprueba_equivalentes(grafo, caminos, en_disco)
+
+                abierto = CaminosMinimosFloyd.abre(directorio)
+                self.assertEqual(abierto.nodos, caminos.nodos)
+                self.comprueba_equivalentes(grafo, caminos, abierto)
+                del en_disco, abierto
+
+                # Los metadatos se guardan en JSON; si están dañados no se abre
+                ruta_nodos = os.path.join(directorio, CaminosMinimosFloyd.FICHERO_NODOS)
+                with open(ruta_nodos, "w") as fichero:
+                    fichero.write("no es JSON")
+                self.assertRaises(ValueError, CaminosMinimosFloyd.abre, directorio)
+
+        caminos_32 = CaminosMinimosFloyd(grafo, motor="numpy", tipo_distancias="float32")
+        self.assertEqual(caminos_32.D.dtype, np.float32)
+        self.comprueba_equivalentes(grafo, caminos, caminos_32)
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_actualiza_arco_en_disco(self):
+
+        grafo = grafo_aleatorio(20, 60, semilla=6)
+        with tempfile.TemporaryDirectory() as directorio:
+            CaminosMinimosFloyd(grafo, motor="numpy", directorio=directorio)
+            ruta_cambios = os.path.join(directorio, CaminosMinimosFloyd.FICHERO_CAMBIOS)
+
+            abierto = CaminosMinimosFloyd.abre(directorio, escritura=True)
+            # Abrir no lee los arcos
+            self.assertIsNone(abierto._arcos)
+            random.seed(7)
+            for _ in range(10):
+                origen, destino = random.sample(abierto.nodos, 2)
+                peso = random.randint(1, 5)  # Arco nuevo o peso que baja
+                if grafo.get((origen, destino), peso + 1) > peso:
+                    grafo[origen, destino] = peso
+                    abierto.actualiza_arco(origen, destino, peso)
+            # Las actualizaciones se anotan sin reescribir los arcos
+            self.assertTrue(os.path.exists(ruta_cambios))
+            del abierto
+
+            reabierto = CaminosMinimosFloyd.abre(directorio, escritura=True)
+            self.assertEqual(reabierto.arcos, grafo)
+            self.comprueba_equivalentes(grafo, CaminosMinimosFloyd(grafo), reabierto)
+
+            # Subir el peso de un camino mínimo recalcula y vacía el registro
+            (origen, destino), peso = next(
+                (arco, peso) for arco, peso in grafo.items()
+                if reabierto.distancia(*arco) == peso
+            )
+            grafo[origen, destino] = peso + 50
+            reabierto.actualiza_arco(origen, destino, peso + 50)
+            self.assertFalse(os.path.exists(ruta_cambios))
+            del reabierto
+
+            final = CaminosMinimosFloyd.abre(directorio)
+            self.assertEqual(final.arcos, grafo)
+            self.comprueba_equivalentes(grafo, CaminosMinimosFloyd(grafo), final)
+            del final
+
+    def test_guardar_cargar(self):
+
+        grafo = grafo_aleatorio(25, 80, semilla=3)
+        motores = ["python"] + (["numpy"] if np is not None else [])
+        for motor in motores:
+            caminos = CaminosMinimosFloyd(grafo, motor=motor)
+            with tempfile.TemporaryDirectory() as directorio:
+                ruta = os.path.join(directorio, "caminos.bin")
+                caminos.save(ruta)
+
+                cargado = CaminosMinimosFloyd.load(ruta)
+                self.assertEqual(cargado.motor, motor)
+                self.assertEqual(cargado.nodo_a_indice, caminos.nodo_a_indice)
+                self.comprueba_iguales(caminos, cargado)
+                if motor == "python":
+                    self.assertEqual(cargado.D, caminos.D)
+                    self.assertEqual(cargado.P, caminos.P)
+
+                # Con el mismo grafo (aunque los arcos estén en otro orden) no se recalcula
+                reordenado = dict(reversed(list(grafo.items())))
+                self.assertEqual(huella_grafo(reordenado), caminos.huella)
+                self.assertEqual(CaminosMinimosFloyd.load(ruta, reordenado).huella, caminos.huella)
+
+                # Con un grafo distinto se recalcula y se guarda de nuevo
+                cambiado = dict(grafo)
+                cambiado[next(iter(grafo))] += 100
+                nuevo = CaminosMinimosFloyd.load(ruta, cambiado, motor=motor)
+                self.assertEqual(nuevo.huella, huella_grafo(cambiado))
+                self.comprueba_iguales(CaminosMinimosFloyd(cambiado), nuevo)
+                self.assertEqual(CaminosMinimosFloyd.load(ruta).huella, nuevo.huella)
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "otro.bin")
+            with open(ruta, "wb") as fichero:
+                fichero.write(b"no es un fichero de caminos")
+            self.assertRaises(ValueError, CaminosMinimosFloyd.load, ruta)
+
+    def test_cargar_fichero_truncado(self):
+
+        grafo = {("a", "b"): 1, ("b", "c"): 2}
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "caminos.bin")
+            CaminosMinimosFloyd(grafo).save(ruta)
+            self.assertEqual(os.listdir(directorio), ["caminos.bin"])
+            with open(ruta, "rb") as fichero:
+                contenido = fichero.read()
+            for corte in (36, len(contenido) - 10):
+                with open(ruta, "wb") as fichero:
+                    fichero.write(contenido[:-corte])
+                # Sin grafo es un error; con grafo se recalcula y se vuelve a guardar
+                self.assertRaises(ValueError, CaminosMinimosFloyd.load, ruta)
+                caminos = CaminosMinimosFloyd.load(ruta, grafo)
+                self.assertEqual(caminos.camino("a", "c"), ["a", "b", "c"])
+                self.assertEqual(CaminosMinimosFloyd.load(ruta).camino("a", "c"), ["a", "b", "c"])
+
+    def test_guardar_cargar_nodos_tupla(self):
+
+        grafo = {(("a", 1), ("b", 2)): 3, (("b", 2), ("c", 0)): 4, (("c", 0), ("a", 1)): 1.5}
+        caminos = CaminosMinimosFloyd(grafo)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "caminos.bin")
+            caminos.save(ruta)
+            with open(ruta, "rb") as fichero:
+                contenido = fichero.read()
+            # La cabecera es JSON, no pickle
+            self.assertIn(b'"tupla"', contenido)
+
+            cargado = CaminosMinimosFloyd.load(ruta)
+            self.assertEqual(cargado.nodos, caminos.nodos)
+            self.assertEqual(cargado.arcos, caminos.arcos)
+            self.assertEqual(cargado.D, caminos.D)
+            self.assertEqual(cargado.P, caminos.P)
+
+        # Los arcos repetidos de un GrafoCSR no cambian la huella
+        csr = GrafoCSR.from_arcos([(0, 1, 5), (0, 1, 2), (1, 2, 1)])
+        self.assertEqual(huella_grafo(csr), huella_grafo({(0, 1): 2, (1, 2): 1}))
+
+    def test_actualiza_arco(self):
+
+        motores = ["python"] + (["numpy"] if np is not None else [])
+        for motor in motores:
+            grafo = grafo_aleatorio(20, 50, semilla=4)
+            caminos = CaminosMinimosFloyd(grafo, motor=motor)
+            random.seed(5)
+            for _ in range(30):
+                origen, destino = random.sample(caminos.nodos, 2)
+                anterior = grafo.get((origen, destino))
+                if anterior is None or random.random() < 0.7:
+                    peso = random.randint(1, 10)  # Arco nuevo o peso que baja
+                else:
+                    peso = anterior + random.randint(1, 10)  # Peso que sube
+                grafo[origen, destino] = peso
+                caminos.actualiza_arco(origen, destino, peso)
+                self.assertEqual(caminos.huella, huella_grafo(grafo))
+                self.comprueba_equivalentes(grafo, CaminosMinimosFloyd(grafo), caminos)
+
+            self.assertRaises(ValueError, caminos.actualiza_arco, "no existe", caminos.nodos[0], 1)
+            self.assertRaises(ValueError, caminos.actualiza_arco, caminos.nodos[0], caminos.nodos[0], 1)
+
+        # Al recalcular se conserva el orden de nodos del GrafoCSR
+        csr = GrafoCSR.from_arcos([("c", "b", 1), ("b", "a", 1), ("c", "a", 5)])
+        caminos = CaminosMinimosFloyd(csr)
+        caminos.actualiza_arco("c", "b", 10)
+        self.assertEqual(caminos.nodos, ["c", "b", "a"])
+        self.assertEqual(caminos.distancia("c", "a"), 5)
+        self.assertEqual(caminos.camino("c", "a"), ["c", "a"])
+
+    @unittest.skipIf(np is None, "NumPy no está instalado")
+    def test_actualiza_arco_float32(self):
+
+        grafo = {("a", "b"): 0.7, ("b", "c"): 0.1, ("a", "c"): 5.0}
+        caminos = CaminosMinimosFloyd(grafo, motor="numpy", tipo_distancias="float32")
+        # El arco a -> b es camino mínimo: al subir su peso hay que recalcular
+        caminos.actualiza_arco("a", "b", 10.0)
+        self.assertEqual(caminos.camino("a", "b"), ["a", "b"])
+        self.assertAlmostEqual(caminos.distancia("a", "b"), 10.0, places=5)
+        self.assertEqual(caminos.camino("a", "c"), ["a", "c"])
+        self.assertAlmostEqual(caminos.distancia("a", "c"), 5.0, places=5)
+
+    def test_motor_desconocido(self):
+        self.assertRaises(ValueError, CaminosMinimosFloyd, {("a", "b"): 1}, motor="fortran")
+
+
+class TestCaminosMinimosJohnson(unittest.TestCase):
+    """Tests para la clase CaminosMinimosJohnson."""
+
+    comprueba_equivalentes = TestCaminosMinimosFloyd.comprueba_equivalentes
+
+    def test_igual_que_floyd(self):
+
+        for semilla in range(3):
+            grafo = grafo_aleatorio(30, 60, semilla)
+            caminos = CaminosMinimosFloyd(grafo)
+            self.comprueba_equivalentes(grafo, caminos, CaminosMinimosJohnson(grafo))
+            self.comprueba_equivalentes(grafo, caminos, CaminosMinimosJohnson(grafo, procesos=2))
+
+    def test_pesos_negativos(self):
+
+        grafo = grafo_aleatorio(25, 60, semilla=7)
+        # Pesos negativos sin ciclos negativos: w(u, v) + p(u) - p(v) no cambia
+        # el peso de los ciclos
+        potencial = [random.randint(0, 30) for _ in range(25)]
+        for origen, destino in grafo:
+            grafo[origen, destino] += potencial[origen] - potencial[destino]
+        self.assertTrue(any(peso < 0 for peso in grafo.values()))
+        self.comprueba_equivalentes(grafo, CaminosMinimosFloyd(grafo), CaminosMinimosJohnson(grafo))
+
+        self.assertRaises(ValueError, CaminosMinimosJohnson, {("a", "b"): 1, ("b", "a"): -2})
+
+    def test_eleccion_por_densidad(self):
+
+        disperso = grafo_aleatorio(50, 60)
+        denso = {(i, j): i + j for i in range(10) for j in range(10) if i != j}
+        self.assertIsInstance(caminos_minimos(disperso), CaminosMinimosJohnson)
+        self.assertIsInstance(caminos_minimos(denso), CaminosMinimosFloyd)
+        self.assertIsInstance(caminos_minimos(disperso, umbral_densidad=0), CaminosMinimosFloyd)
+
 class TestMultiplicacionMatricesEncadenadas(unittest.TestCase):
 
     def test_orden_multiplicacion_matrices(self):
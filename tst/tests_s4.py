@@ -1,6 +1,37 @@
+import io
+import json
+import os
+import random
+import struct
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 
-from src.alg_s4 import numero_nodos, numero_arcos, peso_total, arco, inserta_nodo, inserta_arco, grado, pesos_adyacentes, coste_camino, prim, dijkstra, obten_camino_minimo
+from src.alg_s4 import (Grafo, grados_entrada, pesos_entrada, numero_nodos, numero_arcos, peso_total, arco, inserta_nodo, inserta_arco, grado, pesos_adyacentes, coste_camino, prim, dijkstra, obten_camino_minimo, GrafoCSR, dijkstra_multi,
+                         dijkstra_bidireccional, a_estrella, grafo_inverso, IndiceALT,
+                         comparar_nodos_fijados, JerarquiaContraccion,
+                         MonticuloIndexado, dijkstra_monticulo_indexado, comparar_monticulos,
+                         lee_arcos, carga_grafo, ContadorProgreso,
+                         a_json, de_json, huella_arcos, escribe_cabecera, lee_cabecera)
+
+
+def grafo_rejilla(lado, semilla=1):
+    """Rejilla lado x lado con arcos en ambos sentidos entre vecinos y pesos
+    entre 1 y 5. Los nodos son tuplas (fila, columna)."""
+    random.seed(semilla)
+    grafo = {(f, c): {} for f in range(lado) for c in range(lado)}
+    for f, c in grafo:
+        for vecino in ((f + 1, c), (f, c + 1)):
+            if vecino in grafo:
+                peso = random.randint(1, 5)
+                grafo[f, c][vecino] = peso
+                grafo[vecino][f, c] = peso
+    return grafo
+
+
+def manhattan(nodo, final):
+    """Heurística admisible para grafo_rejilla (los pesos son al menos 1)."""
+    return abs(nodo[0] - final[0]) + abs(nodo[1] - final[1])
 
 
 def grafo_de_ejemplo():
@@ -71,6 +102,45 @@ class TestGrafo(unittest.TestCase):
             self.assertEqual(pesos_adyacentes(g, nodo, salida=False),
                              pesos_entrada)   
 
+    def tests_grafo_indice_inverso(self):
+        g = Grafo(grafo_de_ejemplo())
+
+        self.assertEqual(g, grafo_de_ejemplo())
+        self.assertEqual(grados_entrada(g), {'a': 2, 'b': 2, 'c': 1, 'd': 1})
+        self.assertEqual(pesos_entrada(g), {'a': 8, 'b': 3, 'c': 2, 'd': 6})
+
+        inserta_arco(inserta_arco(g, 'a', 'b', 7), 'd', 'c', 4)
+        inserta_arco(inserta_nodo(g, 'e'), 'f', 'a', 2)
+        self.assertEqual(grado(g, 'b', salida=False), 2)
+        self.assertEqual(pesos_adyacentes(g, 'b', salida=False), 9)
+        self.assertEqual(grado(g, 'x', salida=False), 0)
+
+        # El índice inverso coincide con recorrer el grafo como diccionario normal
+        normal = {nodo: dict(vecinos) for nodo, vecinos in g.items()}
+        self.assertEqual(grados_entrada(g), grados_entrada(normal))
+        self.assertEqual(pesos_entrada(g), pesos_entrada(normal))
+        for nodo in normal:
+            for salida in (True, False):
+                self.assertEqual(grado(g, nodo, salida), grado(normal, nodo, salida))
+                self.assertEqual(pesos_adyacentes(g, nodo, salida), pesos_adyacentes(normal, nodo, salida))
+        self.assertEqual(dijkstra(g, 'a'), dijkstra(normal, 'a'))
+
+    def tests_grafo_estadisticas(self):
+        g = Grafo(grafo_de_ejemplo())
+
+        self.assertEqual((numero_arcos(g), peso_total(g)), (6, 19))
+        inserta_nodo(inserta_nodo(g, 'd'), 'e')
+        self.assertEqual((numero_arcos(g), peso_total(g)), (6, 19))
+        inserta_arco(inserta_arco(g, 'a', 'b', 7), 'd', 'c', 4)
+        self.assertEqual((numero_arcos(g), peso_total(g)), (7, 29))
+        inserta_arco(inserta_arco(g, 'f', 'g', 4), 'g', 'f', 3)
+        self.assertEqual((numero_arcos(g), peso_total(g)), (9, 36))
+        inserta_arco(g, 'f', 'g', 1)
+        self.assertEqual((numero_arcos(g), peso_total(g)), (9, 33))
+
+        normal = {nodo: dict(vecinos) for nodo, vecinos in g.items()}
+        self.assertEqual((numero_arcos(g), peso_total(g)), (numero_arcos(normal), peso_total(normal)))
+
     def tests_grafo_de_ejemplo_3(self):
         g = grafo_de_ejemplo()
         
@@ -203,6 +273,14 @@ class TestPrimDijkstra(unittest.TestCase):
         
         self.assertEqual(prim(self.grafo_completo, 'c'), {'a': {'c': 2, 'b': 1}, 'b': {'a': 1}, 'c': {'a': 2}})
 
+    def test_prim_grafo_grande(self):
+
+        grafo = grafo_rejilla(30)
+        arbol = prim(grafo, (5, 5))
+        self.assertEqual(numero_arcos(arbol), 2 * (len(grafo) - 1))
+        self.assertTrue(all(arbol[destino][origen] == peso for origen in arbol for destino, peso in arbol[origen].items()))
+        self.assertEqual(peso_total(arbol), peso_total(prim(GrafoCSR.from_dict_of_dicts(grafo))))
+
     def test_dijkstra(self):
 
         soluciones = [
@@ -224,6 +302,36 @@ class TestPrimDijkstra(unittest.TestCase):
             self.assertEqual(dijkstra(grafo, origen), solucion)
 
 
+    def test_dijkstra_objetivos(self):
+
+        for grafo in (self.grafo1, self.grafo4, self.grafo5, self.grafo_dirigido_1, self.grafo_dirigido_2):
+            for origen in grafo:
+                completo = dijkstra(grafo, origen)
+                for destino in grafo:
+                    parcial = dijkstra(grafo, origen, destino)
+                    self.assertEqual(parcial[destino][1], completo[destino][1])
+                    self.assertEqual(obten_camino_minimo(origen, destino, parcial),
+                                     obten_camino_minimo(origen, destino, completo))
+
+                parcial = dijkstra(grafo, origen, list(grafo))
+                self.assertEqual(parcial, completo)
+
+        # Un objetivo que no está en el grafo no se trata como iterable de nodos
+        for grafo in (self.grafo1, GrafoCSR.from_dict_of_dicts(self.grafo1)):
+            with self.assertRaises(KeyError) as contexto:
+                dijkstra(grafo, 'A', 'zz')
+            self.assertEqual(contexto.exception.args, ('zz',))
+            self.assertRaises(KeyError, dijkstra, grafo, 'A', ['B', 'zz'])
+
+    def test_dijkstra_nodos_mixtos(self):
+
+        # Empates entre nodos de distinto tipo (no comparables entre sí)
+        grafo = {'s': {1: 1, 'a': 1}, 1: {'z': 1}, 'a': {'z': 1}, 'z': {}}
+        resultado = dijkstra(grafo, 's')
+        self.assertEqual({nodo: distancia for nodo, (_, distancia) in resultado.items()},
+                         {'s': 0, 1: 1, 'a': 1, 'z': 2})
+        self.assertEqual(dijkstra(grafo, 's', 'z')['z'][1], 2)
+
     def test_caminos_dijkstra(self):
 
         caminos_pre_calculado1 = {'A': (None, 0), 'B': ('A', 3), 'C': ('D', 3), 'D': ('A', 1)}
@@ -260,5 +368,313 @@ class TestPrimDijkstra(unittest.TestCase):
         self.assertRaises(Exception, obten_camino_minimo, 'A', 'B', caminos_pre_calculado2)
 
 
+
+    def test_dijkstra_multi(self):
+
+        for grafo in (self.grafo1, self.grafo4, self.grafo_dirigido_1, self.grafo_dirigido_2):
+            for procesos in (1, 2):
+                resultados = dijkstra_multi(grafo, list(grafo) + list(grafo), procesos=procesos)
+                self.assertEqual(list(resultados), list(grafo))
+                for origen in reversed(list(grafo)):
+                    esperado = dijkstra(grafo, origen)
+                    self.assertEqual({n: d for n, (_, d) in resultados[origen].items()},
+                                     {n: d for n, (_, d) in esperado.items()})
+                    # Con varios procesos los pesos enteros no pasan a reales
+                    self.assertEqual({n: type(d) for n, (_, d) in resultados[origen].items()},
+                                     {n: type(d) for n, (_, d) in esperado.items()})
+                self.assertRaises(KeyError, resultados.__getitem__, 'no existe')
+
+        self.assertRaises(KeyError, dijkstra_multi, self.grafo1, ['no existe'])
+
+    def test_busquedas_punto_a_punto(self):
+
+        grafos = [self.grafo1, self.grafo4, self.grafo5, self.grafo_dirigido_1,
+                  self.grafo_dirigido_2, grafo_rejilla(6),
+                  # Empates entre nodos de distinto tipo (no comparables entre sí)
+                  {'s': {1: 1, 'a': 1}, 1: {'z': 1}, 'a': {'z': 1}, 'z': {}}]
+        for grafo in grafos:
+            inverso = grafo_inverso(grafo)
+            for origen in grafo:
+                completo = dijkstra(grafo, origen)
+                for destino in grafo:
+                    esperado = completo[destino][1]
+                    for distancia, camino in (
+                        dijkstra_bidireccional(grafo, origen, destino),
+                        dijkstra_bidireccional(grafo, origen, destino, inverso),
+                        a_estrella(grafo, origen, destino),
+                    ):
+                        self.assertEqual(distancia, esperado)
+                        if esperado == float("inf"):
+                            self.assertIsNone(camino)
+                        else:
+                            self.assertEqual((camino[0], camino[-1]), (origen, destino))
+                            self.assertEqual(coste_camino(grafo, camino), esperado)
+
+    def test_nodos_fijados(self):
+
+        grafo = grafo_rejilla(15)
+        origen, destino = (0, 0), (7, 7)
+        esperado = dijkstra(grafo, origen)[destino][1]
+
+        sin_heuristica, con_heuristica, bidireccional = {}, {}, {}
+        self.assertEqual(a_estrella(grafo, origen, destino, estadisticas=sin_heuristica)[0], esperado)
+        self.assertEqual(a_estrella(grafo, origen, destino, manhattan, con_heuristica)[0], esperado)
+        self.assertEqual(dijkstra_bidireccional(grafo, origen, destino, estadisticas=bidireccional)[0], esperado)
+        self.assertLessEqual(con_heuristica["fijados"], sin_heuristica["fijados"])
+        self.assertLess(sin_heuristica["fijados"], len(grafo))
+        self.assertLess(bidireccional["fijados"], len(grafo))
+
+class TestMonticuloIndexado(unittest.TestCase):
+
+    def test_ordenacion(self):
+
+        random.seed(1)
+        for aridad in (2, 3, 4, 8):
+            prioridades = [random.randint(0, 50) for _ in range(100)]
+            monticulo = MonticuloIndexado(len(prioridades), aridad)
+            for elemento, prioridad in enumerate(prioridades):
+                monticulo.inserta(elemento, prioridad + 100)
+            for elemento, prioridad in enumerate(prioridades):
+                monticulo.decrease_key(elemento, prioridad)
+            self.assertFalse(monticulo.inserta_o_reduce(0, 1000))
+            extraidos = [monticulo.pop_min() for _ in range(len(prioridades))]
+            self.assertEqual([prioridad for _, prioridad in extraidos], sorted(prioridades))
+            self.assertEqual(sorted(elemento for elemento, _ in extraidos), list(range(len(prioridades))))
+            self.assertEqual(len(monticulo), 0)
+
+    def test_errores(self):
+
+        monticulo = MonticuloIndexado(3)
+        monticulo.inserta(1, 5)
+        self.assertIn(1, monticulo)
+        self.assertNotIn(2, monticulo)
+        self.assertRaises(KeyError, monticulo.inserta, 1, 3)
+        self.assertRaises(KeyError, monticulo.decrease_key, 2, 3)
+        self.assertRaises(ValueError, monticulo.decrease_key, 1, 7)
+        self.assertEqual(monticulo.pop_min(), (1, 5))
+        self.assertRaises(IndexError, monticulo.pop_min)
+        self.assertRaises(ValueError, MonticuloIndexado, 3, 1)
+
+    def test_dijkstra(self):
+
+        prueba = TestPrimDijkstra()
+        prueba.setUp()
+        for grafo in (grafo_rejilla(8), prueba.grafo_dirigido_1, prueba.grafo_dirigido_2):
+            for origen in grafo:
+                completo = dijkstra(grafo, origen)
+                for aridad in (2, 4):
+                    resultado = dijkstra_monticulo_indexado(grafo, origen, aridad)
+                    self.assertEqual({nodo: distancia for nodo, (_, distancia) in resultado.items()},
+                                     {nodo: distancia for nodo, (_, distancia) in completo.items()})
+                    for destino in grafo:
+                        camino = obten_camino_minimo(origen, destino, resultado)
+                        if camino is not None:
+                            self.assertEqual(coste_camino(grafo, camino), completo[destino][1])
+
+    def test_comparar_monticulos(self):
+
+        with redirect_stdout(io.StringIO()):
+            resultados = comparar_monticulos(num_nodos=50, densidades=(0.1,), aridades=(2, 4), repeticiones=1)
+        self.assertEqual(set(resultados[0.1]), {"heapq", "d=2", "d=4"})
+
+class TestIndiceALT(unittest.TestCase):
+
+    def test_consultas(self):
+
+        prueba = TestPrimDijkstra()
+        prueba.setUp()
+        for grafo in (grafo_rejilla(8), prueba.grafo_dirigido_1, prueba.grafo_dirigido_2):
+            for indice in (IndiceALT(grafo, k=3, semilla=1), IndiceALT(GrafoCSR.from_dict_of_dicts(grafo), k=2)):
+                for origen in grafo:
+                    completo = dijkstra(grafo, origen)
+                    for destino in grafo:
+                        self.assertLessEqual(indice.heuristica(origen, destino), completo[destino][1])
+                        distancia, camino = indice.consulta(origen, destino)
+                        self.assertEqual(distancia, completo[destino][1])
+                        if camino is not None:
+                            self.assertEqual(coste_camino(grafo, camino), distancia)
+
+    def test_guardar_cargar(self):
+
+        grafo = grafo_rejilla(10)
+        indice = IndiceALT(grafo, k=4, semilla=2)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "alt.bin")
+            indice.save(ruta)
+            cargado = IndiceALT.load(ruta, grafo)
+            self.assertRaises(ValueError, IndiceALT.load, ruta, grafo_rejilla(3))
+            # Mismos nodos pero un peso distinto: las tablas ya no son válidas
+            cambiado = {nodo: dict(vecinos) for nodo, vecinos in grafo.items()}
+            cambiado[(0, 0)][(0, 1)] += 1
+            self.assertRaises(ValueError, IndiceALT.load, ruta, cambiado)
+            self.assertEqual(IndiceALT.load(ruta, GrafoCSR.from_dict_of_dicts(grafo)).landmarks, indice.landmarks)
+            otro = os.path.join(directorio, "otro.bin")
+            with open(otro, "wb") as fichero:
+                fichero.write(b"no es un indice")
+            self.assertRaises(ValueError, IndiceALT.load, otro, grafo)
+        self.assertEqual(cargado.landmarks, indice.landmarks)
+        self.assertEqual(cargado.desde, indice.desde)
+        self.assertEqual(cargado.hasta, indice.hasta)
+
+    def test_comparar_nodos_fijados(self):
+
+        grafo = grafo_rejilla(20)
+        with redirect_stdout(io.StringIO()):
+            medias = comparar_nodos_fijados(grafo, IndiceALT(grafo, semilla=1), consultas=20)
+        self.assertLess(medias["alt"], medias["dijkstra_objetivo"])
+        self.assertLessEqual(medias["dijkstra_objetivo"], medias["dijkstra"])
+
+class TestJerarquiaContraccion(unittest.TestCase):
+
+    def test_consultas(self):
+
+        prueba = TestPrimDijkstra()
+        prueba.setUp()
+        for grafo in (grafo_rejilla(8), prueba.grafo_dirigido_1, prueba.grafo_dirigido_2):
+            for jerarquia in (JerarquiaContraccion(grafo), JerarquiaContraccion(GrafoCSR.from_dict_of_dicts(grafo), limite_testigo=2)):
+                for origen in grafo:
+                    completo = dijkstra(grafo, origen)
+                    for destino in grafo:
+                        distancia, camino = jerarquia.consulta(origen, destino)
+                        self.assertEqual(distancia, completo[destino][1])
+                        referencia = obten_camino_minimo(origen, destino, completo)
+                        self.assertEqual(camino is None, referencia is None)
+                        if camino is not None:
+                            self.assertEqual((camino[0], camino[-1]), (origen, destino))
+                            self.assertEqual(coste_camino(grafo, camino), coste_camino(grafo, referencia))
+
+    def test_guardar_cargar(self):
+
+        grafo = grafo_rejilla(10)
+        jerarquia = JerarquiaContraccion(grafo)
+        self.assertGreater(jerarquia.numero_atajos(), 0)
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "ch.bin")
+            jerarquia.save(ruta)
+            cargada = JerarquiaContraccion.load(ruta)
+            for nombre in ("rango", "subida", "bajada", "intermedios", "limite_testigo"):
+                self.assertEqual(getattr(cargada, nombre), getattr(jerarquia, nombre))
+            otra = os.path.join(directorio, "otra.bin")
+            with open(otra, "wb") as fichero:
+                fichero.write(b"no")
+            self.assertRaises(ValueError, JerarquiaContraccion.load, otra)
+        estadisticas = {}
+        self.assertEqual(cargada.consulta((0, 0), (9, 9), estadisticas), jerarquia.consulta((0, 0), (9, 9)))
+        self.assertLess(estadisticas["fijados"], len(grafo))
+
+class TestCabeceras(unittest.TestCase):
+
+    def test_cabecera_json(self):
+
+        nodos = ["a", 1, 2.5, (0, ("b", 3)), None]
+        self.assertEqual(de_json(json.loads(json.dumps(a_json(nodos)))), nodos)
+        self.assertEqual(huella_arcos([("a", "b", 1), ("b", "c", 2)]),
+                         huella_arcos([("b", "c", 2), ("a", "b", 1)]))
+        self.assertNotEqual(huella_arcos([("a", "b", 1)]), huella_arcos([("a", "b", 2)]))
+
+        fichero = io.BytesIO()
+        escribe_cabecera(fichero, b"PRUEBA", {"nodos": a_json(nodos)})
+        fichero.write(b"datos")
+        fichero.seek(0)
+        self.assertEqual(lee_cabecera(fichero, b"PRUEBA"), {"nodos": a_json(nodos)})
+        self.assertEqual(fichero.read(), b"datos")
+        fichero.seek(0)
+        self.assertIsNone(lee_cabecera(fichero, b"OTRA!!"))
+        self.assertIsNone(lee_cabecera(io.BytesIO(b"PRUEBA\x05"), b"PRUEBA"))
+
+
+class TestCargaGrafo(unittest.TestCase):
+
+    def test_texto(self):
+
+        with tempfile.TemporaryDirectory() as directorio:
+            csv = os.path.join(directorio, "grafo.csv")
+            with open(csv, "w") as fichero:
+                fichero.write("origen,destino,peso\na,b,1\r\na,c,2\n# comentario\n\nb,a,3\nb,d,6\nc,a,5\nc,b,2")
+            tsv = os.path.join(directorio, "grafo.tsv")
+            with open(tsv, "w") as fichero:
+                fichero.write("a\tb\nb\tc\n")
+
+            for tamano_bloque in (1, 5, 1 << 20):
+                for memoria_mapeada in (False, True):
+                    grafo = carga_grafo(csv, cabecera=True, tamano_bloque=tamano_bloque, memoria_mapeada=memoria_mapeada)
+                    self.assertEqual(grafo, grafo_de_ejemplo())
+            contador = ContadorProgreso()
+            csr = carga_grafo(csv, "csr", cabecera=True, progreso=contador)
+            self.assertEqual(sorted(csr.arcos()), sorted(lee_arcos(csv, cabecera=True)))
+            self.assertEqual((contador.arcos, contador.bytes), (6, os.path.getsize(csv)))
+            self.assertEqual(peso_total(carga_grafo(csv, "grafo", cabecera=True)), 19)
+            self.assertEqual(carga_grafo(tsv, "arcos"), {('a', 'b'): 1, ('b', 'c'): 1})
+            self.assertEqual(carga_grafo(tsv, simetrico=True), {'a': {'b': 1}, 'b': {'a': 1, 'c': 1}, 'c': {'b': 1}})
+            # Con arcos repetidos y bucles, igual que construirlo arco a arco
+            with open(tsv, "a") as fichero:
+                fichero.write("a\tb\t4\nc\tc\t2\nd\ta\t1\n")
+            cargado = carga_grafo(tsv, "grafo", simetrico=True)
+            esperado = Grafo(carga_grafo(tsv, simetrico=True))
+            self.assertEqual(cargado, esperado)
+            self.assertEqual(cargado.entrada, esperado.entrada)
+            self.assertEqual((cargado.numero_arcos(), cargado.peso_total()),
+                             (esperado.numero_arcos(), esperado.peso_total()))
+            self.assertRaises(ValueError, carga_grafo, tsv, "matriz")
+            self.assertRaises(ValueError, carga_grafo, tsv, formato="xml")
+
+    def test_binario(self):
+
+        arcos = [(i, (7 * i) % 50, i % 10) for i in range(50)]
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "grafo.bin")
+            with open(ruta, "wb") as fichero:
+                for arco_binario in arcos:
+                    fichero.write(struct.pack("<qqq", *arco_binario))
+            for tamano_bloque in (10, 100, 1 << 20):
+                for memoria_mapeada in (False, True):
+                    self.assertEqual(list(lee_arcos(ruta, tamano_bloque=tamano_bloque, memoria_mapeada=memoria_mapeada)), arcos)
+            self.assertEqual(sorted(carga_grafo(ruta, "csr").arcos()), sorted(arcos))
+            with open(ruta, "ab") as fichero:
+                fichero.write(b"\x00")
+            self.assertRaises(ValueError, list, lee_arcos(ruta))
+
+class TestGrafoCSR(unittest.TestCase):
+
+    def test_conversion(self):
+        g = grafo_de_ejemplo()
+        csr = GrafoCSR.from_dict_of_dicts(g)
+
+        self.assertEqual(len(csr), 4)
+        self.assertEqual(csr.numero_arcos(), 6)
+        self.assertEqual(list(csr), ['a', 'b', 'c', 'd'])
+        for nodo in g:
+            self.assertIn(nodo, csr)
+            self.assertEqual(csr[nodo], g[nodo])
+        self.assertEqual(sorted(csr.arcos()),
+                         sorted((o, d, p) for o in g for d, p in g[o].items()))
+        self.assertEqual(csr.pesos.typecode, 'q')
+        self.assertRaises(AttributeError, setattr, csr, 'nodos', ())
+
+        csr = GrafoCSR.from_arc_dict({('x', 'y'): 1.5, ('y', 'z'): 2}, simetrico=True)
+        self.assertEqual(csr.numero_arcos(), 4)
+        self.assertEqual(csr['y'], {'x': 1.5, 'z': 2})
+        self.assertEqual(csr.pesos.typecode, 'd')
+
+    def test_dijkstra_prim(self):
+        prueba = TestPrimDijkstra()
+        prueba.setUp()
+        for grafo in (prueba.grafo1, prueba.grafo4, prueba.grafo5, prueba.grafo_dirigido_1, prueba.grafo_dirigido_2):
+            csr = GrafoCSR.from_dict_of_dicts(grafo)
+            for origen in grafo:
+                esperado = dijkstra(grafo, origen)
+                obtenido = dijkstra(csr, origen)
+                self.assertEqual({n: d for n, (_, d) in obtenido.items()},
+                                 {n: d for n, (_, d) in esperado.items()})
+                for destino in grafo:
+                    camino = obten_camino_minimo(origen, destino, obtenido)
+                    if camino is not None:
+                        self.assertEqual(coste_camino(grafo, camino), esperado[destino][1])
+
+        for grafo in (prueba.grafo1, prueba.grafo2, prueba.grafo5, prueba.grafo7):
+            arbol = prim(GrafoCSR.from_dict_of_dicts(grafo))
+            self.assertEqual(peso_total(arbol), peso_total(prim(grafo)))
+            self.assertEqual(numero_arcos(arbol), 2 * (len(grafo) - 1))
+
 if __name__ == "__main__":
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
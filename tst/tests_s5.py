@@ -1,7 +1,17 @@
+import io
+import json
+import os
+import tempfile
 import unittest
 import random
+from array import array
+from contextlib import redirect_stdout
 
-from src.alg_s5 import Particion, kruskal
+from src.alg_s4 import GrafoCSR
+from src.alg_s5 import (Particion, ParticionEnteros, COMPRESIONES, comparar_compresiones, np, kruskal, kruskal_externo,
+                         prim, prim_perezoso, prim_matriz, ArbolExpansionDinamico,
+                         FAMILIAS_GRAFOS, ALGORITMOS_MST, registra_algoritmo_mst, comparar_arbol_expansion,
+                         comparar_tiempos)
 
 
 class TestParticion(unittest.TestCase):
@@ -67,6 +77,121 @@ class TestParticion(unittest.TestCase):
                 self.assertEqual(p.numero(), n)     
 
 
+class PruebasParticionComunes:
+    """Pruebas que comparten Particion y ParticionEnteros; `clase` indica cuál
+    se prueba. No hereda de TestCase para que no se ejecute por sí sola."""
+
+    clase = Particion
+
+    def test_compresiones(self, n=200, semilla=1):
+        """Todas las estrategias de compresión dan la misma partición"""
+
+        random.seed(semilla)
+        uniones = [(random.randrange(n), random.randrange(n)) for _ in range(n // 2)]
+        referencia = None
+        for compresion in COMPRESIONES:
+            p = self.clase(range(n), compresion)
+            for a, b in uniones:
+                p.une(a, b)
+            clases = sorted(sorted(k for k in range(n) if p[k] == r) for r in p)
+            self.assertEqual(len(clases), len(p))
+            if referencia is None:
+                referencia = clases
+            self.assertEqual(clases, referencia)
+        self.assertRaises(ValueError, self.clase, range(n), "recursiva")
+
+    def test_cadena_larga(self, n=100000):
+        """La búsqueda es iterativa: una cadena larga no agota la pila"""
+
+        for compresion in COMPRESIONES:
+            p = self.clase(range(n), compresion)
+            for k in range(1, n):
+                p.padres[k] = k - 1
+            self.assertEqual(p[n - 1], 0)
+            self.assertEqual(p[n // 2], 0)
+
+    def test_une_muchos(self, n=300, semilla=1):
+        """une_muchos y componentes equivalen a une con cada par"""
+
+        random.seed(semilla)
+        pares = [(random.randrange(n), random.randrange(n)) for _ in range(n // 2)]
+        referencia = self.clase(range(n))
+        for a, b in pares:
+            referencia.une(a, b)
+
+        entradas = [pares, iter(pares)]
+        if np is not None:
+            entradas.append(np.array(pares))
+        for entrada in entradas:
+            p = self.clase(range(n))
+            p.une_muchos(entrada)
+            self.assertEqual(len(p), len(referencia))
+            etiquetas, tamanos = p.componentes()
+            self.assertEqual(len(tamanos), len(p))
+            self.assertEqual(sum(tamanos), n)
+            for a in range(n):
+                self.assertEqual(p.numero(a), tamanos[etiquetas[a]])
+                self.assertEqual(p.numero(a), referencia.numero(a))
+            for a, b in pares:
+                self.assertEqual(etiquetas[a], etiquetas[b])
+                self.assertEqual(p[a], p[b])
+            # Las etiquetas aparecen en orden 0, 1, ...
+            primeras = []
+            for a in range(n):
+                if etiquetas[a] not in primeras:
+                    primeras.append(etiquetas[a])
+            self.assertEqual(primeras, list(range(len(tamanos))))
+
+    def test_comparar_compresiones(self):
+
+        with redirect_stdout(io.StringIO()):
+            resultados = comparar_compresiones([100], clases=(self.clase,))
+        self.assertEqual(len(resultados), 2 * len(COMPRESIONES))
+
+
+class TestParticionEstrategias(PruebasParticionComunes, unittest.TestCase):
+
+    clase = Particion
+
+
+class TestParticionEnteros(PruebasParticionComunes, unittest.TestCase):
+
+    clase = ParticionEnteros
+
+    def test_uniones_como_particion(self, n=100, semilla=1):
+        """Con las mismas uniones da los mismos subconjuntos que Particion"""
+
+        random.seed(semilla)
+        p = ParticionEnteros(n)
+        referencia = Particion(range(n))
+        self.assertEqual((p.numero(), len(p)), (n, n))
+        for _ in range(n):
+            a, b = random.randrange(n), random.randrange(n)
+            p.une(a, b)
+            referencia.une(a, b)
+            self.assertEqual(len(p), len(referencia))
+            self.assertEqual(p.numero(a), referencia.numero(a))
+            self.assertEqual(p[a], p[b])
+        for a in range(n):
+            for b in range(a):
+                self.assertEqual(p[a] == p[b], referencia[a] == referencia[b])
+
+    def test_arrays(self, n=1000):
+        """Los padres y tamaños se guardan en arrays de enteros"""
+
+        p = ParticionEnteros(n)
+        self.assertEqual(p.padres.typecode, 'i')
+        self.assertEqual(p.tamanos.typecode, 'i')
+        self.assertEqual(list(p), list(range(n)))
+        self.assertRaises(KeyError, p.__getitem__, n)
+        self.assertRaises(KeyError, p.__getitem__, -1)
+        self.assertRaises(ValueError, ParticionEnteros, range(1, n))
+        self.assertEqual(len(ParticionEnteros(0)), 0)
+        self.assertRaises(KeyError, p.une_muchos, [(0, n)])
+        if np is not None:
+            self.assertRaises(KeyError, p.une_muchos, np.array([[0, -1]]))
+
+
 class TestArbolExtendidoKruskal(unittest.TestCase):
     
     def test_6_nodos_9_arcos(self):
@@ -133,6 +258,202 @@ class TestArbolExtendidoKruskal(unittest.TestCase):
                 total += peso
             self.assertEqual(total, n * (n + 1) / 2)   
 
+    def test_grafo_csr(self, n=10, repeticiones=10, semilla=1):
+        """Kruskal sobre GrafoCSR da un árbol del mismo peso"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            g = {(i, j): random.randint(1, 20) for i in range(n - 1) for j in range(i + 1, n)}
+            for simetrico in (False, True):
+                t = kruskal(GrafoCSR.from_arc_dict(g, simetrico))
+                self.assertEqual(len(t), n - 1)
+                self.assertEqual(sum(t.values()), sum(kruskal(g).values()))
+                for (u, v), peso in t.items():
+                    self.assertEqual(peso, g.get((u, v), g.get((v, u))))
+
+    def test_modos(self, n=40, repeticiones=5, semilla=1):
+        """Filter-Kruskal y Borůvka dan exactamente el mismo árbol que Kruskal"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            # Pesos con muchos empates y más arcos que el umbral de filter-Kruskal
+            g = {(random.randrange(n), random.randrange(n)): random.randint(1, 5) for _ in range(2000)}
+            t = kruskal(g)
+            estado = random.getstate()
+            self.assertEqual(kruskal(g, "filtro"), t)
+            # Los pivotes salen de un generador propio: no cambia el estado global
+            self.assertEqual(random.getstate(), estado)
+            self.assertEqual(kruskal(g, "boruvka"), t)
+        self.assertEqual(kruskal(g, "boruvka", procesos=2), t)
+        csr = GrafoCSR.from_arc_dict(g)
+        self.assertEqual(kruskal(csr, "filtro"), kruskal(csr))
+        self.assertEqual(kruskal(csr, "boruvka"), kruskal(csr))
+
+        # Grafo no conexo: se obtiene el bosque
+        bosque = {(0, 1): 3, (2, 3): 1, (3, 4): 2, (2, 4): 5}
+        for modo in ("filtro", "boruvka"):
+            self.assertEqual(kruskal(bosque, modo), kruskal(bosque))
+        self.assertEqual(kruskal({}, "boruvka"), {})
+        self.assertRaises(ValueError, kruskal, bosque, "prim")
+
+    def test_kruskal_externo(self, n=30, repeticiones=5, semilla=1):
+        """Kruskal en memoria externa genera el mismo árbol que Kruskal"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            g = {(random.randrange(n), random.randrange(n)): random.randint(1, 5) for _ in range(300)}
+            for tamano_bloque in (1, 17, 1000):
+                self.assertEqual(dict(kruskal_externo(g, tamano_bloque=tamano_bloque)), kruskal(g))
+
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "arcos.csv")
+            with open(ruta, "w") as fichero:
+                for (u, v), peso in g.items():
+                    fichero.write(f"{u},{v},{peso}\n")
+            temporales = os.path.join(directorio, "temporales")
+            os.mkdir(temporales)
+            arbol = kruskal_externo(ruta, tamano_bloque=50, directorio=temporales, tipo_nodo=int)
+            self.assertEqual(dict(arbol), kruskal(g))
+            self.assertEqual(os.listdir(temporales), [])
+        self.assertEqual(list(kruskal_externo([])), [])
+
+
+class TestArbolExtendidoPrim(unittest.TestCase):
+
+    def test_grafo_aleatorio(self, n=12, repeticiones=10, semilla=1):
+        """Prim con montículo indexado da un árbol del mismo peso que Kruskal"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            g = {(i, j): random.randint(1, 20) for i in range(n - 1) for j in range(i + 1, n) if random.random() < 0.5}
+            g.update({(i, i + 1): random.randint(1, 20) for i in range(n - 1)})
+            for aridad in (2, 3, 8):
+                t = prim(g, aridad)
+                self.assertEqual(len(t), n - 1)
+                self.assertEqual(sum(t.values()), sum(kruskal(g).values()))
+                self.assertEqual(sum(t.values()), sum(prim_perezoso(g).values()))
+                for arco, peso in t.items():
+                    self.assertEqual(peso, g[arco])
+        self.assertEqual(prim({}), {})
+
+    def test_grafo_denso(self, n=12, repeticiones=10, semilla=1):
+        """Con densidad alta se usa la matriz de adyacencia y el árbol tiene el mismo peso"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            g = {(i, j): random.randint(1, 20) for i in range(n) for j in range(n) if i != j and random.random() < 0.7}
+            g.update({(i, i + 1): random.randint(1, 20) for i in range(n - 1)})
+            for umbral in (0, 2):
+                t = prim(g, umbral_densidad=umbral)
+                self.assertEqual(len(t), n - 1)
+                self.assertEqual(sum(t.values()), sum(kruskal(g).values()))
+                for arco, peso in t.items():
+                    self.assertEqual(peso, g[arco])
+
+    def test_prim_matriz(self):
+        """prim_matriz con matrices de NumPy, listas y arrays"""
+
+        inf = float("inf")
+        filas = [
+            [inf, 2, 3, inf],
+            [2, inf, 1, 4],
+            [3, 1, inf, 5],
+            [inf, 4, 5, inf],
+        ]
+        solucion = {('a', 'b'): 2, ('b', 'c'): 1, ('b', 'd'): 4}
+        matrices = [filas, [array('d', fila) for fila in filas]]
+        if np is not None:
+            matrices.append(np.array(filas))
+        for matriz in matrices:
+            self.assertEqual(prim_matriz(matriz, ['a', 'b', 'c', 'd']), solucion)
+        # Sin arcos hacia el último nodo solo se obtiene la componente del primero
+        filas[1][3] = filas[3][1] = filas[2][3] = filas[3][2] = inf
+        self.assertEqual(prim_matriz(filas), {(0, 1): 2, (1, 2): 1})
+        self.assertEqual(prim_matriz([]), {})
+
+
+class TestArbolExpansionDinamico(unittest.TestCase):
+
+    def test_inserciones(self, n=25, repeticiones=10, semilla=1):
+        """Tras cada inserción el árbol pesa lo mismo que el de Kruskal"""
+
+        random.seed(semilla)
+        for _ in range(repeticiones):
+            g = {(i, i + 1): random.randint(1, 20) for i in range(0, n - 1, 2)}
+            d = ArbolExpansionDinamico(g)
+            self.assertEqual(d.arbol, kruskal(g))
+            for _ in range(100):
+                u, v = random.sample(range(n), 2)
+                if (u, v) in g or (v, u) in g:
+                    continue
+                g[(u, v)] = random.randint(1, 20)
+                fuera = d.inserta_arco(u, v, g[(u, v)])
+                t = kruskal(g)
+                self.assertEqual(len(d), len(t))
+                self.assertEqual(d.peso_total(), sum(t.values()))
+                for arco, peso in d.arbol.items():
+                    self.assertEqual(peso, g[arco])
+                if fuera is not None:
+                    self.assertEqual(g[fuera[0]], fuera[1])
+                    self.assertNotIn(fuera[0], d.arbol)
+
+    def test_sustitucion(self):
+        """Se sustituye el arco más pesado del ciclo solo si el nuevo pesa menos"""
+
+        d = ArbolExpansionDinamico({('a', 'b'): 1, ('b', 'c'): 5, ('c', 'd'): 2})
+        self.assertEqual(d.inserta_arco('a', 'd', 9), (('a', 'd'), 9))
+        self.assertEqual(d.inserta_arco('a', 'c', 3), (('b', 'c'), 5))
+        self.assertEqual(d.arbol, {('a', 'b'): 1, ('c', 'd'): 2, ('a', 'c'): 3})
+        self.assertIsNone(d.inserta_arco('d', 'e', 4))
+        self.assertEqual(d.inserta_arco('e', 'e', 1), (('e', 'e'), 1))
+        self.assertEqual((len(d), d.peso_total()), (4, 10))
+
+
+class TestBancoPruebasArbolExpansion(unittest.TestCase):
+
+    def test_familias(self, num_arcos=500):
+        """Los grafos generados son conexos y tienen aproximadamente num_arcos arcos"""
+
+        for familia, generador in FAMILIAS_GRAFOS.items():
+            g = generador(num_arcos, random.Random(1))
+            nodos = {nodo for arco in g for nodo in arco}
+            self.assertLess(abs(len(g) - num_arcos), num_arcos // 10, familia)
+            self.assertEqual(len(kruskal(g)), len(nodos) - 1, familia)
+            self.assertTrue(all(u != v for u, v in g), familia)
+
+        for num_arcos in range(1, 12):
+            g = FAMILIAS_GRAFOS["disperso"](num_arcos, random.Random(1))
+            self.assertEqual(len(g), max(1, num_arcos))
+
+    def test_comparar_arbol_expansion(self):
+        """Todos los algoritmos dan árboles del mismo peso y se guardan en JSON"""
+
+        registra_algoritmo_mst("prim_matriz", lambda g: prim(g, umbral_densidad=0))
+        try:
+            with tempfile.TemporaryDirectory() as directorio:
+                ruta = os.path.join(directorio, "resultados.json")
+                with redirect_stdout(io.StringIO()):
+                    resultados = comparar_arbol_expansion(tamanos=(200,), repeticiones=2, fichero_json=ruta)
+                with open(ruta) as fichero:
+                    guardado = json.load(fichero)
+        finally:
+            del ALGORITMOS_MST["prim_matriz"]
+
+        self.assertEqual(guardado["resultados"], resultados)
+        self.assertEqual(len(resultados), len(FAMILIAS_GRAFOS) * (len(ALGORITMOS_MST) + 1))
+        for familia in FAMILIAS_GRAFOS:
+            pesos = {r["peso"] for r in resultados if r["familia"] == familia}
+            self.assertEqual(len(pesos), 1, familia)
+        for resultado in resultados:
+            self.assertLessEqual(resultado["mediana_ms"], resultado["p95_ms"])
+            self.assertGreater(resultado["memoria_kib"], 0)
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(len(comparar_tiempos([10, 20], repeticiones=1)), 4)
+        self.assertRaises(ValueError, comparar_arbol_expansion, familias=("estrella",))
+        self.assertRaises(ValueError, comparar_arbol_expansion, algoritmos=("dijkstra",))
+        self.assertRaises(ValueError, comparar_arbol_expansion, repeticiones=0)
+
 
 if __name__ == "__main__":
     unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file